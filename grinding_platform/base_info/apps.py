@@ -4,4 +4,6 @@ from django.apps import AppConfig
 class BaseInfoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'base_info'
-    verbose_name = '基础信息库' 
\ No newline at end of file
+    verbose_name = '基础信息库' 
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:03
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    """按上级部门关系为已有部门生成层级路径"""
+    Department = apps.get_model('base_info', 'Department')
+    parents = dict(Department.objects.values_list('id', 'parent_department_id'))
+    paths = {}
+
+    def path_of(pk):
+        if pk not in paths:
+            # 逐级向上收集，遇到环或缺失的上级时截断为顶级部门
+            chain, seen = [], set()
+            current = pk
+            while current is not None and current not in seen and current not in paths:
+                seen.add(current)
+                chain.append(current)
+                current = parents.get(current)
+            prefix = paths.get(current, '/')
+            for node in reversed(chain):
+                prefix = f'{prefix}{node}/'
+                paths[node] = prefix
+        return paths[pk]
+
+    departments = list(Department.objects.only('id', 'path'))
+    for department in departments:
+        department.path = path_of(department.pk)
+    Department.objects.bulk_update(departments, ['path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base_info', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, verbose_name='层级路径'),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Length, Substr
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -90,6 +92,8 @@ class Department(models.Model):
     department_type = models.CharField(max_length=20, choices=DEPARTMENT_TYPE_CHOICES, verbose_name='部门类型')
     company = models.ForeignKey(Company, on_delete=models.CASCADE, verbose_name='所属企业')
     parent_department = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, verbose_name='上级部门')
+    # 物化路径：从顶级部门到本部门的ID序列，如 /1/5/12/，由 save() 维护
+    path = models.CharField(max_length=255, blank=True, db_index=True, editable=False, verbose_name='层级路径')
     
     # 部门信息
     level = models.PositiveIntegerField(default=1, verbose_name='部门层级')
@@ -118,6 +122,50 @@ class Department(models.Model):
     
     def __str__(self):
         return f"{self.company.short_name or self.company.name} - {self.name}"
+    
+    def save(self, *args, **kwargs):
+        """保存时维护层级路径；调整上级部门时同步更新全部下级部门的路径
+
+        部门层级（level）仍由用户填写，不随路径变化。
+        """
+        with transaction.atomic():
+            # 按主键顺序锁定上级部门与本部门后再读取路径，并发调整上级时依次进行，不会基于过期的路径改写下级部门
+            ids = [pk for pk in (self.parent_department_id, self.pk) if pk]
+            paths = dict(
+                Department.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', 'path')
+            )
+            parent_path = '/'
+            if self.parent_department_id:
+                parent_path = paths.get(self.parent_department_id) or '/'
+                if self.pk and f'/{self.pk}/' in parent_path:
+                    raise ValueError('不能将部门移动到其自身或下级部门之下')
+            previous_path = paths.get(self.pk, '') if self.pk and not self._state.adding else ''
+
+            # 新建部门保存后才有主键，路径在保存后补写
+            self.path = f'{parent_path}{self.pk}/' if self.pk else ''
+            super().save(*args, **kwargs)
+
+            if not self.path:
+                self.path = f'{parent_path}{self.pk}/'
+                Department.objects.filter(pk=self.pk).update(path=self.path)
+            elif previous_path and previous_path != self.path:
+                Department.objects.filter(path__startswith=previous_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(previous_path) + 1)),
+                )
+    
+    def get_ancestors(self, include_self=False):
+        """全部上级部门，按层级从高到低排列"""
+        ids = [int(pk) for pk in self.path.strip('/').split('/') if pk]
+        if not include_self:
+            ids = ids[:-1]
+        return Department.objects.filter(pk__in=ids).order_by(Length('path'))
+    
+    def get_descendants(self, include_self=False):
+        """全部下级部门（任意深度）"""
+        queryset = Department.objects.filter(path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
 
 
 class Personnel(models.Model):
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import Company, Department, Personnel, Standard
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     
     class Meta:
@@ -15,7 +16,7 @@ class CompanySerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source='company.name', read_only=True)
     parent_department_name = serializers.CharField(source='parent_department.name', read_only=True)
     manager_name = serializers.CharField(source='manager.username', read_only=True)
@@ -25,13 +26,22 @@ class DepartmentSerializer(serializers.ModelSerializer):
         model = Department
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by')
+        expandable_fields = {
+            'company': CompanySerializer,
+            'parent_department': 'base_info.serializers.DepartmentSerializer',
+        }
+        
+    def validate_parent_department(self, value):
+        if value and self.instance and f'/{self.instance.pk}/' in value.path:
+            raise serializers.ValidationError('不能将部门移动到其自身或下级部门之下')
+        return value
         
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
         return super().create(validated_data)
 
 
-class PersonnelSerializer(serializers.ModelSerializer):
+class PersonnelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source='company.name', read_only=True)
     department_name = serializers.CharField(source='department.name', read_only=True)
     user_username = serializers.CharField(source='user.username', read_only=True)
@@ -42,6 +52,10 @@ class PersonnelSerializer(serializers.ModelSerializer):
         model = Personnel
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by')
+        expandable_fields = {
+            'company': CompanySerializer,
+            'department': DepartmentSerializer,
+        }
         
     def get_age(self, obj):
         from datetime import date
@@ -55,7 +69,7 @@ class PersonnelSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class StandardSerializer(serializers.ModelSerializer):
+class StandardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     
     class Meta:
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Department
+from .tree import invalidate_department_tree
+
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=Department)
+def remember_department_company(sender, instance, **kwargs):
+    """记录修改前的所属企业，调整企业时两个企业的部门树都需要清除"""
+    instance._previous_company_id = None
+    if instance.pk and not instance._state.adding:
+        instance._previous_company_id = (
+            Department.objects.filter(pk=instance.pk).values_list('company_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def clear_department_tree(sender, instance, **kwargs):
+    company_ids = {instance.company_id, getattr(instance, '_previous_company_id', None)}
+    transaction.on_commit(lambda: invalidate_department_tree(*company_ids))
+
+
+@receiver(post_delete, sender=Department)
+def reroot_child_departments(sender, instance, **kwargs):
+    """上级部门删除后下级部门的上级被置空（SET_NULL），其子树的路径去掉已删除部门的前缀"""
+    if not instance.path:
+        return
+    Department.objects.filter(path__startswith=instance.path).exclude(pk=instance.pk).update(
+        path=Concat(Value('/'), Substr('path', len(instance.path) + 1)),
+    )
+
+
+@receiver(post_save, sender=User)
+def clear_managed_department_trees(sender, instance, created, update_fields=None, **kwargs):
+    """部门树中包含负责人用户名，用户名可能变化时清除其负责部门所在企业的部门树"""
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    company_ids = set(instance.managed_departments.values_list('company_id', flat=True))
+    if company_ids:
+        transaction.on_commit(lambda: invalidate_department_tree(*company_ids))
@@ -0,0 +1,288 @@
+import datetime
+import importlib
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from grinding_platform import caching
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from .models import Department, Personnel, Standard
+from .tree import CACHE_KEY
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """企业、部门、人员与标准列表（含展开的关联对象）的查询数不随行数增长"""
+
+    def create_personnel(self):
+        department = self.create_department()
+        i = self.next_id()
+        return Personnel.objects.create(
+            employee_id=f'E{i}', name=f'员工{i}', gender='M', birth_date=datetime.date(1990, 1, 1),
+            id_card=f'ID{i}', company=department.company, department=department, position='技术员',
+            employment_type='fulltime', hire_date=datetime.date(2020, 1, 1),
+            contract_start=datetime.date(2020, 1, 1), education='bachelor', phone='000',
+        )
+
+    def create_standard(self):
+        i = self.next_id()
+        return Standard.objects.create(
+            standard_code=f'GB/T {i}-2020', title=f'标准{i}', standard_type='national', publisher='-',
+            publish_date=datetime.date(2020, 1, 1), implement_date=datetime.date(2020, 6, 1), scope='-',
+            abstract='-', classification='-', created_by=self.user,
+        )
+
+    def test_companies(self):
+        self.assertConstantQueries('/api/v1/base-info/companies/', self.create_company)
+
+    def test_departments(self):
+        self.assertConstantQueries('/api/v1/base-info/departments/', self.create_department)
+
+    def test_departments_expanded(self):
+        self.assertConstantQueries(
+            '/api/v1/base-info/departments/?expand=company,parent_department.company', self.create_department,
+        )
+
+    def test_personnel(self):
+        self.assertConstantQueries('/api/v1/base-info/personnel/?expand=company,department', self.create_personnel)
+
+    def test_standards(self):
+        self.assertConstantQueries('/api/v1/base-info/standards/', self.create_standard)
+
+
+class SparseFieldsTests(FixtureMixin, APITestCase):
+    """?fields= / ?expand= 裁剪响应字段并缩小查询的列"""
+
+    def test_fields_narrow_response_and_columns(self):
+        self.create_company()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/base-info/companies/?fields=id,name')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name'})
+        sql = context.captured_queries[-1]['sql']
+        self.assertIn('"name"', sql)
+        self.assertNotIn('business_scope', sql)
+
+    def test_expand_nested_fields(self):
+        department = self.create_department()
+        response = self.client.get(
+            '/api/v1/base-info/departments/?fields=id,company.name,parent_department.name'
+            '&expand=company,parent_department'
+        )
+        row = next(item for item in response.data['results'] if item['id'] == department.id)
+        self.assertEqual(row['company'], {'name': department.company.name})
+        self.assertEqual(row['parent_department'], {'name': department.parent_department.name})
+
+    def test_unknown_names_rejected(self):
+        self.create_department()
+        response = self.client.get('/api/v1/base-info/departments/?fields=id,bogus')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('bogus', response.data['fields'])
+        self.assertIn('parent_department', response.data['fields'])
+
+        response = self.client.get('/api/v1/base-info/departments/?expand=manager')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('company, parent_department', response.data['expand'])
+
+        response = self.client.get('/api/v1/base-info/departments/?fields=id,company.bogus&expand=company')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('bogus', response.data['fields'])
+
+
+class DepartmentHierarchyTests(FixtureMixin, APITestCase):
+    """部门物化路径：调整上级部门、删除上级部门与按子树过滤人员"""
+
+    def setUp(self):
+        super().setUp()
+        self.company = self.create_company()
+        # a ─ b ─ c，d 为另一个顶级部门
+        self.a = self.add_department('A')
+        self.b = self.add_department('B', self.a)
+        self.c = self.add_department('C', self.b)
+        self.d = self.add_department('D')
+
+    def add_department(self, code, parent=None):
+        return Department.objects.create(
+            code=code, name=f'部门{code}', department_type='production', company=self.company,
+            parent_department=parent, created_by=self.user,
+        )
+
+    def add_personnel(self, department):
+        i = self.next_id()
+        return Personnel.objects.create(
+            employee_id=f'E{i}', name=f'员工{i}', gender='M', birth_date=datetime.date(1990, 1, 1),
+            id_card=f'ID{i}', company=self.company, department=department, position='技术员',
+            employment_type='fulltime', hire_date=datetime.date(2020, 1, 1),
+            contract_start=datetime.date(2020, 1, 1), education='bachelor', phone='000',
+        )
+
+    def assertPath(self, department, path):
+        department.refresh_from_db()
+        self.assertEqual(department.path, path)
+
+    def test_paths_on_create(self):
+        self.assertPath(self.a, f'/{self.a.pk}/')
+        self.assertPath(self.c, f'/{self.a.pk}/{self.b.pk}/{self.c.pk}/')
+        self.assertEqual(list(self.c.get_ancestors()), [self.a, self.b])
+        self.assertEqual(set(self.a.get_descendants()), {self.b, self.c})
+
+    def test_reparent_moves_subtree(self):
+        self.b.parent_department = self.d
+        self.b.save()
+        self.assertPath(self.b, f'/{self.d.pk}/{self.b.pk}/')
+        self.assertPath(self.c, f'/{self.d.pk}/{self.b.pk}/{self.c.pk}/')
+
+        self.b.parent_department = None
+        self.b.save()
+        self.assertPath(self.c, f'/{self.b.pk}/{self.c.pk}/')
+
+    def test_level_kept_as_entered(self):
+        Department.objects.filter(pk=self.c.pk).update(level=5)
+        self.b.parent_department = self.d
+        self.b.save()
+        self.c.refresh_from_db()
+        self.assertEqual(self.c.level, 5)
+
+        response = self.client.patch(f'/api/v1/base-info/departments/{self.b.pk}/', {'level': 7}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['level'], 7)
+        self.a.delete()
+        self.c.refresh_from_db()
+        self.assertEqual(self.c.level, 5)
+
+    def test_paths_read_inside_transaction(self):
+        self.c.parent_department = self.d
+        with CaptureQueriesContext(connection) as context:
+            self.c.save()
+        queries = [query['sql'] for query in context.captured_queries]
+        savepoint = next(i for i, sql in enumerate(queries) if sql.startswith('SAVEPOINT'))
+        path_read = next(i for i, sql in enumerate(queries) if sql.startswith('SELECT') and '"path"' in sql)
+        self.assertLess(savepoint, path_read)
+
+    def test_move_under_descendant_rejected(self):
+        self.a.parent_department = self.c
+        with self.assertRaises(ValueError):
+            self.a.save()
+        self.assertPath(self.c, f'/{self.a.pk}/{self.b.pk}/{self.c.pk}/')
+
+        response = self.client.patch(
+            f'/api/v1/base-info/departments/{self.a.pk}/', {'parent_department': self.c.pk}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('parent_department', response.data)
+        self.assertPath(self.a, f'/{self.a.pk}/')
+
+    def test_delete_reroots_children(self):
+        self.a.delete()
+        self.assertPath(self.b, f'/{self.b.pk}/')
+        self.assertPath(self.c, f'/{self.b.pk}/{self.c.pk}/')
+        self.assertIsNone(self.b.parent_department_id)
+
+    def test_migration_breaks_cycles(self):
+        # 绕过 save() 制造环 a → c → b → a，并清空路径
+        Department.objects.filter(pk=self.a.pk).update(parent_department=self.c)
+        Department.objects.update(path='', level=9)
+        migration = importlib.import_module('base_info.migrations.0002_department_path')
+        migration.build_paths(apps, None)
+
+        paths = dict(Department.objects.values_list('pk', 'path'))
+        self.assertEqual(paths[self.d.pk], f'/{self.d.pk}/')
+        for department in (self.a, self.b, self.c):
+            path = paths[department.pk]
+            ids = path.strip('/').split('/')
+            self.assertTrue(path.endswith(f'/{department.pk}/'))
+            self.assertEqual(len(ids), len(set(ids)))
+        roots = [pk for pk, path in paths.items() if path.count('/') == 2 and pk != self.d.pk]
+        self.assertEqual(len(roots), 1)
+        # 迁移只生成路径，保留原有的层级
+        self.assertFalse(Department.objects.exclude(level=9).exists())
+
+    def test_personnel_department_subtree(self):
+        in_b, in_c = self.add_personnel(self.b), self.add_personnel(self.c)
+        self.add_personnel(self.a)
+        self.add_personnel(self.d)
+
+        response = self.client.get(f'/api/v1/base-info/personnel/?department_subtree={self.b.pk}')
+        self.assertEqual({row['id'] for row in response.data['results']}, {in_b.pk, in_c.pk})
+        for value in ('x', '999999'):
+            response = self.client.get(f'/api/v1/base-info/personnel/?department_subtree={value}')
+            self.assertEqual(response.data['results'], [])
+
+
+class DepartmentTreeTests(FixtureMixin, APITestCase):
+    """部门树单次查询构建，按企业缓存，部门与负责人用户名变化时清除"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # 测试环境为进程内缓存，按共享缓存验证缓存与清除
+        patcher = mock.patch('base_info.tree.cache_is_shared', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.child = self.create_department()
+        self.company = self.child.company
+        self.url = f'/api/v1/base-info/departments/tree/?company_id={self.company.pk}'
+        self.key = CACHE_KEY.format(company_id=self.company.pk)
+
+    def get_tree(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_tree_built_in_one_query(self):
+        for i in range(5):
+            Department.objects.create(
+                code=f'T{i}', name=f'班组{i}', department_type='production', company=self.company,
+                parent_department=self.child, manager=self.user, created_by=self.user,
+            )
+        with CaptureQueriesContext(connection) as context:
+            tree = self.get_tree()
+        self.assertEqual(len([q for q in context.captured_queries if 'base_info_department' in q['sql']]), 1)
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree[0]['children'][0]['id'], self.child.pk)
+        self.assertEqual(len(tree[0]['children'][0]['children']), 5)
+        self.assertEqual(tree[0]['manager'], 'tester')
+
+        # 缓存命中时不再查询部门表
+        with CaptureQueriesContext(connection) as context:
+            self.get_tree()
+        self.assertFalse([q for q in context.captured_queries if 'base_info_department' in q['sql']])
+
+    def test_cache_cleared_on_department_save(self):
+        self.get_tree()
+        self.assertIsNotNone(cache.get(self.key))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.child.name = '新名称'
+            self.child.save()
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(self.get_tree()[0]['children'][0]['name'], '新名称')
+
+    def test_cache_cleared_on_manager_rename(self):
+        self.get_tree()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.last_login = self.user.date_joined
+            self.user.save(update_fields=['last_login'])
+        self.assertIsNotNone(cache.get(self.key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = 'renamed'
+            self.user.save()
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(self.get_tree()[0]['manager'], 'renamed')
+
+    def test_not_cached_without_shared_cache(self):
+        # 其它进程的修改无法清除本进程的缓存，进程内缓存时每次查询
+        with mock.patch('base_info.tree.cache_is_shared', return_value=False):
+            self.get_tree()
+            Department.objects.filter(pk=self.child.pk).update(name='新名称')
+            self.assertEqual(self.get_tree()[0]['children'][0]['name'], '新名称')
+        self.assertIsNone(cache.get(self.key))
+
+    def test_cache_backend_detection(self):
+        self.assertFalse(caching.cache_is_shared())
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://'}}
+        with self.settings(CACHES=redis):
+            self.assertTrue(caching.cache_is_shared())
@@ -0,0 +1,60 @@
+"""
+部门树
+
+一次查询取出企业的全部启用部门，在内存中组装树形结构；序列化后的结果按企业缓存，
+部门增删改时由信号清除。进程内缓存无法被其它进程的修改清除，此时不缓存、每次重新构建。
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from grinding_platform.caching import cache_is_shared
+
+from .models import Department
+
+
+CACHE_KEY = 'base_info:department_tree:{company_id}'
+
+
+def build_department_tree(company_id):
+    """单次查询构建企业的部门树（只包含从顶级部门可达的启用部门）"""
+    rows = Department.objects.filter(company_id=company_id, is_active=True).order_by('level', 'code').values(
+        'id', 'code', 'name', 'department_type', 'level', 'parent_department_id', 'manager__username',
+    )
+    type_labels = dict(Department.DEPARTMENT_TYPE_CHOICES)
+
+    children = {}
+    for row in rows:
+        children.setdefault(row['parent_department_id'], []).append({
+            'id': row['id'],
+            'code': row['code'],
+            'name': row['name'],
+            'department_type': type_labels.get(row['department_type'], row['department_type']),
+            'level': row['level'],
+            'manager': row['manager__username'],
+            'children': [],
+        })
+
+    # 从顶级部门向下挂接子部门，上级部门停用的子树不会出现在结果中
+    roots = children.get(None, [])
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        node['children'] = children.get(node['id'], [])
+        stack.extend(node['children'])
+    return roots
+
+
+def get_department_tree(company_id):
+    if not cache_is_shared():
+        return build_department_tree(company_id)
+    key = CACHE_KEY.format(company_id=company_id)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_department_tree(company_id)
+        cache.set(key, tree, timeout=settings.DEPARTMENT_TREE_CACHE_TIMEOUT)
+    return tree
+
+
+def invalidate_department_tree(*company_ids):
+    cache.delete_many([CACHE_KEY.format(company_id=company_id) for company_id in company_ids if company_id])
@@ -4,12 +4,16 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from grinding_platform.querysets import QuerysetOptimizationMixin
+from search.filters import FullTextSearchFilter
+from stats.counters import counter_statistics
 
 from .models import Company, Department, Personnel, Standard
 from .serializers import CompanySerializer, DepartmentSerializer, PersonnelSerializer, StandardSerializer
+from .tree import get_department_tree
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """企业信息视图集"""
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
@@ -23,29 +27,25 @@ class CompanyViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """获取企业统计信息"""
-        total = self.queryset.count()
-        active = self.queryset.filter(is_active=True).count()
-        
-        # 按类型统计
-        type_stats = {}
-        for choice in Company.COMPANY_TYPE_CHOICES:
-            type_stats[choice[1]] = self.queryset.filter(company_type=choice[0]).count()
-            
-        # 按规模统计
-        scale_stats = {}
-        for choice in Company.SCALE_CHOICES:
-            scale_stats[choice[1]] = self.queryset.filter(scale=choice[0]).count()
+        stats = counter_statistics(
+            Company,
+            conditions={'active': ('is_active', True)},
+            breakdowns={
+                'type_stats': ('company_type', Company.COMPANY_TYPE_CHOICES),
+                'scale_stats': ('scale', Company.SCALE_CHOICES),
+            },
+        )
         
         return Response({
-            'total': total,
-            'active': active,
-            'inactive': total - active,
-            'type_stats': type_stats,
-            'scale_stats': scale_stats
+            'total': stats['total'],
+            'active': stats['active'],
+            'inactive': stats['total'] - stats['active'],
+            'type_stats': stats['type_stats'],
+            'scale_stats': stats['scale_stats']
         })
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """部门信息视图集"""
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
@@ -62,27 +62,34 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         company_id = request.query_params.get('company_id')
         if not company_id:
             return Response({'error': '请提供企业ID'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            company_id = int(company_id)
+        except ValueError:
+            return Response({'error': '无效的企业ID'}, status=status.HTTP_400_BAD_REQUEST)
             
-        departments = self.queryset.filter(company_id=company_id, is_active=True)
-        
-        def build_tree(parent_id=None):
-            children = []
-            for dept in departments.filter(parent_department_id=parent_id):
-                children.append({
-                    'id': dept.id,
-                    'code': dept.code,
-                    'name': dept.name,
-                    'department_type': dept.get_department_type_display(),
-                    'level': dept.level,
-                    'manager': dept.manager.username if dept.manager else None,
-                    'children': build_tree(dept.id)
-                })
-            return children
-            
-        return Response(build_tree())
+        return Response(get_department_tree(company_id))
 
+    @action(detail=True, methods=['get'])
+    def ancestors(self, request, pk=None):
+        """获取全部上级部门（从顶级部门开始）"""
+        department = self.get_object()
+        serializer = self.get_serializer(department.get_ancestors(), many=True)
+        return Response(serializer.data)
 
-class PersonnelViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'])
+    def descendants(self, request, pk=None):
+        """获取全部下级部门（任意深度）"""
+        department = self.get_object()
+        queryset = self.filter_queryset(self.get_queryset()).filter(path__startswith=department.path).exclude(pk=department.pk)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class PersonnelViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """人员信息视图集"""
     queryset = Personnel.objects.all()
     serializer_class = PersonnelSerializer
@@ -93,54 +100,55 @@ class PersonnelViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'name', 'hire_date']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # 按部门子树过滤：?department_subtree=<部门ID> 返回该部门及其全部下级部门的人员
+        department_id = self.request.query_params.get('department_subtree')
+        if department_id:
+            if not department_id.isdigit():
+                return queryset.none()
+            path = Department.objects.filter(pk=department_id).values_list('path', flat=True).first()
+            if path is None:
+                return queryset.none()
+            queryset = queryset.filter(department__path__startswith=path)
+            
+        return queryset
+
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """获取人员统计信息"""
-        total = self.queryset.count()
-        active = self.queryset.filter(status='active').count()
-        
-        # 按性别统计
-        gender_stats = {}
-        for choice in Personnel.GENDER_CHOICES:
-            gender_stats[choice[1]] = self.queryset.filter(gender=choice[0]).count()
-            
-        # 按学历统计
-        education_stats = {}
-        for choice in Personnel.EDUCATION_CHOICES:
-            education_stats[choice[1]] = self.queryset.filter(education=choice[0]).count()
-            
-        # 按状态统计
-        status_stats = {}
-        for choice in Personnel.STATUS_CHOICES:
-            status_stats[choice[1]] = self.queryset.filter(status=choice[0]).count()
+        stats = counter_statistics(
+            Personnel,
+            conditions={'active': ('status', 'active')},
+            breakdowns={
+                'gender_stats': ('gender', Personnel.GENDER_CHOICES),
+                'education_stats': ('education', Personnel.EDUCATION_CHOICES),
+                'status_stats': ('status', Personnel.STATUS_CHOICES),
+            },
+        )
         
-        return Response({
-            'total': total,
-            'active': active,
-            'gender_stats': gender_stats,
-            'education_stats': education_stats,
-            'status_stats': status_stats
-        })
+        return Response(stats)
 
     @action(detail=False, methods=['get'])
     def by_department(self, request):
         """按部门统计人员"""
         department_id = request.query_params.get('department_id')
         if department_id:
-            personnel = self.queryset.filter(department_id=department_id, is_active=True)
+            personnel = self.get_queryset().filter(department_id=department_id, is_active=True)
         else:
-            personnel = self.queryset.filter(is_active=True)
+            personnel = self.get_queryset().filter(is_active=True)
             
         serializer = self.get_serializer(personnel, many=True)
         return Response(serializer.data)
 
 
-class StandardViewSet(viewsets.ModelViewSet):
+class StandardViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """标准规范视图集"""
     queryset = Standard.objects.all()
     serializer_class = StandardSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['standard_type', 'status', 'is_mandatory', 'is_active']
     search_fields = ['title', 'standard_code', 'keywords', 'publisher']
     ordering_fields = ['created_at', 'publish_date', 'implement_date']
@@ -149,27 +157,19 @@ class StandardViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """获取标准统计信息"""
-        total = self.queryset.count()
-        current = self.queryset.filter(status='current').count()
-        mandatory = self.queryset.filter(is_mandatory=True).count()
-        
-        # 按类型统计
-        type_stats = {}
-        for choice in Standard.STANDARD_TYPE_CHOICES:
-            type_stats[choice[1]] = self.queryset.filter(standard_type=choice[0]).count()
-            
-        # 按状态统计
-        status_stats = {}
-        for choice in Standard.STATUS_CHOICES:
-            status_stats[choice[1]] = self.queryset.filter(status=choice[0]).count()
+        stats = counter_statistics(
+            Standard,
+            conditions={
+                'current': ('status', 'current'),
+                'mandatory': ('is_mandatory', True),
+            },
+            breakdowns={
+                'type_stats': ('standard_type', Standard.STANDARD_TYPE_CHOICES),
+                'status_stats': ('status', Standard.STATUS_CHOICES),
+            },
+        )
         
-        return Response({
-            'total': total,
-            'current': current,
-            'mandatory': mandatory,
-            'type_stats': type_stats,
-            'status_stats': status_stats
-        })
+        return Response(stats)
 
     @action(detail=False, methods=['get'])
     def search_by_classification(self, request):
@@ -178,7 +178,7 @@ class StandardViewSet(viewsets.ModelViewSet):
         if not classification:
             return Response({'error': '请提供分类名称'}, status=status.HTTP_400_BAD_REQUEST)
             
-        standards = self.queryset.filter(
+        standards = self.get_queryset().filter(
             Q(classification__icontains=classification) | 
             Q(keywords__icontains=classification)
         ).filter(is_active=True)
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Chemical',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50, unique=True, verbose_name='化学剂编号')),
+                ('name', models.CharField(max_length=200, verbose_name='化学剂名称')),
+                ('type', models.CharField(choices=[('cutting_fluid', '切削液'), ('cleaning_agent', '清洗剂'), ('rust_preventive', '防锈剂'), ('lubricant', '润滑剂'), ('passivator', '钝化剂')], max_length=20, verbose_name='类型')),
+                ('manufacturer', models.CharField(max_length=200, verbose_name='生产厂家')),
+                ('components', models.TextField(verbose_name='主要成分')),
+                ('ph_range', models.CharField(max_length=50, verbose_name='PH值范围')),
+                ('density', models.FloatField(verbose_name='密度(g/cm³)')),
+                ('flash_point', models.CharField(max_length=50, verbose_name='闪点(℃)')),
+                ('safety_level', models.CharField(choices=[('low', '低风险'), ('medium', '中风险'), ('high', '高风险')], default='low', max_length=10, verbose_name='安全等级')),
+                ('expiry_date', models.DateField(verbose_name='有效期')),
+                ('msds_file', models.FileField(blank=True, null=True, upload_to='chemicals/msds/', verbose_name='MSDS文件')),
+                ('formula_file', models.FileField(blank=True, null=True, upload_to='chemicals/formulas/', verbose_name='配方文件')),
+                ('remark', models.TextField(blank=True, verbose_name='备注')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '化学剂',
+                'verbose_name_plural': '化学剂',
+                'ordering': ['code'],
+            },
+        ),
+    ]
@@ -1,14 +1,15 @@
 # equipment/serializers.py
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import Equipment, EquipmentType, EquipmentMaintenance, EquipmentAlert, Chemical
 
-class EquipmentTypeSerializer(serializers.ModelSerializer):
+class EquipmentTypeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """设备类型序列化器"""
     class Meta:
         model = EquipmentType
         fields = '__all__'
 
-class EquipmentSerializer(serializers.ModelSerializer):
+class EquipmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """设备序列化器"""
     equipment_type_name = serializers.CharField(source='equipment_type.name', read_only=True)
     responsible_person_name = serializers.CharField(source='responsible_person.username', read_only=True)
@@ -25,8 +26,9 @@ class EquipmentSerializer(serializers.ModelSerializer):
             'responsible_person', 'responsible_person_name', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = {'equipment_type': EquipmentTypeSerializer}
 
-class EquipmentMaintenanceSerializer(serializers.ModelSerializer):
+class EquipmentMaintenanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """设备维护序列化器"""
     equipment_name = serializers.CharField(source='equipment.name', read_only=True)
     performed_by_name = serializers.CharField(source='performed_by.username', read_only=True)
@@ -40,7 +42,7 @@ class EquipmentMaintenanceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id']
 
-class EquipmentAlertSerializer(serializers.ModelSerializer):
+class EquipmentAlertSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """设备警告序列化器"""
     equipment_name = serializers.CharField(source='equipment.name', read_only=True)
     resolved_by_name = serializers.CharField(source='resolved_by.username', read_only=True)
@@ -55,7 +57,7 @@ class EquipmentAlertSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
-class ChemicalSerializer(serializers.ModelSerializer):
+class ChemicalSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """化学剂序列化器"""
     type_display = serializers.CharField(source='get_type_display', read_only=True)
     safety_level_display = serializers.CharField(source='get_safety_level_display', read_only=True)
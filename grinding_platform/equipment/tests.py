@@ -1,3 +1,31 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from .models import Chemical, Equipment, EquipmentType
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """设备（含展开的设备类型）与化学剂列表的查询数不随行数增长"""
+
+    def create_equipment(self):
+        i = self.next_id()
+        return Equipment.objects.create(
+            name=f'设备{i}', code=f'EQ{i}', equipment_type=EquipmentType.objects.create(name=f'类型{i}'),
+            model='-', manufacturer='-', location='-', workshop='-',
+        )
+
+    def create_chemical(self):
+        i = self.next_id()
+        return Chemical.objects.create(
+            code=f'CH{i}', name=f'光饰剂{i}', type='cutting_fluid', manufacturer='-', components='-',
+            ph_range='7-8', density=1.0, flash_point='-', expiry_date=datetime.date(2030, 1, 1),
+        )
+
+    def test_equipment(self):
+        self.assertConstantQueries('/api/v1/equipment/?expand=equipment_type', self.create_equipment)
+
+    def test_chemicals(self):
+        self.assertConstantQueries('/api/v1/equipment/chemicals/', self.create_chemical)
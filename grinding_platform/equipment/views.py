@@ -2,12 +2,13 @@ from django.shortcuts import render
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from grinding_platform.querysets import QuerysetOptimizationMixin
 from .models import Equipment, Chemical
 from .serializers import EquipmentSerializer, ChemicalSerializer
 
 # Create your views here.
 
-class EquipmentListView(generics.ListAPIView):
+class EquipmentListView(QuerysetOptimizationMixin, generics.ListAPIView):
     """设备列表"""
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
@@ -19,7 +20,7 @@ class EquipmentCreateView(generics.CreateAPIView):
     serializer_class = EquipmentSerializer
     permission_classes = [IsAuthenticated]
 
-class EquipmentDetailView(generics.RetrieveAPIView):
+class EquipmentDetailView(QuerysetOptimizationMixin, generics.RetrieveAPIView):
     """设备详情"""
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
@@ -57,14 +58,14 @@ class EquipmentStatusView(generics.GenericAPIView):
         except Equipment.DoesNotExist:
             return Response({'error': '设备不存在'}, status=status.HTTP_404_NOT_FOUND)
 
-class ChemicalListView(generics.ListCreateAPIView):
+class ChemicalListView(QuerysetOptimizationMixin, generics.ListCreateAPIView):
     """化学剂列表和创建"""
     queryset = Chemical.objects.all()
     serializer_class = ChemicalSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Chemical.objects.all()
+        queryset = super().get_queryset()
         code = self.request.query_params.get('code', None)
         name = self.request.query_params.get('name', None)
         type = self.request.query_params.get('type', None)
@@ -81,7 +82,7 @@ class ChemicalListView(generics.ListCreateAPIView):
             
         return queryset
 
-class ChemicalDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ChemicalDetailView(QuerysetOptimizationMixin, generics.RetrieveUpdateDestroyAPIView):
     """化学剂详情、更新和删除"""
     queryset = Chemical.objects.all()
     serializer_class = ChemicalSerializer
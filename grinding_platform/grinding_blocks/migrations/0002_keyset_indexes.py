@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grinding_blocks', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blockhistory',
+            index=models.Index(fields=['block', 'timestamp', 'id'], name='grinding_bl_block_i_159abb_idx'),
+        ),
+    ]
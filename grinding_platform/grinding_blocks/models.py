@@ -110,6 +110,9 @@ class BlockHistory(models.Model):
         verbose_name = '磨块历史'
         verbose_name_plural = '磨块历史'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['block', 'timestamp', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.block.block_name} - {self.get_action_display()} ({self.timestamp})"
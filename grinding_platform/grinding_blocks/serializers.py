@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import GrindingBlock, BlockHistory
 from users.serializers import UserSerializer
 
-class GrindingBlockSerializer(serializers.ModelSerializer):
+class GrindingBlockSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """磨块信息序列化器"""
     created_by = UserSerializer(read_only=True)
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
@@ -18,7 +19,7 @@ class GrindingBlockSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
 
-class BlockHistorySerializer(serializers.ModelSerializer):
+class BlockHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """磨块历史记录序列化器"""
     user = UserSerializer(read_only=True)
     action_display = serializers.CharField(source='get_action_display', read_only=True)
@@ -31,4 +32,5 @@ class BlockHistorySerializer(serializers.ModelSerializer):
             'id', 'block', 'block_name', 'block_no', 'action',
             'action_display', 'changes', 'user', 'timestamp'
         ]
-        read_only_fields = ['id', 'timestamp'] 
\ No newline at end of file
+        read_only_fields = ['id', 'timestamp']
+        expandable_fields = {'block': GrindingBlockSerializer}
\ No newline at end of file
@@ -1,3 +1,25 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from .models import GrindingBlock
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """磨块列表的查询数不随行数增长"""
+
+    def setUp(self):
+        super().setUp()
+        self.user.user_type = 'process_engineer'
+        self.user.save()
+
+    def create_block(self):
+        i = self.next_id()
+        return GrindingBlock.objects.create(
+            block_no=f'B{i}', block_name=f'磨块{i}', block_type='陶瓷', block_brand='-', block_factory='-',
+            block_shape='三角', block_spec='10×10', block_material='棕刚玉', block_color='棕色',
+            created_by=self.user,
+        )
+
+    def test_blocks(self):
+        self.assertConstantQueries('/api/v1/grinding-blocks/blocks/', self.create_block)
@@ -1,8 +1,12 @@
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from grinding_platform.pagination import KeysetPagination
+from grinding_platform.querysets import QuerysetOptimizationMixin, optimize_queryset
+from search.autocomplete import autocomplete
+from search.filters import FullTextSearchFilter
 from .models import GrindingBlock, BlockHistory
 from .serializers import GrindingBlockSerializer, BlockHistorySerializer
 
@@ -15,27 +19,18 @@ class IsProcessEngineerOrFullstack(permissions.BasePermission):
             request.user.user_type in ['process_engineer', 'fullstack_engineer']
         )
 
-class GrindingBlockViewSet(viewsets.ModelViewSet):
+class GrindingBlockViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """磨块信息视图集"""
     queryset = GrindingBlock.objects.all()
     serializer_class = GrindingBlockSerializer
     permission_classes = [IsProcessEngineerOrFullstack]
+    filter_backends = [FullTextSearchFilter]
+    search_fields = ['block_no', 'block_name', 'block_type', 'block_brand', 'block_factory']
     
     def get_queryset(self):
         """自定义查询集"""
         queryset = super().get_queryset()
         
-        # 搜索功能
-        search = self.request.query_params.get('search', '')
-        if search:
-            queryset = queryset.filter(
-                Q(block_no__icontains=search) |
-                Q(block_name__icontains=search) |
-                Q(block_type__icontains=search) |
-                Q(block_brand__icontains=search) |
-                Q(block_factory__icontains=search)
-            )
-        
         # 按类型筛选
         block_type = self.request.query_params.get('block_type')
         if block_type:
@@ -94,18 +89,24 @@ class GrindingBlockViewSet(viewsets.ModelViewSet):
     def history(self, request, pk=None):
         """获取磨块历史记录"""
         block = self.get_object()
-        history = block.history.all()
-        serializer = BlockHistorySerializer(history, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        paginator.ordering = ('-timestamp', '-id')
+        queryset = optimize_queryset(block.history.all(), BlockHistorySerializer())
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = BlockHistorySerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def block_types(self, request):
-        """获取所有磨块类型"""
-        types = GrindingBlock.objects.values_list('block_type', flat=True).distinct()
-        return Response(list(types))
+        """获取磨块类型（按磨块数量降序，支持 ?q= 前缀过滤）"""
+        return Response(self._suggest('block_type'))
     
     @action(detail=False, methods=['get'])
     def factories(self, request):
-        """获取所有磨块厂家"""
-        factories = GrindingBlock.objects.values_list('block_factory', flat=True).distinct()
-        return Response(list(factories))
+        """获取磨块厂家（按磨块数量降序，支持 ?q= 前缀过滤）"""
+        return Response(self._suggest('block_factory'))
+
+    def _suggest(self, field):
+        """从取值字典中按 ?q= 前缀返回最常用的取值，最多 AUTOCOMPLETE_MAX_LIMIT 个"""
+        prefix = self.request.query_params.get('q', '').strip()
+        return [value for value, _ in autocomplete.suggest(field, prefix, settings.AUTOCOMPLETE_MAX_LIMIT)]
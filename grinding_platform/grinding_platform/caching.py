@@ -0,0 +1,33 @@
+"""
+缓存后端
+
+未设置 REDIS_URL 时默认缓存为进程内的 LocMemCache：一个进程写入或清除的缓存项对其它进程不可见。
+依赖缓存在进程间同步的功能通过 cache_is_shared() 判断后端，进程内缓存时改用不依赖缓存的方式；
+特征存储、特征统计、权重集与全局检索索引的版本号只能通过缓存同步，manage.py check --deploy 会提示。
+"""
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.checks import Warning
+
+
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_is_shared(alias=DEFAULT_CACHE_ALIAS):
+    """缓存后端是否在进程间共享（Redis、Memcached、数据库、文件缓存等）"""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """部署检查：多进程部署时进程内缓存不能同步各进程的版本号"""
+    if cache_is_shared():
+        return []
+    return [Warning(
+        '默认缓存为进程内缓存，多进程部署时各进程的特征存储、特征统计、权重集与全局检索索引不会同步更新',
+        hint='设置 REDIS_URL 使用共享缓存；单进程部署可忽略',
+        id='grinding_platform.W001',
+    )]
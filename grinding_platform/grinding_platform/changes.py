@@ -0,0 +1,36 @@
+"""
+保存前的字段旧值
+
+特征统计、计数器等 post_save 处理都需要对比修改前的字段值。各应用按模型登记需要的字段，
+pre_save 时只查询一次旧值，供所有处理函数共享，一次保存不会因多个应用各自查询而多出几次 SELECT。
+"""
+
+from django.db.models.signals import pre_save
+
+
+# 需要记录旧值的字段：{模型: {字段, ...}}
+TRACKED_FIELDS = {}
+
+
+def track_previous_values(model, fields):
+    """登记模型保存前需要读取旧值的字段"""
+    label = model._meta.label_lower
+    TRACKED_FIELDS.setdefault(label, set()).update(fields)
+    pre_save.connect(remember_previous_values, sender=model, dispatch_uid=f'previous_values:{label}')
+
+
+def remember_previous_values(sender, instance, update_fields=None, **kwargs):
+    instance._previous_values = None
+    if instance.pk is None or instance._state.adding:
+        return
+    fields = TRACKED_FIELDS[sender._meta.label_lower]
+    if update_fields is not None and not fields.intersection(update_fields):
+        # 登记的字段都不在本次写入范围内，取值不会变化
+        instance._previous_values = {name: instance.serializable_value(name) for name in fields}
+        return
+    instance._previous_values = sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+def previous_values(instance):
+    """返回保存前登记字段的取值；新建或数据库中不存在时返回 None"""
+    return getattr(instance, '_previous_values', None)
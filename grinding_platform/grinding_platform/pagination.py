@@ -0,0 +1,162 @@
+"""
+分页
+
+PageNumberPagination 为默认分页；?search= 的结果被 SEARCH_MAX_RESULTS 截断时，
+它与 KeysetPagination 都在响应中加上 search_truncated: true。
+
+KeysetPagination 按 (时间字段, id) 做游标分页，用于只追加、持续增长的表（日志、历史、使用记录、评论）：
+    不统计总数，也不使用 OFFSET，翻到任意深度都只扫描一页的行（需要 (时间字段, id) 复合索引）。
+视图通过 keyset_ordering 指定排序字段，如 ('-timestamp', '-id')，两个字段的方向必须一致。
+排序固定为游标字段，请求中带 ?ordering= 时返回 400，而不是接受后忽略。
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework import pagination
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class SearchTruncationMixin:
+    """检索结果被截断时（见 search.filters.FullTextSearchFilter）在分页响应中注明"""
+
+    def get_paginated_response(self, data):
+        return self.mark_search_truncated(super().get_paginated_response(data))
+
+    def mark_search_truncated(self, response):
+        if getattr(self.request, 'search_truncated', False):
+            response.data['search_truncated'] = True
+        return response
+
+
+class PageNumberPagination(SearchTruncationMixin, pagination.PageNumberPagination):
+    pass
+
+
+class KeysetPagination(SearchTruncationMixin, BasePagination):
+    """(时间字段, id) 游标分页，返回 {'next', 'previous', 'results'}"""
+
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    ordering_param = 'ordering'
+    invalid_cursor_message = '无效的游标'
+    ordering_not_supported_message = '游标分页的接口不支持自定义排序'
+
+    def get_ordering(self, view):
+        ordering = getattr(view, 'keyset_ordering', None) or self.ordering
+        descending = ordering[0].startswith('-')
+        assert len(ordering) == 2 and ordering[1].startswith('-') == descending, (
+            'keyset_ordering 应为方向一致的 (时间字段, 主键) 两个字段'
+        )
+        return ordering[0].lstrip('-'), ordering[1].lstrip('-'), descending
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def decode_cursor(self, request):
+        """返回 (是否向前翻页, 时间, id)，未提供游标时返回 None"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = parse_datetime(data['v'])
+            pk = int(data['p'])
+            reverse = bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if position is None:
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position, pk
+
+    def encode_cursor(self, reverse, row):
+        data = {'r': int(reverse), 'v': getattr(row, self.field).isoformat(), 'p': getattr(row, self.pk_field)}
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if request.query_params.get(self.ordering_param):
+            raise ValidationError({self.ordering_param: self.ordering_not_supported_message})
+        self.field, self.pk_field, descending = self.get_ordering(view)
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[0]
+
+        # 向后翻页时与排序方向相同地取更“旧”的行，向前翻页时反向取后再倒序
+        older = descending != reverse
+        if cursor is not None:
+            _, position, pk = cursor
+            lookup = 'lt' if older else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': position})
+                | Q(**{self.field: position, f'{self.pk_field}__{lookup}': pk})
+            )
+        prefix = '-' if older else ''
+        queryset = self._load_keys(queryset).order_by(f'{prefix}{self.field}', f'{prefix}{self.pk_field}')
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_url = self.previous_url = None
+        if rows:
+            # 向前翻页得到的页之后一定还有行；向后翻页时带游标说明之前还有行
+            has_next = cursor is not None if reverse else has_more
+            has_previous = has_more if reverse else cursor is not None
+            if has_next:
+                self.next_url = self.encode_cursor(False, rows[-1])
+            if has_previous:
+                self.previous_url = self.encode_cursor(True, rows[0])
+        elif reverse:
+            # 向前翻过了第一页，回到第一页
+            self.next_url = remove_query_param(self.base_url, self.cursor_query_param)
+        return rows
+
+    def _load_keys(self, queryset):
+        """only() 优化过的查询集需要同时加载游标字段，避免逐行补查"""
+        names, defer = queryset.query.deferred_loading
+        if not defer:
+            queryset = queryset.only(*names, self.field, self.pk_field)
+        elif self.field in names:
+            queryset = queryset.defer(None).defer(*(names - {self.field}))
+        return queryset
+
+    def get_paginated_response(self, data):
+        # BasePagination 没有可供 super() 调用的实现，直接构造响应后注明截断
+        return self.mark_search_truncated(Response(OrderedDict([
+            ('next', self.next_url),
+            ('previous', self.previous_url),
+            ('results', data),
+        ])))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,169 @@
+"""
+查询集优化
+
+根据序列化器的字段（点号分隔的 source、嵌套序列化器、多对多主键字段）推断需要的
+select_related / prefetch_related / only，避免列表接口逐行访问外键产生 N+1 查询。
+"""
+
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+DISPLAY_SOURCE = re.compile(r'^get_(\w+)_display$')
+
+
+class QueryPlan:
+    """序列化器对应的查询计划"""
+
+    def __init__(self):
+        self.select = set()
+        self.prefetch = {}
+        # 需要加载的字段路径；为 None 时表示无法确定（存在方法字段等），不使用 only()
+        self.only = set()
+
+    def discard_only(self):
+        self.only = None
+
+    def add_only(self, path):
+        if self.only is not None:
+            self.only.add(path)
+
+
+def _forward(field):
+    """可以通过 select_related 加载的关系（外键、一对一，含反向一对一）"""
+    return field.many_to_one or field.one_to_one
+
+
+def _get_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _add_source(plan, model, source, prefix='', need_object=True):
+    """解析点号分隔的 source，沿外键加入 select_related，遇到多值关系时加入 prefetch
+
+    need_object 为假时，source 指向外键本身只需要外键列（如 PrimaryKeyRelatedField）。
+    """
+    parts = source.split('.')
+    path = prefix
+    for i, name in enumerate(parts):
+        match = DISPLAY_SOURCE.match(name)
+        field = _get_field(model, match.group(1) if match else name)
+        if field is None:
+            # 模型属性或方法，无法确定依赖的字段
+            plan.discard_only()
+            return
+        lookup = f'{path}__{field.name}' if path else field.name
+        if not field.is_relation:
+            plan.add_only(lookup)
+            return
+        if not _forward(field):
+            plan.prefetch.setdefault(lookup, None)
+            return
+        if field.concrete:
+            plan.add_only(lookup)
+        if i == len(parts) - 1:
+            if need_object:
+                # 序列化关联对象本身（如 __str__），依赖的字段未知
+                plan.select.add(lookup)
+                plan.discard_only()
+            return
+        plan.select.add(lookup)
+        model = field.related_model
+        path = lookup
+
+
+def _analyze(plan, serializer, model, prefix=''):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            plan.discard_only()
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer):
+            relation = _get_field(model, field.source)
+            if relation is None or not relation.is_relation:
+                plan.discard_only()
+                continue
+            lookup = f'{prefix}__{relation.name}' if prefix else relation.name
+            if _forward(relation):
+                plan.select.add(lookup)
+                if relation.concrete:
+                    plan.add_only(lookup)
+                _analyze(plan, nested, relation.related_model, lookup)
+            else:
+                queryset = optimize_queryset(relation.related_model.objects.all(), nested)
+                plan.prefetch[lookup] = Prefetch(lookup, queryset=queryset)
+            continue
+
+        if isinstance(field, serializers.ManyRelatedField):
+            _add_source(plan, model, field.source, prefix)
+            continue
+
+        need_object = not isinstance(field, serializers.PrimaryKeyRelatedField)
+        _add_source(plan, model, field.source, prefix, need_object=need_object)
+
+
+def build_plan(serializer, model):
+    plan = QueryPlan()
+    _analyze(plan, serializer, model)
+    if plan.only is not None:
+        plan.only.add(model._meta.pk.name)
+    return plan
+
+
+def optimize_queryset(queryset, serializer, use_only=False):
+    """按序列化器字段为查询集加入 select_related / prefetch_related，use_only 为真时只加载用到的字段"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    plan = build_plan(serializer, queryset.model)
+
+    if plan.select:
+        queryset = queryset.select_related(*sorted(plan.select))
+    existing = {
+        lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+        for lookup in queryset._prefetch_related_lookups
+    }
+    prefetches = [
+        lookup if prefetch is None else prefetch
+        for lookup, prefetch in sorted(plan.prefetch.items())
+        if lookup not in existing
+    ]
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if use_only and plan.only and queryset.query.deferred_loading == (frozenset(), True):
+        queryset = queryset.only(*sorted(plan.only))
+    return queryset
+
+
+class QuerysetOptimizationMixin:
+    """根据 get_serializer_class() 自动优化 get_queryset() 的视图混入类
+
+    需要放在 DRF 视图基类之前；子类重写 get_queryset 时应调用 super().get_queryset()。
+    列表类的只读请求额外使用 only() 加载序列化器用到的字段；单个对象的请求可能随后
+    修改并保存实例（如增加查看次数），加载全部字段。
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return queryset
+        if not issubclass(queryset.model, serializer_class.Meta.model):
+            return queryset
+        serializer = serializer_class(context=self.get_serializer_context())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        use_only = (
+            self.request is not None
+            and self.request.method in SAFE_METHODS
+            and lookup_url_kwarg not in self.kwargs
+        )
+        return optimize_queryset(queryset, serializer, use_only=use_only)
@@ -0,0 +1,91 @@
+"""
+序列化器公共组件
+
+SparseFieldsMixin 支持通过查询参数裁剪与展开字段：
+    ?fields=id,name,company.name    只返回列出的字段，点号表示展开后关联对象的字段
+    ?expand=company                 将外键由主键展开为关联对象（Meta.expandable_fields 中声明）
+裁剪后的字段同时被 QuerysetOptimizationMixin 用来缩小 only() 的列范围。
+列出不存在或不可展开的字段时返回 400，并列出可用的字段。
+"""
+
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_list(value):
+    """将 'a,b.c,b.d' 解析为 {'a': {}, 'b': {'c': {}, 'd': {}}}"""
+    tree = {}
+    for item in value.split(','):
+        node = tree
+        for part in item.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """按 ?fields= / ?expand= 裁剪或展开字段，只作用于 GET 请求的顶层序列化器
+
+    Meta.expandable_fields: {字段名: 序列化器类或其导入路径}
+    嵌套使用时可以通过构造参数 fields / expand 直接传入（已解析的树）。
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._sparse_fields = kwargs.pop('fields', None)
+        self._sparse_expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _requested(self):
+        """返回 (fields 树, expand 树)，未指定时为 None"""
+        if self._sparse_fields is not None or self._sparse_expand is not None:
+            return self._sparse_fields, self._sparse_expand
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS or not self._is_root():
+            return None, None
+        fields = request.query_params.get('fields')
+        expand = request.query_params.get('expand')
+        return (
+            parse_field_list(fields) if fields else None,
+            parse_field_list(expand) if expand else None,
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = self._requested()
+        if requested is None and expand is None:
+            return fields
+
+        expandable = {
+            name: serializer_class
+            for name, serializer_class in getattr(self.Meta, 'expandable_fields', {}).items()
+            if name in fields
+        }
+        self._check_names('fields', requested, fields)
+        self._check_names('expand', expand, expandable)
+        for name, nested_expand in (expand or {}).items():
+            serializer_class = expandable[name]
+            if isinstance(serializer_class, str):
+                serializer_class = import_string(serializer_class)
+            kwargs = {'read_only': True}
+            if issubclass(serializer_class, SparseFieldsMixin):
+                nested_fields = (requested or {}).get(name) or None
+                kwargs.update(fields=nested_fields, expand=nested_expand or None)
+            fields[name] = serializer_class(**kwargs)
+
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields
+
+    def _check_names(self, param, names, available):
+        unknown = [name for name in names or {} if name not in available]
+        if unknown:
+            raise serializers.ValidationError({
+                param: f'未知的字段: {", ".join(unknown)}；可用字段: {", ".join(available) or "无"}',
+            })
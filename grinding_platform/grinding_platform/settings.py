@@ -60,6 +60,8 @@ INSTALLED_APPS = [
     'process_cases.apps.ProcessCasesConfig',
     'polishing_requirements.apps.PolishingRequirementsConfig',
     'polishing_processes.apps.PolishingProcessesConfig',
+    'stats.apps.StatsConfig',
+    'search.apps.SearchConfig',
 ]
 
 MIDDLEWARE = [
@@ -115,6 +117,25 @@ DATABASES = {
 }
 
 
+# 缓存配置
+# 多进程部署（如 gunicorn 多个 worker）时设置 REDIS_URL 使用共享缓存；
+# 未设置时使用进程内缓存，部门树缓存与缓冲计数改为不使用缓存（见 grinding_platform.caching）
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -177,7 +198,7 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'grinding_platform.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
@@ -262,6 +283,65 @@ LOGGING = {
     },
 }
 
+# 案例推理配置
+# 特征矩阵快照目录，设置后各 worker 通过内存映射共享同一份 .npy 快照；
+# 多进程部署时需配置共享缓存（REDIS_URL），以便各进程同步特征存储版本号
+CASE_FEATURE_STORE_DIR = os.getenv('CASE_FEATURE_STORE_DIR') or None
+# 增量更新后写快照的最小间隔（秒），全量加载后总会写入快照
+CASE_FEATURE_STORE_SNAPSHOT_SECONDS = 300
+
+# 近似最近邻索引文件（由 manage.py build_case_index 生成）；
+# auto 模式下案例数达到 CASE_INDEX_MIN_CASES 才启用索引，NPROBE 越大召回率越高、耗时越长
+CASE_INDEX_PATH = os.getenv('CASE_INDEX_PATH', str(BASE_DIR / 'case_index' / 'ivf.npz'))
+CASE_INDEX_MIN_CASES = 50000
+CASE_INDEX_NPROBE = 8
+
+# 按零件材质/研磨介质分区裁剪候选集时，分区至少需要的案例数，不足则全量扫描
+CASE_PARTITION_MIN_CANDIDATES = 200
+
+# 批量匹配单次请求的最大目标数
+CASE_BATCH_MAX_TARGETS = 200
+
+# 流式匹配每个分块的案例数，每完成一个分块推送一次当前结果
+CASE_STREAM_CHUNK_SIZE = 20000
+
+# 基础信息配置
+# 部门树缓存时间（秒），部门增删改时会主动清除；仅在共享缓存下缓存
+DEPARTMENT_TREE_CACHE_TIMEOUT = 3600
+
+# 全文检索配置
+# 单次检索最多返回的对象数（按相关度截取），超出部分不参与分页，分页响应中带 search_truncated: true
+SEARCH_MAX_RESULTS = 1000
+
+# 全局检索（/api/v1/search/）每个分类默认及最多返回的条数
+GLOBAL_SEARCH_LIMIT = 5
+GLOBAL_SEARCH_MAX_LIMIT = 50
+# 全局检索的内存索引取不到共享增量时全量重新加载，每个进程至多每隔该时间（秒）一次
+SEARCH_INDEX_RELOAD_SECONDS = 60
+
+# 取值提示（/api/v1/search/autocomplete/）默认及最多返回的条数
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 100
+# 进程内取值字典按 updated_at 增量刷新、全量重新加载的间隔（秒）
+AUTOCOMPLETE_REFRESH_SECONDS = 10
+AUTOCOMPLETE_RELOAD_SECONDS = 3600
+
+# 统计配置
+# 缓冲计数（如知识查看次数）写回数据库的间隔（秒），待写回的对象达到阈值时立即写回；
+# 也可通过 manage.py flush_counters 定时写回；未配置共享缓存时不缓冲，每次直接写回
+BUFFERED_COUNTER_FLUSH_SECONDS = 60
+BUFFERED_COUNTER_FLUSH_THRESHOLD = 50
+
+# 系统日志配置
+# SystemLog.log 放入进程内的有界队列，由后台线程凑满一批或超过间隔（秒）后批量写入；
+# 队列已满时 drop 直接丢弃新日志，block 最多等待 SYSTEM_LOG_BLOCK_TIMEOUT 秒后再丢弃
+SYSTEM_LOG_ASYNC = True
+SYSTEM_LOG_BATCH_SIZE = 100
+SYSTEM_LOG_FLUSH_INTERVAL = 1.0
+SYSTEM_LOG_QUEUE_SIZE = 10000
+SYSTEM_LOG_OVERFLOW = 'drop'
+SYSTEM_LOG_BLOCK_TIMEOUT = 0.1
+
 # Security Settings for Production
 # Uncomment these when deploying to production
 # SECURE_BROWSER_XSS_FILTER = True
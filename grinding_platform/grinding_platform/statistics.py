@@ -0,0 +1,10 @@
+"""
+统计结果的输出格式
+
+各模型的统计数据由 stats.counters.counter_statistics 从计数器读取，这里整理为接口的返回格式。
+"""
+
+
+def group_counts(counts, field):
+    """将 {取值: 计数} 转为 [{字段: 取值, 'count': 计数}]，省略计数为 0 的取值"""
+    return [{field: value, 'count': count} for value, count in counts.items() if count]
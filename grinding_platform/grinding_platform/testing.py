@@ -0,0 +1,105 @@
+"""
+各应用测试共用的数据构造
+"""
+
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from base_info.models import Company, Department
+from polishing_processes.models import PolishingProcess, ProcessReview, ProcessStep, ProcessUsageRecord
+from polishing_requirements.models import PolishingRequirement, RequirementComment
+from process_cases.models import ProcessCase
+
+
+User = get_user_model()
+
+
+class FixtureMixin:
+    """测试数据构造"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.client.force_authenticate(self.user)
+        self.sequence = 0
+
+    def next_id(self):
+        self.sequence += 1
+        return self.sequence
+
+    def create_company(self):
+        i = self.next_id()
+        return Company.objects.create(
+            code=f'C{i}', name=f'企业{i}', company_type='manufacturer', unified_social_code=f'USC{i}',
+            legal_representative='张三', registered_capital=100, establishment_date=datetime.date(2000, 1, 1),
+            scale='large', address='地址', phone='000', business_scope='-', main_products='-',
+            industry_category='-', created_by=self.user,
+        )
+
+    def create_department(self):
+        company = self.create_company()
+        i = self.next_id()
+        parent = Department.objects.create(
+            code=f'D{i}', name=f'部门{i}', department_type='production', company=company,
+            manager=self.user, created_by=self.user,
+        )
+        return Department.objects.create(
+            code=f'D{i}-1', name=f'部门{i}-1', department_type='production', company=company,
+            parent_department=parent, level=2, manager=self.user, created_by=self.user,
+        )
+
+    def create_requirement(self):
+        i = self.next_id()
+        requirement = PolishingRequirement.objects.create(
+            requirement_id=f'REQ-{i}', title='需求', description='-', part_name='零件', part_number=f'P{i}',
+            material='45钢', quantity=10, requester=self.user, reviewer=self.user,
+        )
+        RequirementComment.objects.create(requirement=requirement, author=self.user, content='评论')
+        return requirement
+
+    def create_process(self):
+        i = self.next_id()
+        process = PolishingProcess.objects.create(
+            process_id=f'PROC-{i}', process_name='工艺', process_type=PolishingProcess.PROCESS_TYPE_CHOICES[0][0],
+            applicable_materials=['45钢'], processing_time=30, created_by=self.user,
+        )
+        ProcessStep.objects.create(process=process, step_number=1, step_name='粗磨', duration=10)
+        ProcessReview.objects.create(
+            process=process, reviewer=self.user, review_status=ProcessReview.REVIEW_STATUS_CHOICES[0][0],
+            comments='-',
+        )
+        for rating in (6, 8):
+            ProcessUsageRecord.objects.create(
+                process=process, used_by=self.user, part_name='零件', part_number=f'P{i}', quantity=5,
+                quality_rating=rating,
+            )
+        return process
+
+    def create_case(self):
+        i = self.next_id()
+        return ProcessCase.objects.create(
+            name=f'案例{i}', part_material='45钢', part_size='φ10', surface_requirement='去毛刺',
+            grinding_media='陶瓷磨块', grinding_compound='光饰剂', rotation_speed=150, processing_time=30,
+            created_by=self.user,
+        )
+
+
+class QueryCountMixin:
+    """列表接口的查询数不随行数增长（QuerysetOptimizationMixin）"""
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, create):
+        """先创建 2 行测量查询数，再创建 5 行，查询数应保持不变"""
+        for _ in range(2):
+            create()
+        expected = self.count_queries(url)
+        for _ in range(5):
+            create()
+        self.assertEqual(self.count_queries(url), expected)
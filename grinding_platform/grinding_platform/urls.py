@@ -64,6 +64,12 @@ urlpatterns = [
         
         # 光整工艺管理
         path('polishing-processes/', include('polishing_processes.urls')),
+        
+        # 统计汇总
+        path('stats/', include('stats.urls')),
+        
+        # 全局检索
+        path('search/', include('search.urls')),
     ])),
 ]
 
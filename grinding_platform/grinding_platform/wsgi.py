@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'grinding_platform.settings_local')
 
 application = get_wsgi_application()
+
+# 启动时加载全局检索的内存倒排索引，避免第一个检索请求承担加载时间
+from search.memory import search_index  # noqa: E402
+
+search_index.warm()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polishing_processes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processusagerecord',
+            index=models.Index(fields=['used_at', 'id'], name='process_usa_used_at_9cff7e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processusagerecord',
+            index=models.Index(fields=['process', 'used_at', 'id'], name='process_usa_process_652bc8_idx'),
+        ),
+    ]
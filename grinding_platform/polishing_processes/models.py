@@ -187,6 +187,10 @@ class ProcessUsageRecord(models.Model):
         verbose_name = '工艺使用记录'
         verbose_name_plural = '工艺使用记录'
         ordering = ['-used_at']
+        indexes = [
+            models.Index(fields=['used_at', 'id']),
+            models.Index(fields=['process', 'used_at', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.process.process_name} - {self.part_name} - {self.used_at.strftime('%Y-%m-%d')}"
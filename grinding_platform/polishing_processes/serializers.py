@@ -1,18 +1,24 @@
+from django.db.models import Avg
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import (
     PolishingProcess, ProcessStep, ProcessReview,
     ProcessAttachment, ProcessUsageRecord
 )
 
 
-class ProcessStepSerializer(serializers.ModelSerializer):
+# 工艺详情中内联的最近使用记录数
+RECENT_USAGE_RECORDS = 10
+
+
+class ProcessStepSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProcessStep
         fields = ['id', 'step_number', 'step_name', 'description', 
                  'duration', 'parameters', 'quality_checkpoints', 'notes']
 
 
-class ProcessReviewSerializer(serializers.ModelSerializer):
+class ProcessReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     reviewer_name = serializers.CharField(source='reviewer.username', read_only=True)
     review_status_display = serializers.CharField(source='get_review_status_display', read_only=True)
     
@@ -24,7 +30,7 @@ class ProcessReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['reviewer_name', 'created_at', 'review_status_display']
 
 
-class ProcessAttachmentSerializer(serializers.ModelSerializer):
+class ProcessAttachmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.username', read_only=True)
     file_type_display = serializers.CharField(source='get_file_type_display', read_only=True)
     
@@ -35,7 +41,7 @@ class ProcessAttachmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['uploaded_by_name', 'uploaded_at', 'file_type_display']
 
 
-class ProcessUsageRecordSerializer(serializers.ModelSerializer):
+class ProcessUsageRecordSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     used_by_name = serializers.CharField(source='used_by.username', read_only=True)
     process_name = serializers.CharField(source='process.process_name', read_only=True)
     
@@ -48,22 +54,48 @@ class ProcessUsageRecordSerializer(serializers.ModelSerializer):
         read_only_fields = ['used_by_name', 'process_name', 'used_at']
 
 
-class PolishingProcessSerializer(serializers.ModelSerializer):
+class PolishingProcessListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """工艺列表使用的精简表示，不包含嵌套数据"""
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
-    reviewed_by_name = serializers.CharField(source='reviewed_by.username', read_only=True)
-    approved_by_name = serializers.CharField(source='approved_by.username', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     process_type_display = serializers.CharField(source='get_process_type_display', read_only=True)
     
-    steps = ProcessStepSerializer(many=True, read_only=True)
-    reviews = ProcessReviewSerializer(many=True, read_only=True)
-    attachments = ProcessAttachmentSerializer(many=True, read_only=True)
-    usage_records = ProcessUsageRecordSerializer(many=True, read_only=True)
-    
     # 统计字段
     total_usage_count = serializers.SerializerMethodField()
     average_quality_rating = serializers.SerializerMethodField()
     
+    class Meta:
+        model = PolishingProcess
+        fields = [
+            'id', 'process_id', 'process_name', 'process_type', 'process_type_display',
+            'applicable_materials', 'processing_time', 'expected_surface_roughness',
+            'status', 'status_display', 'version', 'is_standard', 'created_by_name',
+            'created_at', 'updated_at', 'total_usage_count', 'average_quality_rating'
+        ]
+        read_only_fields = fields
+    
+    def get_total_usage_count(self, obj):
+        # 优先使用视图集查询集上的聚合注解
+        if hasattr(obj, 'usage_count'):
+            return obj.usage_count
+        return obj.usage_records.count()
+    
+    def get_average_quality_rating(self, obj):
+        if hasattr(obj, 'avg_quality_rating'):
+            return obj.avg_quality_rating
+        return obj.usage_records.aggregate(average=Avg('quality_rating'))['average']
+
+
+class PolishingProcessSerializer(PolishingProcessListSerializer):
+    """工艺详情，使用记录只包含最近几条，完整列表通过 usage_records 子接口分页获取"""
+    reviewed_by_name = serializers.CharField(source='reviewed_by.username', read_only=True)
+    approved_by_name = serializers.CharField(source='approved_by.username', read_only=True)
+    
+    steps = ProcessStepSerializer(many=True, read_only=True)
+    reviews = ProcessReviewSerializer(many=True, read_only=True)
+    attachments = ProcessAttachmentSerializer(many=True, read_only=True)
+    recent_usage_records = serializers.SerializerMethodField()
+    
     class Meta:
         model = PolishingProcess
         fields = [
@@ -76,7 +108,7 @@ class PolishingProcessSerializer(serializers.ModelSerializer):
             'material_cost', 'labor_cost', 'equipment_cost', 'status', 'status_display',
             'version', 'is_standard', 'created_by_name', 'reviewed_by_name',
             'approved_by_name', 'created_at', 'updated_at', 'reviewed_at',
-            'approved_at', 'steps', 'reviews', 'attachments', 'usage_records',
+            'approved_at', 'steps', 'reviews', 'attachments', 'recent_usage_records',
             'total_usage_count', 'average_quality_rating'
         ]
         read_only_fields = [
@@ -86,11 +118,9 @@ class PolishingProcessSerializer(serializers.ModelSerializer):
             'average_quality_rating'
         ]
     
-    def get_total_usage_count(self, obj):
-        return obj.usage_records.count()
-    
-    def get_average_quality_rating(self, obj):
-        ratings = obj.usage_records.filter(quality_rating__isnull=False).values_list('quality_rating', flat=True)
-        if ratings:
-            return sum(ratings) / len(ratings)
-        return None 
\ No newline at end of file
+    def get_recent_usage_records(self, obj):
+        # 视图集通过 Prefetch(to_attr='recent_usage_records') 预取最近的记录
+        records = getattr(obj, 'recent_usage_records', None)
+        if records is None:
+            records = obj.usage_records.select_related('used_by', 'process').order_by('-used_at')[:RECENT_USAGE_RECORDS]
+        return ProcessUsageRecordSerializer(records, many=True, context=self.context).data
@@ -1,3 +1,94 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from .models import PolishingProcess, ProcessAttachment, ProcessStep, ProcessUsageRecord
+from .serializers import PolishingProcessListSerializer
+from .views import RECENT_USAGE_RECORDS
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """工艺、步骤、评审、附件与使用记录列表的查询数不随行数增长"""
+
+    def create_attachment(self):
+        i = self.next_id()
+        return ProcessAttachment.objects.create(
+            process=self.create_process(), file=f'process_attachments/{i}.pdf', file_name=f'{i}.pdf',
+            file_type='document', file_size=1024, uploaded_by=self.user,
+        )
+
+    def test_polishing_processes(self):
+        self.assertConstantQueries('/api/v1/polishing-processes/processes/', self.create_process)
+
+    def test_process_detail(self):
+        process = self.create_process()
+
+        def create_step():
+            ProcessStep.objects.create(process=process, step_number=self.next_id(), step_name='精磨', description='-')
+
+        self.assertConstantQueries(f'/api/v1/polishing-processes/processes/{process.pk}/', create_step)
+
+    def test_process_steps(self):
+        self.assertConstantQueries('/api/v1/polishing-processes/steps/', self.create_process)
+
+    def test_process_attachments(self):
+        self.assertConstantQueries('/api/v1/polishing-processes/attachments/', self.create_attachment)
+
+    def test_process_reviews(self):
+        self.assertConstantQueries('/api/v1/polishing-processes/reviews/', self.create_process)
+
+    def test_usage_records(self):
+        self.assertConstantQueries('/api/v1/polishing-processes/usage-records/', self.create_process)
+
+
+class UsageAnnotationTests(FixtureMixin, APITestCase):
+    """列表中的使用次数与平均评分来自聚合注解，与逐行查询的结果一致"""
+
+    def test_annotated_usage(self):
+        used = self.create_process()
+        unused = self.create_process()
+        unused.usage_records.all().delete()
+
+        response = self.client.get('/api/v1/polishing-processes/processes/')
+        rows = {row['id']: row for row in response.data['results']}
+        self.assertEqual((rows[used.pk]['total_usage_count'], rows[used.pk]['average_quality_rating']), (2, 7))
+        self.assertEqual((rows[unused.pk]['total_usage_count'], rows[unused.pk]['average_quality_rating']), (0, None))
+
+        # 未注解的实例退回逐行查询，结果相同
+        for process in (used, unused):
+            data = PolishingProcessListSerializer(PolishingProcess.objects.get(pk=process.pk)).data
+            for field in ('total_usage_count', 'average_quality_rating'):
+                self.assertEqual(data[field], rows[process.pk][field])
+
+
+class ListDetailRepresentationTests(FixtureMixin, APITestCase):
+    """列表使用精简表示，详情包含嵌套数据与最近的使用记录"""
+
+    url = '/api/v1/polishing-processes/processes/'
+
+    def setUp(self):
+        super().setUp()
+        self.process = self.create_process()
+        for _ in range(RECENT_USAGE_RECORDS):
+            ProcessUsageRecord.objects.create(
+                process=self.process, used_by=self.user, part_name='零件', part_number='P', quantity=1,
+            )
+
+    def test_list_is_compact(self):
+        for url in (self.url, f'{self.url}my_processes/'):
+            row = self.client.get(url).data['results'][0]
+            self.assertEqual(list(row), PolishingProcessListSerializer.Meta.fields)
+
+    def test_detail_has_nested_data(self):
+        data = self.client.get(f'{self.url}{self.process.pk}/').data
+        self.assertEqual(len(data['steps']), 1)
+        self.assertEqual(len(data['reviews']), 1)
+        self.assertEqual(data['total_usage_count'], RECENT_USAGE_RECORDS + 2)
+
+        expected = list(self.process.usage_records.order_by('-used_at', '-id').values_list('id', flat=True))
+        recent = [record['id'] for record in data['recent_usage_records']]
+        self.assertEqual(recent, expected[:RECENT_USAGE_RECORDS])
+
+        page = self.client.get(f'{self.url}{self.process.pk}/usage_records/', {'page_size': 3}).data
+        self.assertEqual([record['id'] for record in page['results']], expected[:3])
+        self.assertIsNotNone(page['next'])
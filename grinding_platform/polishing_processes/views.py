@@ -4,29 +4,66 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Avg
+from django.db.models import Count, Avg, Prefetch
 from django.utils import timezone
+from grinding_platform.statistics import group_counts
+from search.filters import FullTextSearchFilter
+from stats.counters import counter_statistics
+from grinding_platform.pagination import KeysetPagination
+from grinding_platform.querysets import QuerysetOptimizationMixin
 from .models import (
     PolishingProcess, ProcessStep, ProcessReview,
     ProcessAttachment, ProcessUsageRecord
 )
 from .serializers import (
-    PolishingProcessSerializer, ProcessStepSerializer, ProcessReviewSerializer,
-    ProcessAttachmentSerializer, ProcessUsageRecordSerializer
+    PolishingProcessListSerializer, PolishingProcessSerializer, ProcessStepSerializer,
+    ProcessReviewSerializer, ProcessAttachmentSerializer, ProcessUsageRecordSerializer,
+    RECENT_USAGE_RECORDS
 )
 import uuid
 
 
-class PolishingProcessViewSet(viewsets.ModelViewSet):
+# 使用精简列表表示的动作
+LIST_ACTIONS = ('list', 'my_processes', 'standard_processes')
+# 返回完整详情（含嵌套数据）的动作
+DETAIL_ACTIONS = ('retrieve', 'update', 'partial_update')
+
+
+class PolishingProcessViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = PolishingProcess.objects.all()
     serializer_class = PolishingProcessSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'process_type', 'is_standard', 'created_by']
     search_fields = ['process_name', 'description', 'abrasive_type']
     ordering_fields = ['created_at', 'updated_at', 'process_name']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        # 不返回工艺数据的动作（如提交审核）无需连表与预取
+        if self.action not in LIST_ACTIONS + DETAIL_ACTIONS:
+            return PolishingProcess.objects.all()
+        # 外键与嵌套数据由 QuerysetOptimizationMixin 按序列化器预取，使用统计以聚合注解计算
+        queryset = super().get_queryset().annotate(
+            usage_count=Count('usage_records'),
+            avg_quality_rating=Avg('usage_records__quality_rating'),
+        )
+        if self.action in LIST_ACTIONS:
+            return queryset
+        return queryset.prefetch_related(
+            Prefetch(
+                'usage_records',
+                queryset=ProcessUsageRecord.objects.select_related('used_by', 'process')
+                .order_by('-used_at')[:RECENT_USAGE_RECORDS],
+                to_attr='recent_usage_records',
+            ),
+        )
+
+    def get_serializer_class(self):
+        if self.action in LIST_ACTIONS:
+            return PolishingProcessListSerializer
+        return PolishingProcessSerializer
+
     def perform_create(self, serializer):
         # 自动生成工艺编号
         process_id = f"PROC-{timezone.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8].upper()}"
@@ -38,7 +75,7 @@ class PolishingProcessViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_processes(self, request):
         """获取当前用户创建的工艺"""
-        queryset = self.queryset.filter(created_by=request.user)
+        queryset = self.get_queryset().filter(created_by=request.user)
         queryset = self.filter_queryset(queryset)
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -50,10 +87,21 @@ class PolishingProcessViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def standard_processes(self, request):
         """获取标准工艺"""
-        queryset = self.queryset.filter(is_standard=True, status='published')
+        queryset = self.get_queryset().filter(is_standard=True, status='published')
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def usage_records(self, request, pk=None):
+        """分页获取工艺的使用记录"""
+        process = self.get_object()
+        queryset = process.usage_records.select_related('used_by', 'process')
+        paginator = KeysetPagination()
+        paginator.ordering = ('-used_at', '-id')
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = ProcessUsageRecordSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def submit_for_review(self, request, pk=None):
         """提交审核"""
@@ -68,24 +116,29 @@ class PolishingProcessViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """统计信息"""
-        total = self.queryset.count()
-        by_status = self.queryset.values('status').annotate(count=Count('status'))
-        by_type = self.queryset.values('process_type').annotate(count=Count('process_type'))
+        stats = counter_statistics(
+            PolishingProcess,
+            breakdowns={
+                'by_status': ('status', PolishingProcess.PROCESS_STATUS_CHOICES),
+                'by_type': ('process_type', PolishingProcess.PROCESS_TYPE_CHOICES),
+            },
+            labels=False,
+        )
         
         return Response({
-            'total': total,
-            'by_status': list(by_status),
-            'by_type': list(by_type),
+            'total': stats['total'],
+            'by_status': group_counts(stats['by_status'], 'status'),
+            'by_type': group_counts(stats['by_type'], 'process_type'),
         })
 
 
-class ProcessStepViewSet(viewsets.ModelViewSet):
+class ProcessStepViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = ProcessStep.objects.all()
     serializer_class = ProcessStepSerializer
     permission_classes = [IsAuthenticated]
 
 
-class ProcessReviewViewSet(viewsets.ModelViewSet):
+class ProcessReviewViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = ProcessReview.objects.all()
     serializer_class = ProcessReviewSerializer
     permission_classes = [IsAuthenticated]
@@ -94,7 +147,7 @@ class ProcessReviewViewSet(viewsets.ModelViewSet):
         serializer.save(reviewer=self.request.user)
 
 
-class ProcessAttachmentViewSet(viewsets.ModelViewSet):
+class ProcessAttachmentViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = ProcessAttachment.objects.all()
     serializer_class = ProcessAttachmentSerializer
     permission_classes = [IsAuthenticated]
@@ -103,10 +156,12 @@ class ProcessAttachmentViewSet(viewsets.ModelViewSet):
         serializer.save(uploaded_by=self.request.user)
 
 
-class ProcessUsageRecordViewSet(viewsets.ModelViewSet):
+class ProcessUsageRecordViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = ProcessUsageRecord.objects.all()
     serializer_class = ProcessUsageRecordSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-used_at', '-id')
 
     def perform_create(self, serializer):
         serializer.save(used_by=self.request.user)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polishing_requirements', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='requirementcomment',
+            index=models.Index(fields=['created_at', 'id'], name='requirement_created_a2eb0a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requirementcomment',
+            index=models.Index(fields=['requirement', 'created_at', 'id'], name='requirement_require_68b6d1_idx'),
+        ),
+    ]
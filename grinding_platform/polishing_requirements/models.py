@@ -80,6 +80,10 @@ class RequirementComment(models.Model):
         verbose_name = '需求评论'
         verbose_name_plural = '需求评论'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['requirement', 'created_at', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.requirement.requirement_id} - {self.author.username}"
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import PolishingRequirement, RequirementComment, RequirementAttachment, RequirementTemplate
 
 
-class RequirementCommentSerializer(serializers.ModelSerializer):
+class RequirementCommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.username', read_only=True)
     
     class Meta:
@@ -11,7 +12,7 @@ class RequirementCommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'author_name']
 
 
-class RequirementAttachmentSerializer(serializers.ModelSerializer):
+class RequirementAttachmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.username', read_only=True)
     
     class Meta:
@@ -21,7 +22,7 @@ class RequirementAttachmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['uploaded_by_name', 'uploaded_at']
 
 
-class PolishingRequirementSerializer(serializers.ModelSerializer):
+class PolishingRequirementSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     requester_name = serializers.CharField(source='requester.username', read_only=True)
     reviewer_name = serializers.CharField(source='reviewer.username', read_only=True)
     comments = RequirementCommentSerializer(many=True, read_only=True)
@@ -47,7 +48,7 @@ class PolishingRequirementSerializer(serializers.ModelSerializer):
                            'status_display', 'urgency_level_display']
 
 
-class RequirementTemplateSerializer(serializers.ModelSerializer):
+class RequirementTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     
     class Meta:
@@ -1,3 +1,141 @@
-from django.test import TestCase
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from grinding_platform.pagination import KeysetPagination
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from stats.counters import counter_statistics
+
+from .models import PolishingRequirement, RequirementAttachment, RequirementComment, RequirementTemplate
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """需求、评论、附件与模板列表的查询数不随行数增长"""
+
+    def create_attachment(self):
+        i = self.next_id()
+        return RequirementAttachment.objects.create(
+            requirement=self.create_requirement(), file=f'requirement_attachments/{i}.pdf', file_name=f'{i}.pdf',
+            file_size=1024, file_type='pdf', uploaded_by=self.user,
+        )
+
+    def create_template(self):
+        i = self.next_id()
+        return RequirementTemplate.objects.create(
+            template_name=f'模板{i}', template_data={'material': '45钢'}, category='去毛刺', created_by=self.user,
+        )
+
+    def test_polishing_requirements(self):
+        self.assertConstantQueries('/api/v1/polishing-requirements/requirements/', self.create_requirement)
+
+    def test_requirement_detail(self):
+        requirement = self.create_requirement()
+
+        def create_comment():
+            RequirementComment.objects.create(requirement=requirement, author=self.user, content='评论')
+
+        self.assertConstantQueries(f'/api/v1/polishing-requirements/requirements/{requirement.pk}/', create_comment)
+
+    def test_requirement_comments(self):
+        self.assertConstantQueries('/api/v1/polishing-requirements/comments/', self.create_requirement)
+
+    def test_requirement_attachments(self):
+        self.assertConstantQueries('/api/v1/polishing-requirements/attachments/', self.create_attachment)
+
+    def test_requirement_templates(self):
+        self.assertConstantQueries('/api/v1/polishing-requirements/templates/', self.create_template)
+
+
+class StatisticsTests(FixtureMixin, APITestCase):
+    """统计数据：由计数器得到各项计数，接口只返回非零分组"""
+
+    def setUp(self):
+        super().setUp()
+        for status, urgency in (('draft', 'low'), ('draft', 'urgent'), ('approved', 'urgent'), ('completed', 'medium')):
+            requirement = self.create_requirement()
+            requirement.status = status
+            requirement.urgency_level = urgency
+            requirement.save()
+
+    def test_counter_statistics(self):
+        stats = counter_statistics(
+            PolishingRequirement,
+            conditions={'urgent': ('urgency_level', 'urgent')},
+            breakdowns={'by_status': ('status', PolishingRequirement.REQUIREMENT_STATUS_CHOICES)},
+        )
+        self.assertEqual((stats['total'], stats['urgent']), (4, 2))
+        self.assertEqual(stats['by_status']['草稿'], 2)
+        self.assertEqual(stats['by_status']['已拒绝'], 0)
+        self.assertEqual(len(stats['by_status']), len(PolishingRequirement.REQUIREMENT_STATUS_CHOICES))
+
+        stats = counter_statistics(
+            PolishingRequirement,
+            breakdowns={'by_urgency': ('urgency_level', PolishingRequirement.URGENCY_LEVEL_CHOICES)},
+            labels=False,
+        )
+        self.assertEqual(stats['by_urgency'], {'low': 1, 'medium': 1, 'high': 0, 'urgent': 2})
+
+    def test_endpoint(self):
+        response = self.client.get('/api/v1/polishing-requirements/requirements/statistics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(response.data['by_status'], [
+            {'status': 'draft', 'count': 2}, {'status': 'approved', 'count': 1}, {'status': 'completed', 'count': 1},
+        ])
+        self.assertEqual(response.data['by_urgency'], [
+            {'urgency_level': 'low', 'count': 1}, {'urgency_level': 'medium', 'count': 1},
+            {'urgency_level': 'urgent', 'count': 2},
+        ])
+
+
+class KeysetPaginationTests(FixtureMixin, APITestCase):
+    """追加型表的游标分页：逐页前后翻动结果完整且不统计总数"""
+
+    def test_pages_forward_and_backward(self):
+        requirement = self.create_requirement()
+        for _ in range(6):
+            RequirementComment.objects.create(requirement=requirement, author=self.user, content='评论')
+        expected = list(RequirementComment.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        pages = []
+        url = '/api/v1/polishing-requirements/comments/?page_size=3'
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('COUNT', ' '.join(query['sql'] for query in context.captured_queries))
+            pages.append(response.data)
+            url = response.data['next']
+        self.assertEqual([row['id'] for page in pages for row in page['results']], expected)
+        self.assertIsNone(pages[0]['previous'])
+
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual([row['id'] for row in response.data['results']], expected[3:6])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/polishing-requirements/comments/?cursor=invalid')
+        self.assertEqual(response.status_code, 404)
+
+    def test_ordering_rejected(self):
+        response = self.client.get('/api/v1/polishing-requirements/comments/?ordering=content')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.data)
+
+    def test_search_truncation_reported(self):
+        self.create_requirement()
+        view = SimpleNamespace(keyset_ordering=None)
+        paginator = KeysetPagination()
+
+        request = Request(APIRequestFactory().get('/api/v1/polishing-requirements/comments/'))
+        rows = paginator.paginate_queryset(RequirementComment.objects.all(), request, view)
+        self.assertNotIn('search_truncated', paginator.get_paginated_response([row.pk for row in rows]).data)
+
+        request.search_truncated = True
+        rows = paginator.paginate_queryset(RequirementComment.objects.all(), request, view)
+        response = paginator.get_paginated_response([row.pk for row in rows])
+        self.assertTrue(response.data['search_truncated'])
+        self.assertEqual(response.data['results'], list(RequirementComment.objects.values_list('pk', flat=True)))
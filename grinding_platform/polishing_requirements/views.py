@@ -4,8 +4,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.utils import timezone
+from grinding_platform.statistics import group_counts
+from search.filters import FullTextSearchFilter
+from stats.counters import counter_statistics
+from grinding_platform.pagination import KeysetPagination
+from grinding_platform.querysets import QuerysetOptimizationMixin
 from .models import PolishingRequirement, RequirementComment, RequirementAttachment, RequirementTemplate
 from .serializers import (
     PolishingRequirementSerializer, RequirementCommentSerializer,
@@ -14,11 +19,11 @@ from .serializers import (
 import uuid
 
 
-class PolishingRequirementViewSet(viewsets.ModelViewSet):
+class PolishingRequirementViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = PolishingRequirement.objects.all()
     serializer_class = PolishingRequirementSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'urgency_level', 'requester', 'reviewer']
     search_fields = ['title', 'description', 'part_name', 'part_number', 'material']
     ordering_fields = ['created_at', 'updated_at', 'required_completion_date']
@@ -35,7 +40,7 @@ class PolishingRequirementViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_requirements(self, request):
         """获取当前用户的需求"""
-        queryset = self.queryset.filter(requester=request.user)
+        queryset = self.get_queryset().filter(requester=request.user)
         queryset = self.filter_queryset(queryset)
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -47,7 +52,7 @@ class PolishingRequirementViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def pending_review(self, request):
         """获取待审核的需求"""
-        queryset = self.queryset.filter(status='submitted')
+        queryset = self.get_queryset().filter(status='submitted')
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -94,27 +99,33 @@ class PolishingRequirementViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """统计信息"""
-        total = self.queryset.count()
-        by_status = self.queryset.values('status').annotate(count=Count('status'))
-        by_urgency = self.queryset.values('urgency_level').annotate(count=Count('urgency_level'))
+        stats = counter_statistics(
+            PolishingRequirement,
+            breakdowns={
+                'by_status': ('status', PolishingRequirement.REQUIREMENT_STATUS_CHOICES),
+                'by_urgency': ('urgency_level', PolishingRequirement.URGENCY_LEVEL_CHOICES),
+            },
+            labels=False,
+        )
         
         return Response({
-            'total': total,
-            'by_status': list(by_status),
-            'by_urgency': list(by_urgency),
+            'total': stats['total'],
+            'by_status': group_counts(stats['by_status'], 'status'),
+            'by_urgency': group_counts(stats['by_urgency'], 'urgency_level'),
         })
 
 
-class RequirementCommentViewSet(viewsets.ModelViewSet):
+class RequirementCommentViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = RequirementComment.objects.all()
     serializer_class = RequirementCommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
 
-class RequirementAttachmentViewSet(viewsets.ModelViewSet):
+class RequirementAttachmentViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = RequirementAttachment.objects.all()
     serializer_class = RequirementAttachmentSerializer
     permission_classes = [IsAuthenticated]
@@ -123,7 +134,7 @@ class RequirementAttachmentViewSet(viewsets.ModelViewSet):
         serializer.save(uploaded_by=self.request.user)
 
 
-class RequirementTemplateViewSet(viewsets.ModelViewSet):
+class RequirementTemplateViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     queryset = RequirementTemplate.objects.all()
     serializer_class = RequirementTemplateSerializer
     permission_classes = [IsAuthenticated]
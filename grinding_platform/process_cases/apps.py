@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProcessCasesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'process_cases'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,146 @@
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from process_cases.reasoning import CaseFeatureMatrix, CaseMatcher
+from process_cases.reasoning.ann import IVFIndex
+from process_cases.reasoning.search import partition_rows
+from process_cases.reasoning.statistics import feature_scales
+from process_cases.reasoning.store import feature_store
+
+
+BENCH_MODES = ('exact', 'partitioned', 'ann')
+
+# 测量内存峰值使用的查询数
+MEMORY_SAMPLE_QUERIES = 20
+
+
+def percentile_summary(latencies):
+    latencies = np.asarray(latencies) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'mean_ms': round(float(latencies.mean()), 3),
+    }
+
+
+class Command(BaseCommand):
+    help = '案例匹配性能测试：对比 exact/partitioned/ann 模式的延迟分位数、吞吐量、内存与召回率'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                            help='测试的案例规模，取案例库的前 N 个案例；超过案例库规模的取值会被跳过')
+        parser.add_argument('--modes', nargs='+', choices=BENCH_MODES, default=list(BENCH_MODES))
+        parser.add_argument('--queries', type=int, default=200, help='每个规模的查询数')
+        parser.add_argument('--k', type=int, default=10)
+        parser.add_argument('--nprobe', type=int, default=8, help='ann 模式探测的簇数量')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default=None, help='JSON 结果输出路径')
+
+    def handle(self, *args, **options):
+        matrix = feature_store.get_matrix()
+        if not len(matrix):
+            raise CommandError('案例库为空，请先运行 generate_cases 生成测试数据')
+
+        report = {
+            'timestamp': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+            },
+            'total_cases': len(matrix),
+            'queries': options['queries'],
+            'k': options['k'],
+            'nprobe': options['nprobe'],
+            'results': [],
+        }
+        scales = feature_scales()
+
+        for size in options['sizes']:
+            if size > len(matrix):
+                self.stdout.write(self.style.WARNING(f'跳过 {size}：案例库只有 {len(matrix)} 个案例'))
+                continue
+            subset = CaseFeatureMatrix(
+                ids=matrix.ids[:size],
+                numeric=matrix.numeric[:size],
+                categorical=matrix.categorical[:size],
+                vocabularies=matrix.vocabularies,
+            )
+            report['results'].extend(self.bench_size(subset, scales, options))
+
+        for item in report['results']:
+            self.stdout.write(
+                f'{item["cases"]:>8} {item["mode"]:<12} p50={item["p50_ms"]:.2f}ms p95={item["p95_ms"]:.2f}ms '
+                f'p99={item["p99_ms"]:.2f}ms qps={item["throughput_qps"]:.1f} '
+                f'peak={item["peak_memory_mb"]:.1f}MB recall={item["recall"]:.4f}'
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'结果已写入 {options["output"]}'))
+
+    def bench_size(self, matrix, scales, options):
+        matcher = CaseMatcher(matrix, scales=scales)
+        queries = matrix.sample_queries(options['queries'], seed=options['seed'])
+        k = options['k']
+        base = {
+            'cases': len(matrix),
+            'matrix_mb': round((matrix.ids.nbytes + matrix.numeric.nbytes + matrix.categorical.nbytes) / 2 ** 20, 2),
+        }
+
+        # 预先构建分区倒排表与索引，构建耗时单独记录，不计入查询延迟
+        started = time.perf_counter()
+        matrix.postings
+        base['postings_build_s'] = round(time.perf_counter() - started, 3)
+
+        index = None
+        if 'ann' in options['modes']:
+            started = time.perf_counter()
+            index = IVFIndex.build(matrix, seed=options['seed'])
+            base['index_build_s'] = round(time.perf_counter() - started, 3)
+
+        def candidates(mode, features):
+            if mode == 'partitioned':
+                return partition_rows(matrix, features, min_candidates=k)
+            if mode == 'ann':
+                return index.candidate_rows(matrix, features, nprobe=options['nprobe'])
+            return None
+
+        expected = [
+            {r['case_id'] for r in matcher.top_k(features, k=k, exclude_ids=[case_id])}
+            for case_id, features in queries
+        ]
+
+        results = []
+        for mode in options['modes']:
+            latencies, hits = [], 0
+            for (case_id, features), truth in zip(queries, expected):
+                started = time.perf_counter()
+                found = matcher.top_k(features, k=k, exclude_ids=[case_id], rows=candidates(mode, features))
+                latencies.append(time.perf_counter() - started)
+                hits += len(truth & {r['case_id'] for r in found})
+
+            # tracemalloc 会拖慢执行，内存峰值单独用少量查询测量
+            tracemalloc.start()
+            for case_id, features in queries[:MEMORY_SAMPLE_QUERIES]:
+                matcher.top_k(features, k=k, exclude_ids=[case_id], rows=candidates(mode, features))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results.append({
+                **base,
+                'mode': mode,
+                **percentile_summary(latencies),
+                'throughput_qps': round(len(latencies) / sum(latencies), 2),
+                'peak_memory_mb': round(peak / 2 ** 20, 2),
+                'recall': round(hits / max(sum(len(truth) for truth in expected), 1), 4),
+            })
+        return results
@@ -0,0 +1,71 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from process_cases.reasoning import CaseMatcher
+from process_cases.reasoning.ann import IVFIndex
+from process_cases.reasoning.statistics import feature_scales
+from process_cases.reasoning.store import feature_store
+
+
+class Command(BaseCommand):
+    help = '构建工艺实例近似最近邻（IVF）索引，可选评估 recall@k'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.CASE_INDEX_PATH, help='索引文件路径')
+        parser.add_argument('--lists', type=int, default=None, help='簇数量，默认取 sqrt(案例数)')
+        parser.add_argument('--iterations', type=int, default=15, help='k-means 迭代次数')
+        parser.add_argument('--sample-size', type=int, default=50000, help='k-means 训练样本数')
+        parser.add_argument('--evaluate', type=int, default=0, help='评估使用的查询数，0 表示不评估')
+        parser.add_argument('--k', type=int, default=10, help='评估 recall@k 的 k')
+        parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32], help='评估的 nprobe 取值')
+
+    def handle(self, *args, **options):
+        matrix = feature_store.get_matrix()
+        if not len(matrix):
+            raise CommandError('案例库为空，无法构建索引')
+
+        started = time.perf_counter()
+        index = IVFIndex.build(
+            matrix,
+            n_lists=options['lists'],
+            iterations=options['iterations'],
+            sample_size=options['sample_size'],
+        )
+        index.save(options['output'])
+        self.stdout.write(self.style.SUCCESS(
+            f'索引已写入 {options["output"]}：{len(matrix)} 个案例，{index.n_lists} 个簇，'
+            f'耗时 {time.perf_counter() - started:.2f}s'
+        ))
+
+        if options['evaluate']:
+            self.evaluate(matrix, index, options['evaluate'], options['k'], options['nprobe'])
+
+    def evaluate(self, matrix, index, count, k, nprobes):
+        """对比精确匹配与索引匹配的 recall@k 与平均耗时"""
+        matcher = CaseMatcher(matrix, scales=feature_scales())
+        queries = matrix.sample_queries(count)
+
+        exact_results, exact_time = [], 0.0
+        for case_id, features in queries:
+            started = time.perf_counter()
+            results = matcher.top_k(features, k=k, exclude_ids=[case_id])
+            exact_time += time.perf_counter() - started
+            exact_results.append({r['case_id'] for r in results})
+        self.stdout.write(f'exact    recall@{k}=1.0000  平均耗时 {exact_time / len(queries) * 1000:.2f}ms')
+
+        for nprobe in nprobes:
+            hits, total, elapsed, scored = 0, 0, 0.0, 0
+            for (case_id, features), expected in zip(queries, exact_results):
+                started = time.perf_counter()
+                rows = index.candidate_rows(matrix, features, nprobe=nprobe)
+                results = matcher.top_k(features, k=k, exclude_ids=[case_id], rows=rows)
+                elapsed += time.perf_counter() - started
+                scored += len(rows)
+                hits += len(expected & {r['case_id'] for r in results})
+                total += len(expected)
+            self.stdout.write(
+                f'nprobe={nprobe:<3} recall@{k}={hits / max(total, 1):.4f}  '
+                f'平均耗时 {elapsed / len(queries) * 1000:.2f}ms  平均候选 {scored / len(queries):.0f}'
+            )
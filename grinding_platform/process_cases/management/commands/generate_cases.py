@@ -0,0 +1,180 @@
+import uuid
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from polishing_processes.models import PolishingProcess, ProcessUsageRecord
+from process_cases.models import ProcessCase
+from process_cases.reasoning.statistics import rebuild_statistics
+from process_cases.reasoning.store import feature_store
+from search.autocomplete import rebuild_values
+from search.index import rebuild_index
+from stats.counters import rebuild_counters
+
+
+MATERIALS = ['45钢', '40Cr', 'GCr15轴承钢', '304不锈钢', '316L不锈钢', '铝合金6061', '铝合金7075', '钛合金TC4', '黄铜H62', '锌合金']
+
+# 研磨介质及其典型转速 (均值, 标准差)
+MEDIA = {
+    '棕刚玉磨块': (180, 30),
+    '白刚玉磨块': (170, 30),
+    '陶瓷磨块': (150, 25),
+    '树脂磨块': (120, 20),
+    '不锈钢球': (220, 35),
+    '核桃壳': (90, 15),
+}
+
+COMPOUNDS = ['通用光饰剂', '防锈光亮剂', '除油研磨剂', '酸性去氧化剂', '镜面抛光液']
+
+PART_SIZES = ['φ10×20mm', 'φ25×40mm', '50×30×10mm', '80×60×20mm', 'φ60×120mm', '120×80×40mm']
+
+SURFACE_REQUIREMENTS = ['去毛刺', '倒圆角', '去氧化皮', '表面光亮', '镜面抛光']
+
+PROCESS_TYPES = [value for value, _ in PolishingProcess.PROCESS_TYPE_CHOICES]
+
+
+class Command(BaseCommand):
+    help = '批量生成模拟的工艺实例、光整工艺及使用记录，用于案例匹配性能测试'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, required=True, help='生成的工艺实例数')
+        parser.add_argument('--processes', type=int, default=None, help='生成的光整工艺数，默认为 count/100')
+        parser.add_argument('--usage-per-process', type=int, default=5, help='每个光整工艺的平均使用记录数')
+        parser.add_argument('--batch-size', type=int, default=5000, help='bulk_create 每批行数')
+        parser.add_argument('--seed', type=int, default=None, help='随机种子')
+        parser.add_argument('--username', default=None, help='数据的创建人，默认取第一个超级用户')
+
+    def handle(self, *args, **options):
+        if options['count'] <= 0:
+            raise CommandError('--count 必须大于 0')
+        rng = np.random.default_rng(options['seed'])
+        user = self.get_user(options['username'])
+        batch_size = options['batch_size']
+        # 编号前缀，避免多次生成时工艺编号冲突
+        tag = uuid.uuid4().hex[:6].upper()
+
+        created = 0
+        for start in range(0, options['count'], batch_size):
+            size = min(batch_size, options['count'] - start)
+            ProcessCase.objects.bulk_create(self.build_cases(rng, start, size, user, tag))
+            created += size
+            self.stdout.write(f'工艺实例 {created}/{options["count"]}')
+
+        process_count = options['processes']
+        if process_count is None:
+            process_count = max(1, options['count'] // 100)
+        process_ids = []
+        for start in range(0, process_count, batch_size):
+            size = min(batch_size, process_count - start)
+            processes = PolishingProcess.objects.bulk_create(self.build_processes(rng, start, size, user, tag))
+            process_ids.extend(process.pk for process in processes)
+        if process_ids and None in process_ids:
+            # 数据库不支持 bulk_create 返回主键时按编号回查
+            process_ids = list(
+                PolishingProcess.objects.filter(process_id__startswith=f'GEN-{tag}-').values_list('pk', flat=True)
+            )
+        self.stdout.write(f'光整工艺 {len(process_ids)}')
+
+        usage_count = len(process_ids) * options['usage_per_process']
+        for start in range(0, usage_count, batch_size):
+            size = min(batch_size, usage_count - start)
+            ProcessUsageRecord.objects.bulk_create(self.build_usage_records(rng, process_ids, size, user))
+        self.stdout.write(f'使用记录 {usage_count}')
+
+        # bulk_create 不触发信号，需要重建特征存储、特征统计、统计计数器、取值提示与检索索引
+        feature_store.invalidate()
+        for model in (ProcessCase, PolishingProcess):
+            rebuild_statistics(model)
+            rebuild_counters(model)
+            rebuild_values(model)
+            rebuild_index([model._meta.label_lower])
+        self.stdout.write(self.style.SUCCESS('数据生成完成，特征存储、统计数据与检索索引已刷新'))
+
+    def get_user(self, username):
+        User = get_user_model()
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'用户 {username} 不存在')
+        user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('没有可用的超级用户，请通过 --username 指定创建人')
+        return user
+
+    def build_cases(self, rng, start, size, user, tag):
+        media_names = list(MEDIA)
+        media = rng.integers(len(media_names), size=size)
+        speed_mean = np.array([MEDIA[name][0] for name in media_names])[media]
+        speed_std = np.array([MEDIA[name][1] for name in media_names])[media]
+        rotation_speed = np.clip(rng.normal(speed_mean, speed_std), 30, 400)
+        processing_time = np.clip(rng.lognormal(3.2, 0.5, size), 5, 240)
+        roughness_before = rng.uniform(0.8, 6.3, size)
+        # 加工时间越长、转速越高，粗糙度改善越明显
+        improvement = 1 - np.exp(-processing_time * rotation_speed / 6000)
+        roughness_after = np.maximum(roughness_before * (1 - 0.85 * improvement) * rng.uniform(0.9, 1.1, size), 0.05)
+        removal_amount = (roughness_before - roughness_after) * rng.uniform(2, 5, size)
+        has_vibration = rng.random(size) < 0.6
+        vibration = rng.uniform(20, 60, size)
+        grade = np.where(roughness_after < 0.4, 'A', np.where(roughness_after < 1.6, 'B', 'C'))
+
+        return [
+            ProcessCase(
+                name=f'模拟案例-{tag}-{start + i + 1}',
+                part_material=MATERIALS[rng.integers(len(MATERIALS))],
+                part_size=PART_SIZES[rng.integers(len(PART_SIZES))],
+                surface_requirement=SURFACE_REQUIREMENTS[rng.integers(len(SURFACE_REQUIREMENTS))],
+                grinding_media=media_names[media[i]],
+                grinding_compound=COMPOUNDS[rng.integers(len(COMPOUNDS))],
+                rotation_speed=round(float(rotation_speed[i]), 1),
+                processing_time=round(float(processing_time[i]), 1),
+                vibration_frequency=round(float(vibration[i]), 1) if has_vibration[i] else None,
+                surface_roughness_before=round(float(roughness_before[i]), 3),
+                surface_roughness_after=round(float(roughness_after[i]), 3),
+                removal_amount=round(float(removal_amount[i]), 2),
+                quality_grade=str(grade[i]),
+                status='active',
+                created_by=user,
+            )
+            for i in range(size)
+        ]
+
+    def build_processes(self, rng, start, size, user, tag):
+        media_names = list(MEDIA)
+        processes = []
+        for i in range(size):
+            media = media_names[rng.integers(len(media_names))]
+            materials = rng.choice(MATERIALS, size=rng.integers(1, 4), replace=False).tolist()
+            processes.append(PolishingProcess(
+                process_id=f'GEN-{tag}-{start + i + 1:07d}',
+                process_name=f'{materials[0]}{media}光整工艺',
+                process_type=PROCESS_TYPES[rng.integers(len(PROCESS_TYPES))],
+                applicable_materials=materials,
+                processing_time=round(float(np.clip(rng.lognormal(3.2, 0.5), 5, 240)), 1),
+                rotation_speed=round(float(np.clip(rng.normal(*MEDIA[media]), 30, 400)), 1),
+                vibration_frequency=round(float(rng.uniform(20, 60)), 1),
+                temperature=round(float(rng.uniform(15, 45)), 1),
+                abrasive_type=media,
+                abrasive_quantity=round(float(rng.uniform(5, 80)), 1),
+                expected_surface_roughness=round(float(rng.uniform(0.1, 1.6)), 2),
+                status='published',
+                created_by=user,
+            ))
+        return processes
+
+    def build_usage_records(self, rng, process_ids, size, user):
+        processes = rng.choice(process_ids, size=size)
+        return [
+            ProcessUsageRecord(
+                process_id=int(process_id),
+                used_by=user,
+                part_name='模拟零件',
+                part_number=f'P-{rng.integers(1, 100000):05d}',
+                quantity=int(rng.integers(10, 500)),
+                actual_processing_time=round(float(np.clip(rng.lognormal(3.2, 0.5), 5, 240)), 1),
+                actual_surface_roughness=round(float(rng.uniform(0.1, 1.6)), 2),
+                quality_rating=int(rng.integers(5, 11)),
+            )
+            for process_id in processes
+        ]
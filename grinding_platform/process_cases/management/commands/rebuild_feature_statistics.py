@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from process_cases.reasoning.statistics import rebuild_statistics, tracked_models
+
+
+class Command(BaseCommand):
+    help = '全量重新计算数值特征统计（批量导入数据后使用）'
+
+    def handle(self, *args, **options):
+        for model in tracked_models():
+            rebuild_statistics(model)
+            self.stdout.write(self.style.SUCCESS(f'{model._meta.verbose_name} 特征统计已重建'))
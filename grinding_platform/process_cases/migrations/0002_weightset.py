@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('process_cases', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeightSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='权重集名称')),
+                ('description', models.TextField(blank=True, verbose_name='描述')),
+                ('criteria_matrix', models.JSONField(blank=True, default=list, verbose_name='准则层判断矩阵')),
+                ('groups', models.JSONField(verbose_name='特征分组及判断矩阵')),
+                ('result', models.JSONField(default=dict, verbose_name='计算结果')),
+                ('feature_weights', models.JSONField(default=dict, verbose_name='特征综合权重')),
+                ('consistency_ratio', models.FloatField(verbose_name='一致性比率(CR)')),
+                ('is_consistent', models.BooleanField(verbose_name='一致性检验通过')),
+                ('content_hash', models.CharField(max_length=64, unique=True, verbose_name='内容哈希')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='创建人')),
+            ],
+            options={
+                'verbose_name': '特征权重集',
+                'verbose_name_plural': '特征权重集',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
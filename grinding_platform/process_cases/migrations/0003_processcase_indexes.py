@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('process_cases', '0002_weightset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processcase',
+            index=models.Index(fields=['part_material', 'grinding_media'], name='process_cas_part_ma_f19064_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processcase',
+            index=models.Index(fields=['rotation_speed'], name='process_cas_rotatio_a7de19_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processcase',
+            index=models.Index(fields=['processing_time'], name='process_cas_process_ba8a4b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processcase',
+            index=models.Index(fields=['surface_roughness_before'], name='process_cas_surface_8dcc8f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processcase',
+            index=models.Index(fields=['surface_roughness_after'], name='process_cas_surface_e94a2d_idx'),
+        ),
+    ]
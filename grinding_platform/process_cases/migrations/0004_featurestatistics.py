@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('process_cases', '0003_processcase_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='模型')),
+                ('feature', models.CharField(max_length=50, verbose_name='特征')),
+                ('count', models.BigIntegerField(default=0, verbose_name='样本数')),
+                ('shift', models.FloatField(default=0, verbose_name='平移量')),
+                ('total', models.FloatField(default=0, verbose_name='平移后的和')),
+                ('total_sq', models.FloatField(default=0, verbose_name='平移后的平方和')),
+                ('min_value', models.FloatField(blank=True, null=True, verbose_name='最小值')),
+                ('max_value', models.FloatField(blank=True, null=True, verbose_name='最大值')),
+                ('reservoir', models.JSONField(default=list, verbose_name='分位数样本')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '特征统计',
+                'verbose_name_plural': '特征统计',
+                'unique_together': {('model_label', 'feature')},
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+import math
+
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -40,6 +42,13 @@ class ProcessCase(models.Model):
         verbose_name = '工艺实例'
         verbose_name_plural = '工艺实例'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['part_material', 'grinding_media']),
+            models.Index(fields=['rotation_speed']),
+            models.Index(fields=['processing_time']),
+            models.Index(fields=['surface_roughness_before']),
+            models.Index(fields=['surface_roughness_after']),
+        ]
     
     def __str__(self):
         return self.name
@@ -158,3 +167,80 @@ class ExperimentData(models.Model):
     
     def __str__(self):
         return self.experiment_name
+
+
+class WeightSet(models.Model):
+    """特征权重集（AHP层次分析法计算结果，创建后不可修改）"""
+    
+    name = models.CharField(max_length=200, verbose_name='权重集名称')
+    description = models.TextField(blank=True, verbose_name='描述')
+    
+    # 判断矩阵
+    criteria_matrix = models.JSONField(default=list, blank=True, verbose_name='准则层判断矩阵')
+    groups = models.JSONField(verbose_name='特征分组及判断矩阵')
+    
+    # 计算结果
+    result = models.JSONField(default=dict, verbose_name='计算结果')
+    feature_weights = models.JSONField(default=dict, verbose_name='特征综合权重')
+    consistency_ratio = models.FloatField(verbose_name='一致性比率(CR)')
+    is_consistent = models.BooleanField(verbose_name='一致性检验通过')
+    content_hash = models.CharField(max_length=64, unique=True, verbose_name='内容哈希')
+    
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='创建人')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    
+    class Meta:
+        verbose_name = '特征权重集'
+        verbose_name_plural = '特征权重集'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.name} ({self.content_hash[:8]})"
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('权重集创建后不可修改')
+        super().save(*args, **kwargs)
+
+
+class FeatureStatistics(models.Model):
+    """数值特征统计（随数据写入增量维护）
+
+    均值与方差由相对平移量 shift 的一阶、二阶和得出，增删样本只需对各列做加减，
+    可用 F() 表达式原子更新而无需锁行；shift 取首个样本，避免直接累加平方和时的精度损失。
+    分位数由定长蓄水池样本估计。
+    """
+    
+    RESERVOIR_SIZE = 1000
+    
+    model_label = models.CharField(max_length=100, verbose_name='模型')
+    feature = models.CharField(max_length=50, verbose_name='特征')
+    count = models.BigIntegerField(default=0, verbose_name='样本数')
+    shift = models.FloatField(default=0, verbose_name='平移量')
+    total = models.FloatField(default=0, verbose_name='平移后的和')
+    total_sq = models.FloatField(default=0, verbose_name='平移后的平方和')
+    min_value = models.FloatField(null=True, blank=True, verbose_name='最小值')
+    max_value = models.FloatField(null=True, blank=True, verbose_name='最大值')
+    reservoir = models.JSONField(default=list, verbose_name='分位数样本')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    
+    class Meta:
+        verbose_name = '特征统计'
+        verbose_name_plural = '特征统计'
+        unique_together = ['model_label', 'feature']
+    
+    def __str__(self):
+        return f"{self.model_label}.{self.feature}"
+    
+    @property
+    def mean(self):
+        return self.shift + self.total / self.count if self.count > 0 else 0.0
+    
+    @property
+    def m2(self):
+        """离差平方和"""
+        return max(self.total_sq - self.total ** 2 / self.count, 0.0) if self.count > 0 else 0.0
+    
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
@@ -0,0 +1,16 @@
+"""
+工艺实例案例推理
+
+在服务端以 NumPy 矩阵批量计算案例相似度，
+替代前端 CaseMatchingService 逐条计算的方式。
+"""
+
+from .features import (
+    NUMERIC_FEATURES,
+    CATEGORICAL_FEATURES,
+    ALL_FEATURES,
+    FEATURE_LABELS,
+    CaseFeatureMatrix,
+    build_postings,
+)
+from .engine import CaseMatcher
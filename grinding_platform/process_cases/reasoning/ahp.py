@@ -0,0 +1,118 @@
+import hashlib
+import json
+
+import numpy as np
+
+
+# 随机一致性指标 RI，与前端 ahp-algorithm.ts 的 RI_TABLE 一致
+RI_TABLE = {
+    1: 0, 2: 0, 3: 0.58, 4: 0.90, 5: 1.12,
+    6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49,
+}
+
+CONSISTENCY_THRESHOLD = 0.1
+
+RECIPROCAL_TOLERANCE = 1e-3
+
+
+def validate_matrix(matrix, name='判断矩阵'):
+    """校验判断矩阵：正数方阵、对角线为1、满足倒数关系"""
+    try:
+        array = np.asarray(matrix, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name}必须是数值矩阵')
+
+    if array.ndim != 2 or array.shape[0] != array.shape[1] or not array.size:
+        raise ValueError(f'{name}必须是非空方阵')
+    if not np.isfinite(array).all() or (array <= 0).any():
+        raise ValueError(f'{name}的元素必须为正数')
+    if not np.allclose(np.diag(array), 1.0):
+        raise ValueError(f'{name}的对角线元素必须为1')
+    if not np.allclose(array * array.T, 1.0, atol=RECIPROCAL_TOLERANCE):
+        raise ValueError(f'{name}必须满足倒数关系 a[i][j] * a[j][i] = 1')
+    return array
+
+
+def principal_eigenvector(matrix):
+    """特征向量法：返回归一化的主特征向量与最大特征值"""
+    eigenvalues, eigenvectors = np.linalg.eig(matrix)
+    index = int(np.argmax(eigenvalues.real))
+    vector = np.abs(eigenvectors[:, index].real)
+    return vector / vector.sum(), float(eigenvalues[index].real)
+
+
+def analyze_matrix(matrix, name='判断矩阵'):
+    """计算单个判断矩阵的权重与一致性指标"""
+    array = validate_matrix(matrix, name)
+    n = len(array)
+    if n == 1:
+        weights, lambda_max = np.ones(1), 1.0
+    else:
+        weights, lambda_max = principal_eigenvector(array)
+
+    ci = (lambda_max - n) / (n - 1) if n > 1 else 0.0
+    ri = RI_TABLE.get(n, 1.49)
+    cr = ci / ri if ri else 0.0
+    return {
+        'weights': [round(float(w), 6) for w in weights],
+        'lambda_max': round(lambda_max, 6),
+        'ci': round(ci, 6),
+        'cr': round(cr, 6),
+        'is_consistent': bool(cr < CONSISTENCY_THRESHOLD),
+    }
+
+
+def compute_weight_set(groups, criteria_matrix=None):
+    """层次分析：准则层（特征分组）权重 × 分组内特征权重 = 特征综合权重
+
+    groups 为 [{'name', 'label', 'features': [...], 'matrix': [[...]]}, ...]，
+    只有一个分组时可省略准则层判断矩阵。
+    """
+    if not groups:
+        raise ValueError('请至少提供一个特征分组')
+    if criteria_matrix in (None, []):
+        if len(groups) > 1:
+            raise ValueError('存在多个特征分组时必须提供准则层判断矩阵')
+        criteria_matrix = [[1]]
+
+    criteria = analyze_matrix(criteria_matrix, '准则层判断矩阵')
+    if len(criteria['weights']) != len(groups):
+        raise ValueError('准则层判断矩阵的阶数必须与特征分组数量一致')
+
+    group_results = []
+    feature_weights = {}
+    for group, group_weight in zip(groups, criteria['weights']):
+        label = group.get('label') or group['name']
+        result = analyze_matrix(group['matrix'], f'分组“{label}”的判断矩阵')
+        if len(result['weights']) != len(group['features']):
+            raise ValueError(f'分组“{label}”的判断矩阵阶数必须与特征数量一致')
+        for feature, local_weight in zip(group['features'], result['weights']):
+            if feature in feature_weights:
+                raise ValueError(f'特征 {feature} 不能出现在多个分组中')
+            feature_weights[feature] = round(group_weight * local_weight, 6)
+        group_results.append({'name': group['name'], 'label': label, 'group_weight': group_weight, **result})
+
+    return {
+        'criteria': criteria,
+        'groups': group_results,
+        'feature_weights': feature_weights,
+        'consistency_ratio': max([criteria['cr']] + [g['cr'] for g in group_results]),
+        'is_consistent': criteria['is_consistent'] and all(g['is_consistent'] for g in group_results),
+    }
+
+
+def weight_set_hash(groups, criteria_matrix=None):
+    """判断矩阵内容的哈希，相同输入得到同一权重集"""
+    payload = {
+        'criteria_matrix': np.round(np.asarray(criteria_matrix or [[1]], dtype=np.float64), 6).tolist(),
+        'groups': [
+            {
+                'name': group['name'],
+                'features': list(group['features']),
+                'matrix': np.round(np.asarray(group['matrix'], dtype=np.float64), 6).tolist(),
+            }
+            for group in groups
+        ],
+    }
+    content = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import warnings
+
+import numpy as np
+from django.conf import settings
+
+from .features import (
+    NUMERIC_FEATURES,
+    CATEGORICAL_FEATURES,
+    MISSING_CODE,
+    normalize_category,
+)
+
+
+# 计算距离时每批处理的向量数，限制临时矩阵的内存占用
+DISTANCE_CHUNK_SIZE = 8192
+
+
+def _squared_distances(vectors, centroids, dim_weights=None):
+    """分块计算加权平方欧氏距离 (n, k)"""
+    if dim_weights is not None:
+        scale = np.sqrt(dim_weights)
+        vectors = vectors * scale
+        centroids = centroids * scale
+    centroid_norms = (centroids ** 2).sum(axis=1)
+    result = np.empty((len(vectors), len(centroids)))
+    for start in range(0, len(vectors), DISTANCE_CHUNK_SIZE):
+        chunk = vectors[start:start + DISTANCE_CHUNK_SIZE]
+        result[start:start + len(chunk)] = (
+            (chunk ** 2).sum(axis=1)[:, None] - 2 * chunk @ centroids.T + centroid_norms
+        )
+    return result
+
+
+def _kmeans(vectors, n_lists, iterations, rng):
+    """朴素 k-means（Lloyd 迭代），空簇用随机样本重新初始化"""
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _squared_distances(vectors, centroids).argmin(axis=1)
+        counts = np.bincount(labels, minlength=n_lists)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+    return centroids
+
+
+class IVFIndex:
+    """倒排文件（IVF）近似最近邻索引
+
+    将归一化后的案例特征向量用 k-means 划分为若干簇，查询时只取距离最近的
+    nprobe 个簇中的案例作为候选，再交由 CaseMatcher 精确重排。
+    特征权重在查询时作用于距离计算，因此同一索引可服务不同的权重配置。
+    """
+
+    def __init__(self, centroids, offsets, case_ids, lower, span, vocabularies):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.case_ids = case_ids
+        self.lower = lower
+        self.span = span
+        self.vocabularies = vocabularies
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @property
+    def dim_owner(self):
+        """每个向量维度所属的特征名"""
+        owners = list(NUMERIC_FEATURES)
+        for name, vocabulary in zip(CATEGORICAL_FEATURES, self.vocabularies):
+            owners.extend([name] * len(vocabulary))
+        return owners
+
+    @classmethod
+    def build(cls, matrix, n_lists=None, iterations=15, sample_size=50000, seed=0):
+        """基于特征矩阵训练索引"""
+        if not len(matrix):
+            raise ValueError('案例库为空，无法构建索引')
+
+        numeric = np.asarray(matrix.numeric)
+        # 整列缺失的特征归一化到常数列，不影响聚类
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            lower = np.nan_to_num(np.nanmin(numeric, axis=0), nan=0.0)
+            upper = np.nan_to_num(np.nanmax(numeric, axis=0), nan=0.0)
+            span = np.where(upper > lower, upper - lower, 1.0)
+            normalized = (numeric - lower) / span
+            fill = np.nan_to_num(np.nanmean(normalized, axis=0), nan=0.5)
+
+        # 词表按编码顺序转为列表，保证索引的维度布局与训练时一致
+        vocabularies = [
+            [value for value, _ in sorted(vocabulary.items(), key=lambda item: item[1])]
+            for vocabulary in matrix.vocabularies
+        ]
+        index = cls(None, None, None, lower, span, [
+            {value: code for code, value in enumerate(values)} for values in vocabularies
+        ])
+        vectors = index._embed_rows(np.where(np.isnan(normalized), fill, normalized), matrix.categorical)
+
+        rng = np.random.default_rng(seed)
+        n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        sample = vectors
+        if len(vectors) > sample_size:
+            sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        index.centroids = _kmeans(sample, n_lists, iterations, rng)
+
+        labels = _squared_distances(vectors, index.centroids).argmin(axis=1)
+        order = np.argsort(labels, kind='stable')
+        index.case_ids = np.asarray(matrix.ids)[order]
+        index.offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_lists))])
+        return index
+
+    def _embed_rows(self, normalized, categorical):
+        """数值特征归一化 + 分类特征 one-hot"""
+        parts = [normalized]
+        for i, vocabulary in enumerate(self.vocabularies):
+            one_hot = np.zeros((len(categorical), len(vocabulary)))
+            codes = categorical[:, i]
+            valid = (codes >= 0) & (codes < len(vocabulary))
+            one_hot[np.flatnonzero(valid), codes[valid]] = 1.0
+            parts.append(one_hot)
+        return np.hstack(parts)
+
+    def embed_query(self, features, weights=None):
+        """将查询特征映射到索引空间，返回 (向量, 维度权重)，未提供的特征权重为 0"""
+        weights = weights or {}
+        numeric = np.array([
+            np.nan if features.get(name) is None else float(features[name])
+            for name in NUMERIC_FEATURES
+        ])
+        normalized = (numeric - self.lower) / self.span
+        categorical = np.array([[
+            vocabulary.get(normalize_category(features.get(name)), MISSING_CODE)
+            for name, vocabulary in zip(CATEGORICAL_FEATURES, self.vocabularies)
+        ]])
+        vector = self._embed_rows(np.nan_to_num(normalized, nan=0.0)[None, :], categorical)[0]
+
+        provided = {
+            name for name in NUMERIC_FEATURES + CATEGORICAL_FEATURES
+            if normalize_category(features.get(name)) is not None
+        }
+        dim_weights = np.array([
+            weights.get(name, 1.0) if name in provided else 0.0
+            for name in self.dim_owner
+        ])
+        return vector, dim_weights
+
+    def probe(self, features, weights=None, nprobe=8):
+        """返回距离查询最近的 nprobe 个簇中的案例ID"""
+        vector, dim_weights = self.embed_query(features, weights)
+        nprobe = max(1, min(nprobe, self.n_lists))
+        distances = _squared_distances(vector[None, :], self.centroids, dim_weights)[0]
+        lists = np.argpartition(distances, nprobe - 1)[:nprobe]
+        return np.concatenate([
+            self.case_ids[self.offsets[i]:self.offsets[i + 1]] for i in lists
+        ])
+
+    def candidate_rows(self, matrix, features, weights=None, nprobe=8):
+        """候选行号：探测簇中的案例，加上索引构建之后新增、尚未入索引的案例"""
+        rows = matrix.rows_for_ids(self.probe(features, weights, nprobe))
+        key = ('unindexed', id(self))
+        if key not in matrix.cache:
+            matrix.cache[key] = np.flatnonzero(~np.isin(matrix.ids, self.case_ids))
+        return np.union1d(rows, matrix.cache[key])
+
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.tmp{os.getpid()}.npz'
+        np.savez(
+            tmp_path,
+            centroids=self.centroids,
+            offsets=self.offsets,
+            case_ids=self.case_ids,
+            lower=self.lower,
+            span=self.span,
+            vocabularies=np.array(json.dumps([
+                [value for value, _ in sorted(vocabulary.items(), key=lambda item: item[1])]
+                for vocabulary in self.vocabularies
+            ], ensure_ascii=False)),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            vocabularies = json.loads(str(data['vocabularies']))
+            return cls(
+                centroids=data['centroids'],
+                offsets=data['offsets'],
+                case_ids=data['case_ids'],
+                lower=data['lower'],
+                span=data['span'],
+                vocabularies=[
+                    {value: code for code, value in enumerate(values)} for values in vocabularies
+                ],
+            )
+
+
+_index_lock = threading.Lock()
+_loaded_index = {'path': None, 'mtime': None, 'index': None}
+
+
+def get_case_index():
+    """加载磁盘上的案例索引，文件更新后自动重新加载；未构建时返回 None"""
+    path = getattr(settings, 'CASE_INDEX_PATH', None)
+    if not path:
+        return None
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _index_lock:
+        if _loaded_index['path'] != path or _loaded_index['mtime'] != mtime:
+            _loaded_index.update(path=path, mtime=mtime, index=IVFIndex.load(path))
+        return _loaded_index['index']
@@ -0,0 +1,197 @@
+import numpy as np
+
+from .features import (
+    NUMERIC_FEATURES,
+    CATEGORICAL_FEATURES,
+    FEATURE_LABELS,
+    MISSING_CODE,
+)
+
+
+# 数值特征相对差异的最小基准值，与前端 calculateFeatureSimilarity 保持一致
+NUMERIC_SCALE_FLOOR = 100.0
+
+# 单特征相似度超过该值即视为匹配特征
+MATCHED_FEATURE_THRESHOLD = 0.7
+
+# 批量匹配时每个分块的中间相似度张量 (目标数 × 案例数 × 特征数) 的元素上限，约 32MB
+BATCH_CHUNK_ELEMENTS = 4_000_000
+
+
+class CaseMatcher:
+    """向量化案例匹配器
+
+    一次矩阵运算完成目标特征与全部候选案例的加权相似度计算。
+    查询中未提供的特征不参与计算。
+    scales 为 {特征: 归一化尺度}（通常来自特征统计），未给出尺度的特征按 max(a, b, 100) 归一化。
+    """
+
+    def __init__(self, matrix, scales=None):
+        self.matrix = matrix
+        scales = scales or {}
+        self.scales = np.array([scales.get(name, np.nan) for name in NUMERIC_FEATURES], dtype=np.float64)
+
+    def _active_features(self, numeric, categorical, weights):
+        """确定参与计算的特征及其权重"""
+        weights = weights or {}
+        num_idx = [
+            i for i, name in enumerate(NUMERIC_FEATURES)
+            if not np.isnan(numeric[i]) and weights.get(name, 1.0) > 0
+        ]
+        cat_idx = [
+            i for i, name in enumerate(CATEGORICAL_FEATURES)
+            if categorical[i] != MISSING_CODE and weights.get(name, 1.0) > 0
+        ]
+        names = [NUMERIC_FEATURES[i] for i in num_idx] + [CATEGORICAL_FEATURES[i] for i in cat_idx]
+        weight_vector = np.array([weights.get(name, 1.0) for name in names], dtype=np.float64)
+        return num_idx, cat_idx, names, weight_vector
+
+    def feature_similarities(self, numeric, categorical, num_idx, cat_idx, rows=None):
+        """计算候选案例在各特征上的相似度矩阵 (n, k)"""
+        values = self.matrix.numeric[:, num_idx]
+        codes = self.matrix.categorical[:, cat_idx]
+        if rows is not None:
+            values = values[rows]
+            codes = codes[rows]
+
+        target = numeric[num_idx]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = self._scale(values, target, self.scales[num_idx])
+            numeric_sim = np.clip(1.0 - np.abs(values - target) / scale, 0.0, 1.0)
+        numeric_sim = np.nan_to_num(numeric_sim, nan=0.0)
+
+        categorical_sim = (codes == categorical[cat_idx]).astype(np.float64)
+        return np.hstack([numeric_sim, categorical_sim])
+
+    def score(self, features, weights=None, rows=None):
+        """计算加权相似度分数 (0-1)，返回 (scores, feature_scores, names)"""
+        numeric, categorical = self.matrix.encode_query(features)
+        num_idx, cat_idx, names, weight_vector = self._active_features(numeric, categorical, weights)
+
+        size = len(self.matrix) if rows is None else len(rows)
+        if not names:
+            return np.zeros(size), np.zeros((size, 0)), names
+
+        feature_scores = self.feature_similarities(numeric, categorical, num_idx, cat_idx, rows)
+        scores = feature_scores @ (weight_vector / weight_vector.sum())
+        return scores, feature_scores, names
+
+    def top_k(self, features, weights=None, k=10, min_similarity=0, exclude_ids=None,
+              include_details=False, rows=None):
+        """返回相似度最高的 k 个案例，按相似度降序排列"""
+        scores, feature_scores, names = self.score(features, weights, rows)
+        ids = self.matrix.ids if rows is None else self.matrix.ids[rows]
+
+        mask = scores * 100 >= min_similarity
+        if exclude_ids:
+            mask &= ~np.isin(ids, list(exclude_ids))
+        candidates = np.flatnonzero(mask)
+
+        if len(candidates) > k:
+            part = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[part]
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [self._build_result(ids[i], scores[i], feature_scores[i], names, include_details) for i in order]
+
+    def iter_top_k(self, features, weights=None, k=10, min_similarity=0, exclude_ids=None,
+                   include_details=False, rows=None, chunk_size=20000):
+        """分块计算 top-k，每处理完一个分块产出 (已处理案例数, 当前 top-k)"""
+        rows = np.arange(len(self.matrix)) if rows is None else np.asarray(rows)
+        best = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            results = self.top_k(
+                features, weights, k, min_similarity, exclude_ids, include_details, rows=chunk
+            )
+            best = sorted(best + results, key=lambda result: -result['similarity'])[:k]
+            yield start + len(chunk), best
+
+    def batch_top_k(self, targets, weights=None, k=10, min_similarity=0, exclude_ids=None,
+                    include_details=False):
+        """批量匹配：一次计算 N 个目标与全部案例的相似度矩阵，返回每个目标的 top-k
+
+        案例按分块处理以限制中间张量的内存占用，每个分块结束后与已有的 top-k 合并。
+        """
+        if not targets:
+            return []
+        n_num = len(NUMERIC_FEATURES)
+        queries = [self.matrix.encode_query(features) for features in targets]
+        q_numeric = np.array([numeric for numeric, _ in queries]).reshape(len(targets), n_num)
+        q_categorical = np.array([categorical for _, categorical in queries]).reshape(
+            len(targets), len(CATEGORICAL_FEATURES)
+        )
+
+        # 每个目标的权重向量，未提供的特征权重为 0，按行归一化
+        weights = weights or {}
+        base = np.array([weights.get(name, 1.0) for name in NUMERIC_FEATURES + CATEGORICAL_FEATURES])
+        provided = np.hstack([~np.isnan(q_numeric), q_categorical != MISSING_CODE])
+        weight_matrix = np.where(provided, base, 0.0)
+        totals = weight_matrix.sum(axis=1, keepdims=True)
+        weight_matrix = np.divide(weight_matrix, totals, out=np.zeros_like(weight_matrix), where=totals > 0)
+
+        excluded = np.isin(self.matrix.ids, list(exclude_ids)) if exclude_ids else None
+        best_scores = np.full((len(targets), 0), -np.inf)
+        best_rows = np.zeros((len(targets), 0), dtype=np.intp)
+        chunk_size = max(1, BATCH_CHUNK_ELEMENTS // (len(targets) * base.size))
+
+        for start in range(0, len(self.matrix), chunk_size):
+            stop = min(start + chunk_size, len(self.matrix))
+            values = self.matrix.numeric[start:stop]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                scale = self._scale(values[None, :, :], q_numeric[:, None, :], self.scales)
+                numeric_sim = np.clip(1.0 - np.abs(values[None, :, :] - q_numeric[:, None, :]) / scale, 0.0, 1.0)
+            numeric_sim = np.nan_to_num(numeric_sim, nan=0.0)
+            categorical_sim = self.matrix.categorical[start:stop][None, :, :] == q_categorical[:, None, :]
+
+            scores = (
+                np.einsum('nmf,nf->nm', numeric_sim, weight_matrix[:, :n_num])
+                + np.einsum('nmf,nf->nm', categorical_sim.astype(np.float64), weight_matrix[:, n_num:])
+            )
+            scores[scores * 100 < min_similarity] = -np.inf
+            if excluded is not None:
+                scores[:, excluded[start:stop]] = -np.inf
+
+            best_scores = np.hstack([best_scores, scores])
+            best_rows = np.hstack([best_rows, np.broadcast_to(np.arange(start, stop), scores.shape)])
+            if best_scores.shape[1] > k:
+                part = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, part, axis=1)
+                best_rows = np.take_along_axis(best_rows, part, axis=1)
+
+        results = []
+        for i, features in enumerate(targets):
+            keep = np.isfinite(best_scores[i])
+            order = np.argsort(-best_scores[i][keep], kind='stable')
+            rows = best_rows[i][keep][order]
+            numeric, categorical = queries[i]
+            num_idx, cat_idx, names, _ = self._active_features(numeric, categorical, weights)
+            feature_scores = self.feature_similarities(numeric, categorical, num_idx, cat_idx, rows)
+            results.append([
+                self._build_result(self.matrix.ids[row], score, row_scores, names, include_details)
+                for row, score, row_scores in zip(rows, best_scores[i][keep][order], feature_scores)
+            ])
+        return results
+
+    @staticmethod
+    def _scale(values, target, scales):
+        """各特征的归一化尺度：有统计尺度时使用统计尺度，否则为 max(a, b, 100)"""
+        default = np.maximum(np.maximum(values, target), NUMERIC_SCALE_FLOOR)
+        return np.where(np.isnan(scales), default, scales)
+
+    @staticmethod
+    def _build_result(case_id, score, feature_scores, names, include_details):
+        result = {
+            'case_id': int(case_id),
+            'similarity': round(float(score) * 100, 2),
+            'matched_features': [
+                FEATURE_LABELS[name]
+                for name, value in zip(names, feature_scores)
+                if value > MATCHED_FEATURE_THRESHOLD
+            ],
+        }
+        if include_details:
+            result['feature_scores'] = {
+                name: round(float(value), 4) for name, value in zip(names, feature_scores)
+            }
+        return result
@@ -0,0 +1,158 @@
+import numpy as np
+
+from ..models import ProcessCase
+
+
+# 参与相似度计算的数值特征
+NUMERIC_FEATURES = (
+    'rotation_speed',
+    'processing_time',
+    'vibration_frequency',
+    'surface_roughness_before',
+    'surface_roughness_after',
+    'removal_amount',
+)
+
+# 参与相似度计算的分类特征（精确匹配）
+CATEGORICAL_FEATURES = (
+    'part_material',
+    'grinding_media',
+)
+
+ALL_FEATURES = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+
+FEATURE_LABELS = {
+    name: str(ProcessCase._meta.get_field(name).verbose_name)
+    for name in ALL_FEATURES
+}
+
+# 分类编码：缺失值与查询中出现的未知取值
+MISSING_CODE = -1
+UNKNOWN_CODE = -2
+
+
+class CaseFeatureMatrix:
+    """案例特征矩阵
+
+    每行对应一个工艺实例：数值特征存为 float64（缺失为 NaN），
+    分类特征按词表编码为 int32（缺失为 -1）。
+    """
+
+    def __init__(self, ids, numeric, categorical, vocabularies, postings=None):
+        self.ids = ids
+        self.numeric = numeric
+        self.categorical = categorical
+        self.vocabularies = vocabularies
+        self._postings = postings
+        # 派生数据缓存（如ID排序索引），随矩阵对象一同失效
+        self.cache = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_queryset(cls, queryset, chunk_size=2000):
+        """从查询集构建特征矩阵，只读取参与计算的列"""
+        vocabularies = [{} for _ in CATEGORICAL_FEATURES]
+        ids, numeric, categorical = [], [], []
+
+        rows = queryset.order_by().values_list('id', *ALL_FEATURES)
+        for row in rows.iterator(chunk_size=chunk_size):
+            ids.append(row[0])
+            numeric.append(row[1:1 + len(NUMERIC_FEATURES)])
+            categorical.append([
+                encode_category(vocabulary, value, create=True)
+                for vocabulary, value in zip(vocabularies, row[1 + len(NUMERIC_FEATURES):])
+            ])
+
+        return cls(
+            ids=np.asarray(ids, dtype=np.int64),
+            numeric=np.asarray(numeric, dtype=np.float64).reshape(len(ids), len(NUMERIC_FEATURES)),
+            categorical=np.asarray(categorical, dtype=np.int32).reshape(len(ids), len(CATEGORICAL_FEATURES)),
+            vocabularies=vocabularies,
+        )
+
+    @property
+    def postings(self):
+        """分类特征倒排表，未由特征存储提供时按需构建"""
+        if self._postings is None:
+            self._postings = build_postings(self.categorical)
+        return self._postings
+
+    def rows_for_ids(self, case_ids):
+        """将案例ID映射为矩阵行号，忽略矩阵中不存在的ID"""
+        case_ids = np.asarray(case_ids, dtype=np.int64)
+        if not len(self) or not len(case_ids):
+            return np.zeros(0, dtype=np.intp)
+        if 'sorter' not in self.cache:
+            sorter = np.argsort(self.ids, kind='stable')
+            self.cache['sorter'] = (sorter, self.ids[sorter])
+        sorter, sorted_ids = self.cache['sorter']
+        pos = np.minimum(np.searchsorted(sorted_ids, case_ids), len(sorted_ids) - 1)
+        return sorter[pos[sorted_ids[pos] == case_ids]]
+
+    def sample_queries(self, count, seed=0):
+        """随机抽取案例，将案例自身特征作为查询，返回 [(案例ID, 特征), ...]"""
+        rng = np.random.default_rng(seed)
+        reverse = [{code: value for value, code in vocabulary.items()} for vocabulary in self.vocabularies]
+        queries = []
+        for row in rng.choice(len(self), min(count, len(self)), replace=False):
+            features = {
+                name: float(value)
+                for name, value in zip(NUMERIC_FEATURES, self.numeric[row])
+                if not np.isnan(value)
+            }
+            for name, vocabulary, code in zip(CATEGORICAL_FEATURES, reverse, self.categorical[row]):
+                if code in vocabulary:
+                    features[name] = vocabulary[code]
+            queries.append((int(self.ids[row]), features))
+        return queries
+
+    def encode_query(self, features):
+        """将查询特征编码为与矩阵对齐的向量"""
+        numeric = np.full(len(NUMERIC_FEATURES), np.nan)
+        for i, name in enumerate(NUMERIC_FEATURES):
+            value = features.get(name)
+            if value is not None:
+                numeric[i] = float(value)
+
+        categorical = np.full(len(CATEGORICAL_FEATURES), MISSING_CODE, dtype=np.int32)
+        for i, name in enumerate(CATEGORICAL_FEATURES):
+            categorical[i] = encode_category(self.vocabularies[i], features.get(name))
+
+        return numeric, categorical
+
+
+def build_postings(categorical):
+    """构建分类特征倒排表：每个分类特征一个 {编码: 行号数组}，缺失值不入表"""
+    postings = []
+    for column in np.asarray(categorical).T:
+        order = np.argsort(column, kind='stable')
+        codes, starts = np.unique(column[order], return_index=True)
+        postings.append({
+            int(code): rows
+            for code, rows in zip(codes, np.split(order, starts[1:]))
+            if code >= 0
+        })
+    return postings
+
+
+def normalize_category(value):
+    """分类取值归一化：去除首尾空白，空串视为缺失"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def encode_category(vocabulary, value, create=False):
+    """按词表编码分类取值"""
+    value = normalize_category(value)
+    if value is None:
+        return MISSING_CODE
+    code = vocabulary.get(value)
+    if code is None:
+        if not create:
+            return UNKNOWN_CODE
+        code = vocabulary[value] = len(vocabulary)
+    return code
@@ -0,0 +1,72 @@
+import numpy as np
+from django.conf import settings
+
+from .ann import get_case_index
+from .features import CATEGORICAL_FEATURES, MISSING_CODE, encode_category
+
+
+MATCH_MODES = ('auto', 'exact', 'ann')
+
+
+def default_nprobe():
+    return getattr(settings, 'CASE_INDEX_NPROBE', 8)
+
+
+def partition_rows(matrix, features, weights=None, min_candidates=0):
+    """按分类特征倒排表裁剪候选集
+
+    取查询中给出的各分类特征（权重为 0 的除外）对应分区的交集；
+    交集小于 min_candidates 时返回 None，退回全量扫描。
+    """
+    weights = weights or {}
+    partitions = []
+    for i, name in enumerate(CATEGORICAL_FEATURES):
+        if weights.get(name, 1.0) <= 0:
+            continue
+        code = encode_category(matrix.vocabularies[i], features.get(name))
+        if code == MISSING_CODE:
+            continue
+        partitions.append(matrix.postings[i].get(code, np.zeros(0, dtype=np.intp)))
+
+    if not partitions:
+        return None
+    partitions.sort(key=len)
+    rows = partitions[0]
+    for other in partitions[1:]:
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    if len(rows) < min_candidates:
+        return None
+    return rows
+
+
+def select_candidates(matrix, features, weights=None, mode='auto', nprobe=None,
+                      partition=True, min_candidates=0):
+    """确定参与精确评分的候选行
+
+    返回 (rows, mode, partitioned)：rows 为 None 表示全量扫描。
+    auto 模式下仅当索引存在且案例数达到 CASE_INDEX_MIN_CASES 时使用近似索引；
+    partition 为真时再按分类特征分区裁剪，分区过小则不裁剪。
+    """
+    rows = None
+    if mode != 'exact':
+        index = get_case_index()
+        if index is not None and (
+            mode == 'ann' or len(matrix) >= getattr(settings, 'CASE_INDEX_MIN_CASES', 50000)
+        ):
+            rows = index.candidate_rows(matrix, features, weights, nprobe or default_nprobe())
+    mode = 'exact' if rows is None else 'ann'
+
+    if not partition:
+        return rows, mode, False
+
+    min_candidates = max(min_candidates, getattr(settings, 'CASE_PARTITION_MIN_CANDIDATES', 200))
+    partitioned = partition_rows(matrix, features, weights, min_candidates)
+    if partitioned is None:
+        return rows, mode, False
+    if rows is None:
+        return partitioned, mode, True
+
+    narrowed = np.intersect1d(rows, partitioned, assume_unique=True)
+    if len(narrowed) < min_candidates:
+        return rows, mode, False
+    return narrowed, mode, True
@@ -0,0 +1,178 @@
+import math
+
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Abs, Coalesce, Greatest, Least, Sqrt
+
+from .engine import NUMERIC_SCALE_FLOOR, CaseMatcher
+from .features import NUMERIC_FEATURES, CATEGORICAL_FEATURES, normalize_category
+
+
+# 数据库端支持的距离度量
+SQL_METRICS = ('manhattan', 'euclidean', 'cosine')
+
+
+def _float(value):
+    return Value(float(value), output_field=FloatField())
+
+
+def _numeric_distance(name, target, scale=None):
+    """单个数值特征的归一化差异 |x - t| / scale，截断到 [0, 1]，缺失视为 1
+
+    未给出统计尺度时 scale 取 max(x, t, 100)。
+    """
+    field = F(name)
+    if scale is None:
+        scale = Greatest(field, _float(target), _float(NUMERIC_SCALE_FLOOR))
+    else:
+        scale = _float(scale)
+    return Coalesce(
+        Least(Abs(field - _float(target)) / scale, _float(1)),
+        _float(1),
+        output_field=FloatField(),
+    )
+
+
+def _categorical_distance(name, target):
+    return Case(When(**{name: target}, then=_float(0)), default=_float(1), output_field=FloatField())
+
+
+def _weighted_sum(terms):
+    expression = None
+    for weight, term in terms:
+        term = _float(weight) * term
+        expression = term if expression is None else expression + term
+    return expression
+
+
+def _numeric_radius(target, radius, scale=None):
+    """满足 |x - t| / scale <= radius 的 x 取值范围（radius < 1）"""
+    if scale is not None:
+        return target - radius * scale, target + radius * scale
+    lower = target - radius * max(target, NUMERIC_SCALE_FLOOR)
+    upper = max(target / (1 - radius), target + radius * NUMERIC_SCALE_FLOOR)
+    return lower, upper
+
+
+class SQLCaseMatcher:
+    """数据库端案例匹配
+
+    将加权距离表达为 ORM 注解，在数据库内完成评分、过滤与排序，只返回 top-k 行；
+    特征取值以参数形式传入，不拼接 SQL。
+    manhattan 度量与 CaseMatcher 的相似度定义一致（各特征相似度的加权平均），
+    scales 的含义同 CaseMatcher。
+    """
+
+    def __init__(self, queryset, scales=None):
+        self.queryset = queryset
+        self.scales = scales or {}
+
+    @staticmethod
+    def _active_features(features, weights):
+        weights = weights or {}
+        numeric = {
+            name: float(features[name]) for name in NUMERIC_FEATURES
+            if features.get(name) is not None and weights.get(name, 1.0) > 0
+        }
+        categorical = {
+            name: normalize_category(features.get(name)) for name in CATEGORICAL_FEATURES
+            if normalize_category(features.get(name)) is not None and weights.get(name, 1.0) > 0
+        }
+        feature_weights = {name: float(weights.get(name, 1.0)) for name in [*numeric, *categorical]}
+        return numeric, categorical, feature_weights
+
+    def range_filters(self, features, weights=None, metric='manhattan', min_similarity=0):
+        """由最低相似度推导每个特征允许的取值范围，生成可利用索引的预过滤条件
+
+        任一特征差异超过其半径时，即使其余特征完全相同，总相似度也低于阈值。
+        """
+        numeric, categorical, feature_weights = self._active_features(features, weights)
+        threshold = min_similarity / 100
+        if threshold <= 0 or not feature_weights:
+            return Q()
+
+        total = sum(feature_weights.values())
+        condition = Q()
+        for name, weight in feature_weights.items():
+            if metric == 'manhattan':
+                radius = (1 - threshold) * total / weight
+            elif metric == 'euclidean':
+                radius = (1 - threshold) * math.sqrt(total / weight)
+            else:
+                # 余弦相似度的数值部分无法按单特征界定，只约束分类特征
+                radius = (1 - threshold) * total / weight if name in categorical else 1
+            if radius >= 1:
+                continue
+            if name in categorical:
+                condition &= Q(**{name: categorical[name]})
+            else:
+                lower, upper = _numeric_radius(numeric[name], radius, self.scales.get(name))
+                condition &= Q(**{f'{name}__gte': lower, f'{name}__lte': upper})
+        return condition
+
+    def annotate(self, features, weights=None, metric='manhattan'):
+        """为查询集注解各特征相似度 sim_<特征> 与总相似度 similarity (0-1)"""
+        numeric, categorical, feature_weights = self._active_features(features, weights)
+        distances = {
+            name: _numeric_distance(name, value, self.scales.get(name)) for name, value in numeric.items()
+        }
+        distances.update({name: _categorical_distance(name, value) for name, value in categorical.items()})
+        total = sum(feature_weights.values())
+
+        queryset = self.queryset.annotate(**{
+            f'sim_{name}': _float(1) - distance for name, distance in distances.items()
+        })
+        if not distances:
+            return queryset.annotate(similarity=_float(0))
+
+        if metric == 'euclidean':
+            squared = _weighted_sum((feature_weights[name], d * d) for name, d in distances.items())
+            similarity = _float(1) - Sqrt(squared / _float(total))
+        elif metric == 'cosine' and numeric:
+            # 数值特征取加权余弦相似度，分类特征仍按是否相同计分
+            numeric_weight = sum(feature_weights[name] for name in numeric)
+            target_norm = math.sqrt(sum(feature_weights[name] * value ** 2 for name, value in numeric.items()))
+            dot = _weighted_sum(
+                (feature_weights[name] * value, Coalesce(F(name), _float(0))) for name, value in numeric.items()
+            )
+            case_norm = Sqrt(_weighted_sum(
+                (feature_weights[name], Coalesce(F(name), _float(0)) * Coalesce(F(name), _float(0)))
+                for name in numeric
+            ))
+            cosine = Coalesce(dot / (case_norm * _float(target_norm)), _float(0)) if target_norm else _float(0)
+            similarity = _float(numeric_weight) * cosine
+            if categorical:
+                similarity = similarity + _weighted_sum(
+                    (feature_weights[name], _float(1) - distances[name]) for name in categorical
+                )
+            similarity = similarity / _float(total)
+        else:
+            similarity = _weighted_sum(
+                (feature_weights[name], _float(1) - d) for name, d in distances.items()
+            ) / _float(total)
+
+        return queryset.annotate(similarity=similarity)
+
+    def top_k(self, features, weights=None, k=10, min_similarity=0, exclude_ids=None,
+              include_details=False, metric='manhattan'):
+        """在数据库中计算 top-k，返回与 CaseMatcher.top_k 相同格式的结果，case 为模型实例"""
+        _, _, feature_weights = self._active_features(features, weights)
+        queryset = self.annotate(features, weights, metric)
+        queryset = queryset.filter(self.range_filters(features, weights, metric, min_similarity))
+        if min_similarity > 0:
+            queryset = queryset.filter(similarity__gte=min_similarity / 100)
+        if exclude_ids:
+            queryset = queryset.exclude(pk__in=exclude_ids)
+
+        results = []
+        for case in queryset.order_by('-similarity', 'pk')[:k]:
+            names = list(feature_weights)
+            result = CaseMatcher._build_result(
+                case.pk,
+                case.similarity,
+                [getattr(case, f'sim_{name}') for name in names],
+                names,
+                include_details,
+            )
+            result['case'] = case
+            results.append(result)
+        return results
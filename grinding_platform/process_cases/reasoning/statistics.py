@@ -0,0 +1,217 @@
+import random
+import threading
+
+import numpy as np
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from ..models import FeatureStatistics
+from .features import NUMERIC_FEATURES
+
+
+# 维护统计的模型及其数值特征
+TRACKED_FEATURES = {
+    'process_cases.processcase': NUMERIC_FEATURES,
+    'polishing_processes.polishingprocess': (
+        'processing_time',
+        'rotation_speed',
+        'vibration_frequency',
+        'temperature',
+        'abrasive_quantity',
+        'expected_surface_roughness',
+    ),
+}
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# apply_change 读取的统计行字段
+STATE_FIELDS = ('pk', 'feature', 'count', 'shift', 'reservoir')
+
+VERSION_CACHE_KEY = 'process_cases:feature_statistics:version'
+
+
+def current_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def bump_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+
+
+def tracked_values(instance):
+    """取出实例上需要统计的特征值"""
+    features = TRACKED_FEATURES[instance._meta.label_lower]
+    return {name: getattr(instance, name) for name in features}
+
+
+def apply_change(model, old_values, new_values):
+    """增量更新统计：移除旧值并加入新值
+
+    各列以 F() 表达式原子加减，不锁定统计行，各案例的写入互不等待。
+    蓄水池样本按读取时的快照修改后写回，并发写入时可能丢失个别样本的替换，只影响分位数估计。
+    """
+    label = model._meta.label_lower
+    changed = [
+        name for name in TRACKED_FEATURES[label]
+        if old_values.get(name) != new_values.get(name)
+    ]
+    if not changed:
+        return
+
+    rows = {
+        row['feature']: row
+        for row in FeatureStatistics.objects.filter(model_label=label, feature__in=changed).values(*STATE_FIELDS)
+    }
+    for name in changed:
+        old, new = _as_float(old_values.get(name)), _as_float(new_values.get(name))
+        row = rows.get(name)
+        if row is None:
+            if new is None:
+                continue
+            row = _create_row(label, name, new)
+        if row['count'] <= 0:
+            old = None
+        if old is None and new is None:
+            continue
+        FeatureStatistics.objects.filter(pk=row['pk']).update(**_changes(model, row, old, new))
+    transaction.on_commit(bump_version)
+
+
+def _as_float(value):
+    return None if value is None else float(value)
+
+
+def _create_row(label, name, shift):
+    stats, _ = FeatureStatistics.objects.get_or_create(model_label=label, feature=name, defaults={'shift': shift})
+    return {field: getattr(stats, field) for field in STATE_FIELDS}
+
+
+def _changes(model, row, old, new):
+    """统计行的更新：计数与平移和的增量、上下界及蓄水池样本"""
+    name, shift = row['feature'], row['shift']
+    count = total = total_sq = 0
+    for value, sign in ((old, -1), (new, 1)):
+        if value is not None:
+            count += sign
+            total += sign * (value - shift)
+            total_sq += sign * (value - shift) ** 2
+    changes = {
+        'count': F('count') + count,
+        'total': F('total') + total,
+        'total_sq': F('total_sq') + total_sq,
+        'updated_at': timezone.now(),
+    }
+
+    # 新值直接与当前上下界比较；移除的恰好是上下界时，从数据表中重新取得（此时表中已是写入后的数据）
+    values = model.objects.filter(**{f'{name}__isnull': False}).order_by()
+    for field, combine, ordering in (('min_value', Least, name), ('max_value', Greatest, f'-{name}')):
+        bound = F(field) if new is None else combine(Coalesce(F(field), Value(new)), Value(new))
+        if old is not None:
+            rescan = Subquery(values.order_by(ordering).values(name)[:1])
+            bound = Case(When(**{field: old}, then=rescan), default=bound, output_field=FloatField())
+        changes[field] = bound
+
+    reservoir = list(row['reservoir'])
+    sampled = False
+    if old is not None and old in reservoir:
+        reservoir.remove(old)
+        sampled = True
+    if new is not None:
+        if len(reservoir) < FeatureStatistics.RESERVOIR_SIZE:
+            reservoir.append(new)
+            sampled = True
+        else:
+            slot = random.randrange(row['count'] + 1)
+            if slot < FeatureStatistics.RESERVOIR_SIZE:
+                reservoir[slot] = new
+                sampled = True
+    if sampled:
+        changes['reservoir'] = reservoir
+    return changes
+
+
+def rebuild_statistics(model, chunk_size=5000):
+    """全量重新计算某个模型的特征统计，用于 bulk_create 等绕过信号的批量写入之后"""
+    label = model._meta.label_lower
+    features = TRACKED_FEATURES[label]
+    rows = model.objects.order_by().values_list(*features)
+    values = np.array(
+        [[np.nan if value is None else float(value) for value in row] for row in rows.iterator(chunk_size=chunk_size)],
+        dtype=np.float64,
+    ).reshape(-1, len(features))
+
+    with transaction.atomic():
+        FeatureStatistics.objects.filter(model_label=label).delete()
+        stats = []
+        for name, column in zip(features, values.T):
+            column = column[~np.isnan(column)]
+            item = FeatureStatistics(model_label=label, feature=name, count=len(column))
+            if len(column):
+                item.shift = float(column.mean())
+                item.total_sq = float(((column - item.shift) ** 2).sum())
+                item.min_value = float(column.min())
+                item.max_value = float(column.max())
+                item.reservoir = random.sample(column.tolist(), min(len(column), item.RESERVOIR_SIZE))
+            stats.append(item)
+        FeatureStatistics.objects.bulk_create(stats)
+        transaction.on_commit(bump_version)
+
+
+def _snapshot(stats):
+    samples = np.asarray(stats.reservoir, dtype=np.float64)
+    return {
+        'count': stats.count,
+        'mean': stats.mean,
+        'std': stats.std,
+        'min': stats.min_value,
+        'max': stats.max_value,
+        'quantiles': {
+            f'p{int(q * 100)}': float(value)
+            for q, value in zip(QUANTILES, np.quantile(samples, QUANTILES) if len(samples) else [])
+        },
+    }
+
+
+_lock = threading.Lock()
+_loaded = {'version': None, 'statistics': {}}
+
+
+def get_statistics():
+    """返回 {模型: {特征: 统计}}，同一版本内只查询一次数据库"""
+    version = current_version()
+    with _lock:
+        if _loaded['version'] != version:
+            statistics = {label: {} for label in TRACKED_FEATURES}
+            for stats in FeatureStatistics.objects.all():
+                statistics.setdefault(stats.model_label, {})[stats.feature] = _snapshot(stats)
+            _loaded.update(version=version, statistics=statistics)
+        return _loaded['statistics']
+
+
+def feature_scales(label='process_cases.processcase'):
+    """数值特征的归一化尺度：取 p5-p95 的稳健范围，退化时取 min-max 范围
+
+    没有统计数据的特征不返回，匹配时沿用 max(a, b, 100) 的默认尺度。
+    """
+    scales = {}
+    for name, stats in get_statistics().get(label, {}).items():
+        quantiles = stats['quantiles']
+        scale = quantiles.get('p95', 0) - quantiles.get('p5', 0)
+        if scale <= 0 and stats['count']:
+            scale = stats['max'] - stats['min']
+        if scale > 0:
+            scales[name] = scale
+    return scales
+
+
+def tracked_models():
+    return [apps.get_model(label) for label in TRACKED_FEATURES]
@@ -0,0 +1,297 @@
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import ProcessCase
+from .features import (
+    NUMERIC_FEATURES,
+    CATEGORICAL_FEATURES,
+    MISSING_CODE,
+    CaseFeatureMatrix,
+    build_postings,
+    encode_category,
+)
+
+
+VERSION_CACHE_KEY = 'process_cases:feature_store:version'
+
+# 快照目录中指向当前版本的文件
+CURRENT_POINTER = 'CURRENT'
+
+# 保留的历史快照数量，避免其他进程正在映射的文件被立即清理
+KEEP_SNAPSHOTS = 2
+
+
+def current_version():
+    """获取共享的特征存储版本号"""
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def bump_version():
+    """递增共享版本号，返回递增后的版本"""
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+        return 1
+
+
+class CaseFeatureStore:
+    """进程级案例特征存储
+
+    以案例ID为键维护特征矩阵及分类特征倒排表，由 ProcessCase 的 post_save/post_delete 信号增量更新。
+    共享版本号保存在缓存中，各 worker 据此判断本地副本是否过期；
+    配置 CASE_FEATURE_STORE_DIR 后会将快照写为 .npy 文件，
+    其他 worker 通过内存映射加载同一份快照，无需各自全表扫描。
+    快照在全量加载后写入；增量更新之后最多每 CASE_FEATURE_STORE_SNAPSHOT_SECONDS 秒写一次。
+
+    已交给请求的矩阵引用的是存储数组的视图，增量更新改写已有行之前先复制数组（写时复制），
+    正在计算的请求继续读取旧数组。
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.version = None
+        self._lock = threading.RLock()
+        self._size = 0
+        self._ids = None
+        self._numeric = None
+        self._categorical = None
+        self._vocabularies = None
+        self._postings = None
+        self._rows = {}
+        self._cached_matrix = None
+        self._shared = False
+        self._snapshot_at = None
+
+    @property
+    def loaded(self):
+        return self._ids is not None
+
+    def get_matrix(self):
+        """返回最新的特征矩阵，本地副本过期时重新加载"""
+        with self._lock:
+            version = current_version()
+            if not self.loaded or self.version != version:
+                self._reload(version)
+            return self._matrix()
+
+    def upsert(self, case):
+        """新增或更新一个案例的特征"""
+        numeric = np.array([getattr(case, name) for name in NUMERIC_FEATURES], dtype=np.float64)
+        with self._lock:
+            version = bump_version()
+            if not self._can_apply(version):
+                return
+            categorical = [
+                encode_category(vocabulary, getattr(case, name), create=True)
+                for vocabulary, name in zip(self._vocabularies, CATEGORICAL_FEATURES)
+            ]
+            row = self._rows.get(case.pk)
+            self._ensure_writable(self._size + 1, in_place=row is not None)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[case.pk] = row
+                self._ids[row] = case.pk
+                old_codes = [MISSING_CODE] * len(CATEGORICAL_FEATURES)
+            else:
+                old_codes = self._categorical[row].tolist()
+            for i, (old, new) in enumerate(zip(old_codes, categorical)):
+                if old != new:
+                    self._posting_remove(i, old, row)
+                    self._posting_add(i, new, row)
+            self._numeric[row] = numeric
+            self._categorical[row] = categorical
+            self._applied(version)
+
+    def remove(self, case_id):
+        """移除一个案例，用最后一行填补空位"""
+        with self._lock:
+            version = bump_version()
+            if not self._can_apply(version):
+                return
+            row = self._rows.pop(case_id, None)
+            if row is not None:
+                self._ensure_writable(self._size, in_place=True)
+                for i, code in enumerate(self._categorical[row].tolist()):
+                    self._posting_remove(i, code, row)
+                last = self._size - 1
+                if row != last:
+                    for i, code in enumerate(self._categorical[last].tolist()):
+                        self._posting_move(i, code, last, row)
+                    self._ids[row] = self._ids[last]
+                    self._numeric[row] = self._numeric[last]
+                    self._categorical[row] = self._categorical[last]
+                    self._rows[int(self._ids[row])] = row
+                self._size = last
+            self._applied(version)
+
+    def invalidate(self):
+        """标记所有副本过期，用于 bulk_create/update 等绕过信号的批量写入之后"""
+        with self._lock:
+            bump_version()
+            self.version = None
+
+    def _posting_add(self, i, code, row):
+        if code < 0:
+            return
+        rows = self._postings[i].get(code)
+        self._postings[i][code] = np.append(rows, row) if rows is not None else np.array([row], dtype=np.intp)
+
+    def _posting_remove(self, i, code, row):
+        rows = self._postings[i].get(code)
+        if rows is None:
+            return
+        rows = rows[rows != row]
+        if len(rows):
+            self._postings[i][code] = rows
+        else:
+            del self._postings[i][code]
+
+    def _posting_move(self, i, code, old_row, new_row):
+        """行被移动后更新倒排表；复制后替换，正在读取旧数组的请求不受影响"""
+        rows = self._postings[i].get(code)
+        if rows is None:
+            return
+        rows = rows.copy()
+        rows[rows == old_row] = new_row
+        self._postings[i][code] = rows
+
+    def _can_apply(self, version):
+        """只有本地副本恰好落后一个版本时才能增量更新，否则等待下次读取时重新加载"""
+        if self.loaded and self.version == version - 1:
+            return True
+        self.version = None
+        return False
+
+    def _applied(self, version):
+        self.version = version
+        self._cached_matrix = None
+        if self.directory and self._snapshot_due():
+            self._write_snapshot(version)
+
+    def _snapshot_due(self):
+        interval = settings.CASE_FEATURE_STORE_SNAPSHOT_SECONDS
+        return self._snapshot_at is None or time.monotonic() - self._snapshot_at >= interval
+
+    def _matrix(self):
+        """同一版本内复用矩阵对象，使其派生缓存在多次请求间有效"""
+        if self._cached_matrix is None:
+            self._shared = True
+            size = self._size
+            self._cached_matrix = CaseFeatureMatrix(
+                ids=self._ids[:size],
+                numeric=self._numeric[:size],
+                categorical=self._categorical[:size],
+                vocabularies=self._vocabularies,
+                postings=[dict(postings) for postings in self._postings],
+            )
+        return self._cached_matrix
+
+    def _reload(self, version):
+        if not (self.directory and self._load_snapshot(version)):
+            self._load_queryset(version)
+            if self.directory:
+                self._write_snapshot(version)
+        self._rows = {int(case_id): row for row, case_id in enumerate(self._ids[:self._size])}
+        self._postings = build_postings(self._categorical[:self._size])
+
+    def _load_queryset(self, version):
+        matrix = CaseFeatureMatrix.from_queryset(ProcessCase.objects.all())
+        self._set_arrays(matrix.ids, matrix.numeric, matrix.categorical, matrix.vocabularies, version)
+
+    def _set_arrays(self, ids, numeric, categorical, vocabularies, version):
+        self._ids = ids
+        self._numeric = numeric
+        self._categorical = categorical
+        self._vocabularies = vocabularies
+        self._size = len(ids)
+        self.version = version
+        self._cached_matrix = None
+        self._shared = False
+
+    def _ensure_writable(self, size, in_place=False):
+        """保证数组可写且容量足够
+
+        内存映射的只读快照在首次写入时复制到内存；要改写已有行（in_place）而数组已交给请求时，
+        复制后再改写。追加新行写在已交出的视图范围之外，无需复制。
+        """
+        capacity = len(self._ids)
+        if self._ids.flags.writeable and size <= capacity and not (in_place and self._shared):
+            return
+        capacity = max(size, capacity + capacity // 2, 64)
+        ids = np.zeros(capacity, dtype=np.int64)
+        numeric = np.full((capacity, len(NUMERIC_FEATURES)), np.nan)
+        categorical = np.zeros((capacity, len(CATEGORICAL_FEATURES)), dtype=np.int32)
+        ids[:self._size] = self._ids[:self._size]
+        numeric[:self._size] = self._numeric[:self._size]
+        categorical[:self._size] = self._categorical[:self._size]
+        self._ids, self._numeric, self._categorical = ids, numeric, categorical
+        self._shared = False
+
+    def _snapshot_path(self, version):
+        return os.path.join(self.directory, f'v{version}')
+
+    def _load_snapshot(self, version):
+        try:
+            with open(os.path.join(self.directory, CURRENT_POINTER), encoding='utf-8') as f:
+                if int(f.read().strip()) != version:
+                    return False
+            path = self._snapshot_path(version)
+            with open(os.path.join(path, 'vocabularies.json'), encoding='utf-8') as f:
+                vocabularies = json.load(f)
+            self._set_arrays(
+                np.load(os.path.join(path, 'ids.npy'), mmap_mode='r'),
+                np.load(os.path.join(path, 'numeric.npy'), mmap_mode='r'),
+                np.load(os.path.join(path, 'categorical.npy'), mmap_mode='r'),
+                vocabularies,
+                version,
+            )
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _write_snapshot(self, version):
+        """写入版本化快照目录，再原子替换 CURRENT 指针"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._snapshot_path(version)
+        tmp_path = f'{path}.tmp{os.getpid()}'
+        os.makedirs(tmp_path, exist_ok=True)
+        size = self._size
+        np.save(os.path.join(tmp_path, 'ids.npy'), self._ids[:size])
+        np.save(os.path.join(tmp_path, 'numeric.npy'), self._numeric[:size])
+        np.save(os.path.join(tmp_path, 'categorical.npy'), self._categorical[:size])
+        with open(os.path.join(tmp_path, 'vocabularies.json'), 'w', encoding='utf-8') as f:
+            json.dump(self._vocabularies, f, ensure_ascii=False)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+        pointer = os.path.join(self.directory, f'{CURRENT_POINTER}.tmp{os.getpid()}')
+        with open(pointer, 'w', encoding='utf-8') as f:
+            f.write(str(version))
+        os.replace(pointer, os.path.join(self.directory, CURRENT_POINTER))
+        self._snapshot_at = time.monotonic()
+        self._cleanup_snapshots(version)
+
+    def _cleanup_snapshots(self, version):
+        for name in os.listdir(self.directory):
+            if not name.startswith('v') or '.tmp' in name:
+                continue
+            try:
+                snapshot_version = int(name[1:])
+            except ValueError:
+                continue
+            if snapshot_version <= version - KEEP_SNAPSHOTS:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+feature_store = CaseFeatureStore(getattr(settings, 'CASE_FEATURE_STORE_DIR', None))
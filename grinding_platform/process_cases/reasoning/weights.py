@@ -0,0 +1,52 @@
+from functools import lru_cache
+
+from django.core.cache import cache
+
+from ..models import WeightSet
+from .features import ALL_FEATURES
+
+
+VERSION_CACHE_KEY = 'process_cases:weight_sets:version'
+
+
+def current_version():
+    """获取共享的权重集版本号"""
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def bump_version():
+    """递增共享版本号，使所有进程的权重缓存失效"""
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+        return 1
+
+
+@lru_cache(maxsize=256)
+def _load_feature_weights(weight_set_id, version):
+    # 不存在时抛出异常，避免缓存 None 导致之后创建的同ID权重集不可见
+    weights = WeightSet.objects.values_list('feature_weights', flat=True).get(pk=weight_set_id)
+    # 权重集未覆盖的特征不参与匹配，而不是按匹配器的默认权重 1 计算
+    return {name: weights.get(name, 0.0) for name in ALL_FEATURES}
+
+
+def get_feature_weights(weight_set_id):
+    """获取权重集的特征综合权重，包含全部特征（未覆盖的特征权重为 0）
+
+    权重集创建后不可修改，因此可按 (ID, 共享版本号) 在进程内缓存，匹配请求无需重复查询与解析；
+    删除权重集时递增版本号，其他进程的缓存随之失效。
+    权重集不存在时返回 None。
+    """
+    try:
+        return _load_feature_weights(weight_set_id, current_version())
+    except WeightSet.DoesNotExist:
+        return None
+
+
+def clear_weight_cache():
+    """权重集删除后使所有进程的缓存失效"""
+    bump_version()
+    _load_feature_weights.cache_clear()
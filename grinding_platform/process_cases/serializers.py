@@ -1,8 +1,18 @@
+import math
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import ProcessCase, ProcessTemplate, ExpertKnowledge, ExperimentData
+from polishing_requirements.models import PolishingRequirement
+from grinding_platform.serializers import SparseFieldsMixin
+from .models import ProcessCase, ProcessTemplate, ExpertKnowledge, ExperimentData, WeightSet
+from .reasoning import NUMERIC_FEATURES, ALL_FEATURES
+from .reasoning.ahp import compute_weight_set, weight_set_hash
+from .reasoning.search import MATCH_MODES
+from .reasoning.sql import SQL_METRICS
+from .reasoning.weights import get_feature_weights
 
 
-class ProcessCaseSerializer(serializers.ModelSerializer):
+class ProcessCaseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """工艺实例序列化器"""
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -17,7 +27,154 @@ class ProcessCaseSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ProcessTemplateSerializer(serializers.ModelSerializer):
+class CaseMatchSerializer(serializers.Serializer):
+    """案例匹配请求序列化器"""
+    features = serializers.DictField()
+    weights = serializers.DictField(child=serializers.FloatField(min_value=0), required=False)
+    weight_set = serializers.IntegerField(required=False)
+    top_k = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    min_similarity = serializers.FloatField(min_value=0, max_value=100, default=0)
+    exclude_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    include_details = serializers.BooleanField(default=False)
+    mode = serializers.ChoiceField(choices=MATCH_MODES, default='auto')
+    nprobe = serializers.IntegerField(min_value=1, max_value=1024, required=False)
+    partition = serializers.BooleanField(default=True)
+    engine = serializers.ChoiceField(choices=('memory', 'sql'), default='memory')
+    metric = serializers.ChoiceField(choices=SQL_METRICS, default='manhattan')
+
+    def validate_features(self, value):
+        unknown = set(value) - set(ALL_FEATURES)
+        if unknown:
+            raise serializers.ValidationError(f'不支持的特征: {", ".join(sorted(unknown))}')
+
+        features = {}
+        for name, item in value.items():
+            if item in (None, ''):
+                continue
+            if name in NUMERIC_FEATURES:
+                try:
+                    item = float(item)
+                except (TypeError, ValueError):
+                    raise serializers.ValidationError(f'特征 {name} 必须是数值')
+                if not math.isfinite(item):
+                    raise serializers.ValidationError(f'特征 {name} 必须是有限的数值')
+            elif isinstance(item, (dict, list)):
+                raise serializers.ValidationError(f'特征 {name} 必须是单个取值')
+            features[name] = item
+
+        if not features:
+            raise serializers.ValidationError('请至少提供一个目标特征')
+        return features
+
+    def validate_weights(self, value):
+        unknown = set(value) - set(ALL_FEATURES)
+        if unknown:
+            raise serializers.ValidationError(f'不支持的特征: {", ".join(sorted(unknown))}')
+        return value
+
+    def validate(self, attrs):
+        if 'weight_set' in attrs:
+            if 'weights' in attrs:
+                raise serializers.ValidationError('weights 与 weight_set 不能同时提供')
+            weights = get_feature_weights(attrs['weight_set'])
+            if weights is None:
+                raise serializers.ValidationError({'weight_set': '权重集不存在'})
+            attrs['weights'] = weights
+        if attrs.get('metric', 'manhattan') != 'manhattan' and attrs.get('engine') != 'sql':
+            raise serializers.ValidationError({'metric': '仅 sql 引擎支持 euclidean/cosine 度量'})
+        return attrs
+
+
+class CaseBatchMatchSerializer(CaseMatchSerializer):
+    """批量案例匹配请求序列化器：目标可直接给出特征，也可引用光整需求"""
+    features = None
+    mode = None
+    nprobe = None
+    partition = None
+    engine = None
+    metric = None
+    targets = serializers.ListField(child=serializers.DictField(), required=False)
+    requirement_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate_targets(self, value):
+        return [self.validate_features(features) for features in value]
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        targets = [{'features': features} for features in attrs.get('targets', [])]
+
+        requirement_ids = attrs.get('requirement_ids', [])
+        if requirement_ids:
+            requirements = PolishingRequirement.objects.in_bulk(requirement_ids)
+            missing = [str(pk) for pk in requirement_ids if pk not in requirements]
+            if missing:
+                raise serializers.ValidationError({'requirement_ids': f'光整需求不存在: {", ".join(missing)}'})
+            for pk in requirement_ids:
+                requirement = requirements[pk]
+                features = {
+                    'part_material': requirement.material,
+                    'surface_roughness_before': requirement.surface_roughness_before,
+                    'surface_roughness_after': requirement.surface_roughness_after,
+                }
+                targets.append({
+                    'requirement_id': pk,
+                    'features': {name: value for name, value in features.items() if value not in (None, '')},
+                })
+
+        if not targets:
+            raise serializers.ValidationError('请提供 targets 或 requirement_ids')
+        if len(targets) > settings.CASE_BATCH_MAX_TARGETS:
+            raise serializers.ValidationError(f'单次最多匹配 {settings.CASE_BATCH_MAX_TARGETS} 个目标')
+        attrs['targets'] = targets
+        return attrs
+
+
+class WeightGroupSerializer(serializers.Serializer):
+    """特征分组判断矩阵序列化器"""
+    name = serializers.CharField(max_length=50)
+    label = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    features = serializers.ListField(child=serializers.ChoiceField(choices=ALL_FEATURES), min_length=1)
+    matrix = serializers.ListField(child=serializers.ListField(child=serializers.FloatField()))
+
+
+class WeightSetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """特征权重集序列化器：提交判断矩阵，由服务端计算权重与一致性"""
+    groups = WeightGroupSerializer(many=True)
+    criteria_matrix = serializers.ListField(
+        child=serializers.ListField(child=serializers.FloatField()), required=False
+    )
+    created_by_name = serializers.CharField(source='created_by.username', read_only=True)
+    
+    class Meta:
+        model = WeightSet
+        fields = '__all__'
+        read_only_fields = (
+            'result', 'feature_weights', 'consistency_ratio', 'is_consistent',
+            'content_hash', 'created_by', 'created_at'
+        )
+    
+    def validate(self, attrs):
+        groups = attrs['groups']
+        criteria_matrix = attrs.get('criteria_matrix') or []
+        try:
+            result = compute_weight_set(groups, criteria_matrix)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        
+        attrs['criteria_matrix'] = criteria_matrix
+        attrs['result'] = {'criteria': result['criteria'], 'groups': result['groups']}
+        attrs['feature_weights'] = result['feature_weights']
+        attrs['consistency_ratio'] = result['consistency_ratio']
+        attrs['is_consistent'] = result['is_consistent']
+        attrs['content_hash'] = weight_set_hash(groups, criteria_matrix)
+        return attrs
+    
+    def create(self, validated_data):
+        validated_data['created_by'] = self.context['request'].user
+        return super().create(validated_data)
+
+
+class ProcessTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """工序模板序列化器"""
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     template_type_display = serializers.CharField(source='get_template_type_display', read_only=True)
@@ -32,7 +189,7 @@ class ProcessTemplateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ExpertKnowledgeSerializer(serializers.ModelSerializer):
+class ExpertKnowledgeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """专家知识库序列化器"""
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
     knowledge_type_display = serializers.CharField(source='get_knowledge_type_display', read_only=True)
@@ -47,7 +204,7 @@ class ExpertKnowledgeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ExperimentDataSerializer(serializers.ModelSerializer):
+class ExperimentDataSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """试验数据序列化器"""
     experimenter_name = serializers.CharField(source='experimenter.username', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from grinding_platform.changes import previous_values, track_previous_values
+from polishing_processes.models import PolishingProcess
+from .models import ProcessCase, WeightSet
+from .reasoning.statistics import TRACKED_FEATURES, apply_change, tracked_values
+from .reasoning.store import feature_store
+from .reasoning.weights import clear_weight_cache
+
+
+@receiver(post_save, sender=ProcessCase)
+def update_case_features(sender, instance, **kwargs):
+    """案例保存后增量更新特征存储"""
+    transaction.on_commit(lambda: feature_store.upsert(instance))
+
+
+@receiver(post_delete, sender=ProcessCase)
+def remove_case_features(sender, instance, **kwargs):
+    """案例删除后从特征存储中移除"""
+    case_id = instance.pk
+    transaction.on_commit(lambda: feature_store.remove(case_id))
+
+
+@receiver(post_delete, sender=WeightSet)
+def invalidate_weight_cache(sender, instance, **kwargs):
+    """权重集删除后使各进程缓存的权重失效"""
+    transaction.on_commit(clear_weight_cache)
+
+
+for model in (ProcessCase, PolishingProcess):
+    track_previous_values(model, TRACKED_FEATURES[model._meta.label_lower])
+
+
+@receiver(post_save, sender=ProcessCase)
+@receiver(post_save, sender=PolishingProcess)
+def update_feature_statistics(sender, instance, **kwargs):
+    """保存后增量更新特征统计"""
+    apply_change(sender, previous_values(instance) or {}, tracked_values(instance))
+
+
+@receiver(post_delete, sender=ProcessCase)
+@receiver(post_delete, sender=PolishingProcess)
+def discard_feature_statistics(sender, instance, **kwargs):
+    """删除后从特征统计中移除"""
+    apply_change(sender, tracked_values(instance), {})
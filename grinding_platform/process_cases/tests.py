@@ -1,3 +1,630 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APITestCase
+
+from grinding_platform.testing import FixtureMixin, QueryCountMixin, User
+from polishing_processes.models import PolishingProcess, ProcessUsageRecord
+from search.models import AutocompleteValue, SearchDocument
+from stats.counters import get_counters
+
+from .models import ExperimentData, ExpertKnowledge, FeatureStatistics, ProcessCase, ProcessTemplate, WeightSet
+from .reasoning import CaseMatcher
+from .reasoning.ahp import analyze_matrix, compute_weight_set
+from .reasoning.ann import IVFIndex
+from .reasoning.features import CATEGORICAL_FEATURES, NUMERIC_FEATURES, CaseFeatureMatrix
+from .reasoning.search import partition_rows, select_candidates
+from .reasoning.sql import SQLCaseMatcher
+from .reasoning.statistics import rebuild_statistics
+from .reasoning.store import CURRENT_POINTER, CaseFeatureStore, feature_store
+from .reasoning.weights import bump_version, get_feature_weights
+
+
+def random_matrix(size, seed=0, missing=0.1):
+    """随机特征矩阵：数值特征含一定比例的缺失，分类特征取自少量取值"""
+    rng = np.random.default_rng(seed)
+    numeric = rng.uniform(0, 500, (size, len(NUMERIC_FEATURES)))
+    numeric[rng.random(numeric.shape) < missing] = np.nan
+    vocabularies = [{f'{name}{i}': i for i in range(4)} for name in CATEGORICAL_FEATURES]
+    categorical = rng.integers(0, 4, (size, len(CATEGORICAL_FEATURES))).astype(np.int32)
+    categorical[rng.random(categorical.shape) < missing] = -1
+    return CaseFeatureMatrix(np.arange(1, size + 1, dtype=np.int64), numeric, categorical, vocabularies)
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """工艺实例、模板、专家知识、试验数据与权重集列表的查询数不随行数增长"""
+
+    def create_template(self):
+        i = self.next_id()
+        return ProcessTemplate.objects.create(
+            name=f'模板{i}', template_type='deburring', standard_media='陶瓷磨块', standard_compound='光饰剂',
+            standard_speed=150, standard_time=30, applicable_materials='45钢', applicable_sizes='φ10',
+            created_by=self.user,
+        )
+
+    def create_knowledge(self):
+        i = self.next_id()
+        return ExpertKnowledge.objects.create(
+            title=f'知识{i}', knowledge_type='material_guide', content='-', expert_name='李工',
+            expert_title='高级工程师', applicable_scenarios='-', created_by=self.user,
+        )
+
+    def create_experiment(self):
+        i = self.next_id()
+        return ExperimentData.objects.create(
+            experiment_name=f'试验{i}', experiment_purpose='-', experiment_method='-', test_material='45钢',
+            experimenter=self.user,
+        )
+
+    def create_weight_set(self):
+        i = self.next_id()
+        return WeightSet.objects.create(
+            name=f'权重集{i}', groups=[{'name': 'speed', 'features': ['rotation_speed'], 'matrix': [[1]]}],
+            feature_weights={'rotation_speed': 1}, consistency_ratio=0, is_consistent=True, content_hash=f'{i}',
+            created_by=self.user,
+        )
+
+    def test_process_cases(self):
+        self.assertConstantQueries('/api/v1/process-cases/cases/', self.create_case)
+
+    def test_process_templates(self):
+        self.assertConstantQueries('/api/v1/process-cases/templates/', self.create_template)
+
+    def test_expert_knowledge(self):
+        self.assertConstantQueries('/api/v1/process-cases/knowledge/', self.create_knowledge)
+
+    def test_experiments(self):
+        self.assertConstantQueries('/api/v1/process-cases/experiments/', self.create_experiment)
+
+    def test_weight_sets(self):
+        self.assertConstantQueries('/api/v1/process-cases/weight-sets/', self.create_weight_set)
+
+
+class CaseMatcherTests(SimpleTestCase):
+    """向量化匹配的相似度与 top-k 选取"""
+
+    def setUp(self):
+        self.matrix = random_matrix(200)
+        self.matcher = CaseMatcher(self.matrix)
+        self.query = {'rotation_speed': 150, 'processing_time': 30, 'part_material': 'part_material1'}
+
+    def expected_score(self, row, features, weights):
+        total = score = 0.0
+        for name, target in features.items():
+            weight = weights.get(name, 1.0)
+            if name in NUMERIC_FEATURES:
+                value = self.matrix.numeric[row, NUMERIC_FEATURES.index(name)]
+                similarity = 0.0 if np.isnan(value) else max(0.0, 1 - abs(value - target) / max(value, target, 100))
+            else:
+                code = self.matrix.categorical[row, CATEGORICAL_FEATURES.index(name)]
+                similarity = float(code == self.matrix.vocabularies[CATEGORICAL_FEATURES.index(name)][target])
+            total += weight
+            score += weight * similarity
+        return score / total
+
+    def test_score_is_weighted_average(self):
+        weights = {'rotation_speed': 3, 'processing_time': 1, 'part_material': 2}
+        scores, feature_scores, names = self.matcher.score(self.query, weights)
+        self.assertEqual(names, ['rotation_speed', 'processing_time', 'part_material'])
+        self.assertEqual(feature_scores.shape, (200, 3))
+        for row in range(200):
+            self.assertAlmostEqual(scores[row], self.expected_score(row, self.query, weights))
+
+    def test_zero_weight_and_missing_features_ignored(self):
+        _, _, names = self.matcher.score({**self.query, 'grinding_media': None}, {'processing_time': 0})
+        self.assertEqual(names, ['rotation_speed', 'part_material'])
+
+    def test_top_k(self):
+        scores, _, _ = self.matcher.score(self.query)
+        excluded = {int(self.matrix.ids[np.argmax(scores)])}
+        results = self.matcher.top_k(self.query, k=5, min_similarity=40, exclude_ids=excluded, include_details=True)
+
+        expected = sorted(
+            (-round(score * 100, 2), int(case_id)) for case_id, score in zip(self.matrix.ids, scores)
+            if score * 100 >= 40 and case_id not in excluded
+        )[:5]
+        self.assertEqual([(-r['similarity'], r['case_id']) for r in results], expected)
+        self.assertEqual(set(results[0]['feature_scores']), {'rotation_speed', 'processing_time', 'part_material'})
+
+    def test_exact_case_scores_100(self):
+        features = {
+            name: float(value) for name, value in zip(NUMERIC_FEATURES, self.matrix.numeric[7]) if not np.isnan(value)
+        }
+        result = self.matcher.top_k(features, k=1)[0]
+        self.assertEqual((result['case_id'], result['similarity']), (8, 100))
+
+
+class BatchMatchTests(SimpleTestCase):
+    """批量匹配与逐个 top_k 的结果一致"""
+
+    def assertSameResults(self, first, second):
+        self.assertEqual([r['case_id'] for r in first], [r['case_id'] for r in second])
+        for a, b in zip(first, second):
+            self.assertAlmostEqual(a['similarity'], b['similarity'], places=2)
+            self.assertEqual(a['matched_features'], b['matched_features'])
+            self.assertEqual(a.get('feature_scores'), b.get('feature_scores'))
+
+    def test_matches_top_k(self):
+        matrix = random_matrix(300, seed=2)
+        matcher = CaseMatcher(matrix, scales={'rotation_speed': 250})
+        targets = [features for _, features in matrix.sample_queries(5)]
+        targets += [{'processing_time': 30}, {'part_material': 'part_material3', 'removal_amount': 10}]
+        options = {
+            'weights': {'rotation_speed': 2, 'grinding_media': 0},
+            'k': 5, 'min_similarity': 30, 'exclude_ids': {1, 2, 3}, 'include_details': True,
+        }
+
+        # 分块上限调小，使案例分多个分块处理并逐块合并 top-k
+        with mock.patch('process_cases.reasoning.engine.BATCH_CHUNK_ELEMENTS', 7 * 8 * 40):
+            batch = matcher.batch_top_k(targets, **options)
+        self.assertEqual(len(batch), len(targets))
+        for features, results in zip(targets, batch):
+            self.assertSameResults(results, matcher.top_k(features, **options))
+
+    def test_empty_targets(self):
+        self.assertEqual(CaseMatcher(random_matrix(10)).batch_top_k([]), [])
+
+    def test_iter_top_k(self):
+        matrix = random_matrix(250, seed=3)
+        matcher = CaseMatcher(matrix)
+        features = {'rotation_speed': 200, 'grinding_media': 'grinding_media0'}
+        steps = list(matcher.iter_top_k(features, k=5, min_similarity=20, chunk_size=100))
+        self.assertEqual([processed for processed, _ in steps], [100, 200, 250])
+        self.assertSameResults(steps[-1][1], matcher.top_k(features, k=5, min_similarity=20))
+
+
+class IVFIndexTests(SimpleTestCase):
+    """IVF 近似索引的划分与召回率"""
+
+    def setUp(self):
+        self.matrix = random_matrix(2000)
+        self.index = IVFIndex.build(self.matrix, n_lists=16)
+
+    def test_lists_partition_cases(self):
+        self.assertEqual(self.index.offsets[-1], len(self.matrix))
+        self.assertEqual(sorted(self.index.case_ids.tolist()), self.matrix.ids.tolist())
+        rows = self.index.candidate_rows(self.matrix, {'rotation_speed': 100}, nprobe=16)
+        self.assertEqual(rows.tolist(), list(range(len(self.matrix))))
+
+    def test_recall(self):
+        matcher = CaseMatcher(self.matrix)
+        recall = []
+        for case_id, features in self.matrix.sample_queries(30, seed=1):
+            exact = {result['case_id'] for result in matcher.top_k(features, k=10)}
+            rows = self.index.candidate_rows(self.matrix, features, nprobe=4)
+            self.assertLess(len(rows), len(self.matrix) / 2)
+            approx = {result['case_id'] for result in matcher.top_k(features, k=10, rows=rows)}
+            self.assertIn(case_id, approx)
+            recall.append(len(exact & approx) / 10)
+        self.assertGreaterEqual(np.mean(recall), 0.9)
+
+    def test_save_load_and_unindexed_cases(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ivf.npz')
+            self.index.save(path)
+            loaded = IVFIndex.load(path)
+        features = {'rotation_speed': 100, 'part_material': 'part_material2'}
+        np.testing.assert_array_equal(
+            loaded.candidate_rows(self.matrix, features), self.index.candidate_rows(self.matrix, features)
+        )
+
+        # 索引构建之后新增的案例总是作为候选
+        grown = random_matrix(2010)
+        self.assertTrue(set(range(2000, 2010)) <= set(self.index.candidate_rows(grown, features, nprobe=1).tolist()))
+
+
+class PartitionTests(SimpleTestCase):
+    """按分类特征倒排表裁剪候选集"""
+
+    def setUp(self):
+        self.matrix = random_matrix(500)
+        self.features = {
+            'rotation_speed': 100, 'part_material': 'part_material1', 'grinding_media': 'grinding_media2',
+        }
+
+    def test_intersection_of_partitions(self):
+        rows = partition_rows(self.matrix, self.features)
+        expected = np.flatnonzero((self.matrix.categorical[:, 0] == 1) & (self.matrix.categorical[:, 1] == 2))
+        self.assertEqual(sorted(rows.tolist()), expected.tolist())
+
+        # 权重为 0 的分类特征不参与裁剪
+        rows = partition_rows(self.matrix, self.features, {'grinding_media': 0})
+        self.assertEqual(sorted(rows.tolist()), np.flatnonzero(self.matrix.categorical[:, 0] == 1).tolist())
+
+    def test_fallback_to_full_scan(self):
+        self.assertIsNone(partition_rows(self.matrix, {'rotation_speed': 100}))
+        self.assertIsNone(partition_rows(self.matrix, self.features, min_candidates=len(self.matrix)))
+        self.assertEqual(len(partition_rows(self.matrix, {'part_material': 'unknown'})), 0)
+
+    def test_partitioned_results_match_full_scan(self):
+        matcher = CaseMatcher(self.matrix)
+        with self.settings(CASE_PARTITION_MIN_CANDIDATES=1):
+            rows, mode, partitioned = select_candidates(self.matrix, self.features, mode='exact', min_candidates=5)
+        self.assertEqual((mode, partitioned), ('exact', True))
+        # 分区内的案例在分类特征上全部匹配，排名最前的结果与全量扫描相同
+        self.assertEqual(matcher.top_k(self.features, k=5, rows=rows), matcher.top_k(self.features, k=5))
+
+
+class SQLCaseMatcherTests(FixtureMixin, TestCase):
+    """数据库端评分与向量化匹配的排名一致"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.sequence = 0
+        rng = np.random.default_rng(4)
+        for _ in range(40):
+            case = self.create_case()
+            case.rotation_speed = float(rng.uniform(50, 400))
+            case.processing_time = float(rng.uniform(5, 90))
+            case.vibration_frequency = None if rng.random() < 0.3 else float(rng.uniform(10, 60))
+            case.removal_amount = None if rng.random() < 0.3 else float(rng.uniform(1, 30))
+            case.part_material = ['45钢', '304不锈钢', 'H62黄铜'][rng.integers(3)]
+            case.grinding_media = ['陶瓷磨块', '树脂磨块'][rng.integers(2)]
+            case.save()
+        self.features = {
+            'rotation_speed': 180, 'processing_time': 40, 'vibration_frequency': 30, 'removal_amount': 12,
+            'part_material': '304不锈钢', 'grinding_media': '陶瓷磨块',
+        }
+
+    def assertSameRanking(self, **options):
+        scales = options.pop('scales', None)
+        matrix = CaseFeatureMatrix.from_queryset(ProcessCase.objects.all())
+        expected = CaseMatcher(matrix, scales).top_k(self.features, include_details=True, **options)
+        results = SQLCaseMatcher(ProcessCase.objects.all(), scales).top_k(
+            self.features, include_details=True, **options
+        )
+        self.assertTrue(expected)
+        self.assertEqual([r['case_id'] for r in results], [r['case_id'] for r in expected])
+        for result, other in zip(results, expected):
+            self.assertAlmostEqual(result['similarity'], other['similarity'], places=2)
+            self.assertEqual(result['matched_features'], other['matched_features'])
+            for name, value in other['feature_scores'].items():
+                self.assertAlmostEqual(result['feature_scores'][name], value, places=4)
+
+    def test_same_ranking(self):
+        self.assertSameRanking(k=10)
+
+    def test_same_ranking_with_weights_scales_and_filters(self):
+        excluded = ProcessCase.objects.order_by('pk').values_list('pk', flat=True)[:5]
+        self.assertSameRanking(
+            k=8, min_similarity=45, exclude_ids=list(excluded), scales={'rotation_speed': 300, 'removal_amount': 25},
+            weights={'rotation_speed': 3, 'processing_time': 0.5, 'grinding_media': 0},
+        )
+
+    def test_range_filters_keep_qualifying_cases(self):
+        matcher = SQLCaseMatcher(ProcessCase.objects.all())
+        annotated = matcher.annotate(self.features)
+        qualifying = set(annotated.filter(similarity__gte=0.6).values_list('pk', flat=True))
+        filtered = annotated.filter(matcher.range_filters(self.features, min_similarity=60))
+        self.assertTrue(qualifying)
+        self.assertTrue(qualifying <= set(filtered.values_list('pk', flat=True)))
+
+    def test_other_metrics(self):
+        for metric in ('euclidean', 'cosine'):
+            results = SQLCaseMatcher(ProcessCase.objects.all()).top_k(self.features, k=5, metric=metric)
+            similarities = [result['similarity'] for result in results]
+            self.assertEqual(len(results), 5)
+            self.assertEqual(similarities, sorted(similarities, reverse=True))
+            self.assertTrue(all(0 <= value <= 100 for value in similarities))
+
+
+class CaseMatchAPITests(FixtureMixin, APITestCase):
+    """/cases/match/ 接口"""
+
+    url = '/api/v1/process-cases/cases/match/'
+    batch_url = '/api/v1/process-cases/cases/match_batch/'
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        feature_store.invalidate()
+        self.cases = []
+        for speed in (150, 300, 160, 80):
+            case = self.create_case()
+            case.rotation_speed = speed
+            case.save()
+            self.cases.append(case)
+
+    def match(self, **params):
+        return self.client.post(self.url, {'features': {'rotation_speed': 150}, **params}, format='json')
+
+    def test_ranked_results_with_cases(self):
+        response = self.match(top_k=3, exclude_ids=[self.cases[3].pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['mode'], 'exact')
+        self.assertEqual(response.data['total_candidates'], 4)
+        results = response.data['results']
+        self.assertEqual([result['case_id'] for result in results], [self.cases[i].pk for i in (0, 2, 1)])
+        self.assertEqual(results[0]['similarity'], 100)
+        self.assertEqual(results[0]['case']['name'], self.cases[0].name)
+
+    def test_batch(self):
+        requirement = self.create_requirement()
+        response = self.client.post(self.batch_url, {
+            'targets': [{'rotation_speed': 300}],
+            'requirement_ids': [requirement.pk],
+            'top_k': 2,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        first, second = response.data['items']
+        self.assertEqual(first['results'][0]['case_id'], self.cases[1].pk)
+        self.assertEqual(first['results'][0]['case']['id'], self.cases[1].pk)
+        self.assertEqual((second['index'], second['requirement_id']), (1, requirement.pk))
+        self.assertEqual(second['features'], {'part_material': requirement.material})
+        self.assertEqual(len(second['results']), 2)
+
+        self.assertEqual(self.client.post(self.batch_url, {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(self.batch_url, {'requirement_ids': [0]}, format='json').status_code, 400)
+
+    def test_stream(self):
+        with self.settings(CASE_STREAM_CHUNK_SIZE=3):
+            response = self.client.post(
+                '/api/v1/process-cases/cases/match_stream/', {'features': {'rotation_speed': 150}, 'top_k': 2},
+                format='json',
+            )
+            content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        events = []
+        for block in content.strip().split('\n\n'):
+            event, data = block.split('\n')
+            events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+        self.assertEqual([event for event, _ in events], ['meta', 'progress', 'progress', 'result'])
+        self.assertEqual(events[0][1]['scored_candidates'], 4)
+        self.assertEqual([data['processed'] for _, data in events[1:3]], [3, 4])
+
+        results = events[-1][1]['results']
+        expected = self.match(top_k=2).data['results']
+        self.assertEqual([r['case_id'] for r in results], [r['case_id'] for r in expected])
+        self.assertEqual(results[0]['case']['id'], self.cases[0].pk)
+
+    def test_sql_engine(self):
+        response = self.match(top_k=3, exclude_ids=[self.cases[3].pk], engine='sql', metric='euclidean')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['mode'], 'sql')
+        self.assertEqual([r['case']['id'] for r in response.data['results']], [self.cases[i].pk for i in (0, 2, 1)])
+        self.assertEqual(self.match(metric='cosine').status_code, 400)
+
+    def test_invalid_features(self):
+        self.assertEqual(self.match(features={'unknown': 1}).status_code, 400)
+        self.assertEqual(self.match(features={'rotation_speed': 'fast'}).status_code, 400)
+        self.assertEqual(self.match(features={'rotation_speed': ''}).status_code, 400)
+        for value in ('nan', 'inf', '-inf', '1e999'):
+            self.assertEqual(self.match(features={'rotation_speed': value}).status_code, 400, value)
+        self.assertEqual(self.match(features={'part_material': ['45钢']}).status_code, 400)
+        self.assertEqual(self.match(features={'part_material': {'name': '45钢'}}).status_code, 400)
+
+        response = self.client.post(self.batch_url, {'targets': [{'rotation_speed': 'nan'}]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class AHPTests(SimpleTestCase):
+    """判断矩阵的权重与一致性检验"""
+
+    def test_consistent_matrix(self):
+        result = analyze_matrix([[1, 2, 4], [1 / 2, 1, 2], [1 / 4, 1 / 2, 1]])
+        for weight, expected in zip(result['weights'], (4 / 7, 2 / 7, 1 / 7)):
+            self.assertAlmostEqual(weight, expected, places=5)
+        self.assertAlmostEqual(result['lambda_max'], 3, places=5)
+        self.assertAlmostEqual(result['cr'], 0, places=5)
+        self.assertTrue(result['is_consistent'])
+
+    def test_inconsistent_matrix(self):
+        result = analyze_matrix([[1, 9, 1 / 9], [1 / 9, 1, 9], [9, 1 / 9, 1]])
+        self.assertGreater(result['cr'], 0.1)
+        self.assertFalse(result['is_consistent'])
+
+    def test_invalid_matrix(self):
+        with self.assertRaises(ValueError):
+            analyze_matrix([[1, 2], [2, 1]])
+
+    def test_weight_set_combines_levels(self):
+        result = compute_weight_set(
+            [
+                {'name': 'speed', 'features': ['rotation_speed', 'processing_time'], 'matrix': [[1, 3], [1 / 3, 1]]},
+                {'name': 'material', 'features': ['part_material'], 'matrix': [[1]]},
+            ],
+            [[1, 1], [1, 1]],
+        )
+        self.assertEqual(
+            result['feature_weights'], {'rotation_speed': 0.375, 'processing_time': 0.125, 'part_material': 0.5}
+        )
+
+
+class WeightSetTests(FixtureMixin, APITestCase):
+    """权重集的创建、引用与失效"""
+
+    url = '/api/v1/process-cases/weight-sets/'
+
+    payload = {
+        'name': '转速优先',
+        'groups': [{'name': 'speed', 'features': ['rotation_speed', 'processing_time'], 'matrix': [[1, 3], [1 / 3, 1]]}],
+    }
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        feature_store.invalidate()
+
+    def test_uncovered_features_ignored(self):
+        weight_set = self.client.post(self.url, self.payload, format='json').data
+        self.assertEqual(weight_set['feature_weights'], {'rotation_speed': 0.75, 'processing_time': 0.25})
+
+        same_material = self.create_case()
+        ProcessCase.objects.filter(pk=same_material.pk).update(part_material='304不锈钢', rotation_speed=400)
+        same_speed = self.create_case()
+        feature_store.invalidate()
+
+        response = self.client.post('/api/v1/process-cases/cases/match/', {
+            'features': {'rotation_speed': 150, 'processing_time': 30, 'part_material': '304不锈钢'},
+            'weight_set': weight_set['id'],
+            'include_details': True,
+        }, format='json')
+        results = response.data['results']
+        self.assertEqual([result['case_id'] for result in results], [same_speed.id, same_material.id])
+        self.assertEqual(results[0]['similarity'], 100)
+        self.assertNotIn('part_material', results[0]['feature_scores'])
+
+    def test_duplicate_conflicts(self):
+        created = self.client.post(self.url, self.payload, format='json')
+        self.assertEqual(created.status_code, 201)
+        response = self.client.post(self.url, {**self.payload, 'name': '另一个名称'}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['weight_set']['id'], created.data['id'])
+        self.assertEqual(WeightSet.objects.count(), 1)
+
+    def test_cache_follows_shared_version(self):
+        weight_set_id = self.client.post(self.url, self.payload, format='json').data['id']
+        self.assertIsNotNone(get_feature_weights(weight_set_id))
+
+        # 其他进程删除权重集：本进程的缓存只能通过共享版本号得知
+        WeightSet.objects.filter(pk=weight_set_id)._raw_delete(using='default')
+        self.assertIsNotNone(get_feature_weights(weight_set_id))
+        bump_version()
+        self.assertIsNone(get_feature_weights(weight_set_id))
+
+
+class CaseFeatureStoreTests(FixtureMixin, TestCase):
+    """特征存储的增量更新、写时复制与快照"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.sequence = 0
+        cache.clear()
+
+    def rows(self, matrix):
+        reverse = [{code: value for value, code in vocabulary.items()} for vocabulary in matrix.vocabularies]
+        return {
+            int(case_id): (np.nan_to_num(numeric, nan=-1).tolist(), [reverse[i][code] for i, code in enumerate(codes)])
+            for case_id, numeric, codes in zip(matrix.ids, matrix.numeric, matrix.categorical)
+        }
+
+    def test_incremental_updates_match_reload(self):
+        cases = [self.create_case() for _ in range(3)]
+        store = CaseFeatureStore()
+        store.get_matrix()
+        store.upsert(self.create_case())
+        before = store.get_matrix()
+        numeric = before.numeric.copy()
+
+        cases[0].rotation_speed = 999
+        cases[0].part_material = '钛合金'
+        cases[0].save()
+        store.upsert(cases[0])
+        removed = cases[1].pk
+        cases[1].delete()
+        store.remove(removed)
+
+        # 已交给请求的矩阵不受之后的增量更新影响
+        np.testing.assert_array_equal(before.numeric, numeric)
+        after = store.get_matrix()
+        self.assertEqual(self.rows(after), self.rows(CaseFeatureStore().get_matrix()))
+        titanium = after.vocabularies[0]['钛合金']
+        self.assertEqual(after.ids[after.postings[0][titanium]].tolist(), [cases[0].pk])
+
+    def test_snapshot_interval(self):
+        self.create_case()
+        with tempfile.TemporaryDirectory() as directory:
+            pointer = os.path.join(directory, CURRENT_POINTER)
+
+            def current():
+                with open(pointer, encoding='utf-8') as f:
+                    return int(f.read())
+
+            with self.settings(CASE_FEATURE_STORE_SNAPSHOT_SECONDS=3600):
+                store = CaseFeatureStore(directory)
+                store.get_matrix()
+                loaded = current()
+                store.upsert(self.create_case())
+                self.assertEqual(current(), loaded)
+
+                # 其他 worker 全量加载后写入快照
+                other = CaseFeatureStore(directory)
+                self.assertEqual(len(other.get_matrix()), 2)
+                self.assertEqual(current(), loaded + 1)
+
+            with self.settings(CASE_FEATURE_STORE_SNAPSHOT_SECONDS=0):
+                other.upsert(self.create_case())
+                self.assertEqual(current(), loaded + 2)
+                self.assertEqual(len(CaseFeatureStore(directory).get_matrix()), 3)
+
+
+class FeatureStatisticsTests(FixtureMixin, TestCase):
+    """信号增量维护的特征统计与全量重算一致"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.sequence = 0
+
+    def snapshot(self):
+        return {
+            stats.feature: (stats.count, stats.mean, stats.std, stats.min_value, stats.max_value, sorted(stats.reservoir))
+            for stats in FeatureStatistics.objects.filter(model_label='process_cases.processcase', count__gt=0)
+        }
+
+    def assertSnapshotEqual(self, first, second):
+        self.assertEqual(first.keys(), second.keys())
+        for feature, values in first.items():
+            for value, expected in zip(values, second[feature]):
+                if isinstance(value, float):
+                    self.assertAlmostEqual(value, expected, places=6, msg=feature)
+                else:
+                    self.assertEqual(value, expected, msg=feature)
+
+    def test_incremental_matches_rebuild(self):
+        cases = [self.create_case() for _ in range(5)]
+        for case, speed, frequency in zip(cases, (100, 250, 400, 175, 90), (None, 30, 45, None, 60)):
+            case.rotation_speed = speed
+            case.vibration_frequency = frequency
+            case.save()
+        # 删除最大值与最小值所在的案例，上下界需要重新取得
+        cases[2].delete()
+        cases[4].delete()
+        cases[1].rotation_speed = 260
+        cases[1].save(update_fields=['rotation_speed'])
+
+        incremental = self.snapshot()
+        self.assertEqual(incremental['rotation_speed'][:1] + incremental['rotation_speed'][3:5], (3, 100, 260))
+        rebuild_statistics(ProcessCase)
+        self.assertSnapshotEqual(incremental, self.snapshot())
+
+
+class GenerateCasesTests(TestCase):
+    """generate_cases 批量写入后刷新派生数据，bench_matching 输出各模式的报告"""
+
+    def setUp(self):
+        User.objects.create_user(username='tester', password='password')
+        cache.clear()
+        feature_store.invalidate()
+
+    def test_generate_and_bench(self):
+        call_command('generate_cases', count=300, processes=3, seed=1, username='tester', stdout=StringIO())
+        self.assertEqual(ProcessCase.objects.count(), 300)
+        self.assertEqual(PolishingProcess.objects.count(), 3)
+        self.assertTrue(ProcessUsageRecord.objects.exists())
+
+        # bulk_create 绕过信号，派生数据由命令重建
+        self.assertEqual(len(feature_store.get_matrix()), 300)
+        self.assertEqual(get_counters(ProcessCase)['total'], 300)
+        stats = FeatureStatistics.objects.get(model_label='process_cases.processcase', feature='rotation_speed')
+        self.assertEqual(stats.count, ProcessCase.objects.filter(rotation_speed__isnull=False).count())
+        materials = AutocompleteValue.objects.filter(model_label='process_cases.processcase', field='part_material')
+        self.assertEqual(sum(materials.values_list('count', flat=True)), 300)
+        self.assertEqual(SearchDocument.objects.filter(model_label='process_cases.processcase').count(), 300)
+        self.assertEqual(SearchDocument.objects.filter(model_label='polishing_processes.polishingprocess').count(), 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'bench.json')
+            call_command('bench_matching', sizes=[200, 1000], queries=10, output=output, stdout=StringIO())
+            with open(output, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual([item['mode'] for item in report['results']], ['exact', 'partitioned', 'ann'])
+        self.assertEqual(report['results'][0]['recall'], 1)
+        self.assertTrue(all(item['cases'] == 200 for item in report['results']))
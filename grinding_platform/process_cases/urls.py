@@ -7,6 +7,7 @@ router.register(r'cases', views.ProcessCaseViewSet)
 router.register(r'templates', views.ProcessTemplateViewSet)
 router.register(r'knowledge', views.ExpertKnowledgeViewSet)
 router.register(r'experiments', views.ExperimentDataViewSet)
+router.register(r'weight-sets', views.WeightSetViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,3 +1,7 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -5,22 +9,40 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+import json
+import time
 
-from .models import ProcessCase, ProcessTemplate, ExpertKnowledge, ExperimentData
+from grinding_platform.querysets import QuerysetOptimizationMixin
+from search.filters import FullTextSearchFilter
+from stats.buffers import get_buffered_counter
+from stats.counters import counter_statistics
+
+from .models import ProcessCase, ProcessTemplate, ExpertKnowledge, ExperimentData, WeightSet
+from .reasoning import CaseMatcher
+from .reasoning.search import select_candidates
+from .reasoning.statistics import feature_scales, get_statistics
+from .reasoning.sql import SQLCaseMatcher
+from .reasoning.store import feature_store
 from .serializers import (
+    CaseMatchSerializer,
+    CaseBatchMatchSerializer,
     ProcessCaseSerializer, 
     ProcessTemplateSerializer, 
     ExpertKnowledgeSerializer, 
-    ExperimentDataSerializer
+    ExperimentDataSerializer,
+    WeightSetSerializer,
 )
 
 
-class ProcessCaseViewSet(viewsets.ModelViewSet):
+knowledge_views = get_buffered_counter('process_cases.expertknowledge', 'view_count')
+
+
+class ProcessCaseViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """工艺实例视图集"""
     queryset = ProcessCase.objects.all()
     serializer_class = ProcessCaseSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'part_material', 'created_by']
     search_fields = ['name', 'description', 'part_material']
     ordering_fields = ['created_at', 'updated_at', 'name']
@@ -29,25 +51,202 @@ class ProcessCaseViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """获取工艺实例统计信息"""
-        total_cases = self.queryset.count()
-        active_cases = self.queryset.filter(status='active').count()
-        draft_cases = self.queryset.filter(status='draft').count()
-        archived_cases = self.queryset.filter(status='archived').count()
+        stats = counter_statistics(ProcessCase, conditions={
+            'active_cases': ('status', 'active'),
+            'draft_cases': ('status', 'draft'),
+            'archived_cases': ('status', 'archived'),
+        })
         
         return Response({
-            'total_cases': total_cases,
-            'active_cases': active_cases,
-            'draft_cases': draft_cases,
-            'archived_cases': archived_cases,
+            'total_cases': stats['total'],
+            'active_cases': stats['active_cases'],
+            'draft_cases': stats['draft_cases'],
+            'archived_cases': stats['archived_cases'],
         })
 
+    @action(detail=False, methods=['get'])
+    def feature_statistics(self, request):
+        """获取数值特征统计（计数、均值、标准差、上下界、分位数）"""
+        return Response(get_statistics())
+
+    @action(detail=False, methods=['post'])
+    def match(self, request):
+        """案例匹配：返回与目标特征最相似的 top-k 工艺实例"""
+        serializer = CaseMatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        if params['engine'] == 'sql':
+            return self._match_sql(params)
+
+        started = time.perf_counter()
+        matcher = CaseMatcher(feature_store.get_matrix(), scales=feature_scales())
+        rows, mode, partitioned = select_candidates(
+            matcher.matrix,
+            params['features'],
+            weights=params.get('weights'),
+            mode=params['mode'],
+            nprobe=params.get('nprobe'),
+            partition=params['partition'],
+            min_candidates=params['top_k'],
+        )
+        results = matcher.top_k(
+            params['features'],
+            weights=params.get('weights'),
+            k=params['top_k'],
+            min_similarity=params['min_similarity'],
+            exclude_ids=params.get('exclude_ids'),
+            include_details=params['include_details'],
+            rows=rows,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        cases = self.queryset.select_related('created_by').in_bulk([r['case_id'] for r in results])
+        for result in results:
+            case = cases.get(result['case_id'])
+            result['case'] = ProcessCaseSerializer(case).data if case else None
+
+        return Response({
+            'mode': mode,
+            'partitioned': partitioned,
+            'total_candidates': len(matcher.matrix),
+            'scored_candidates': len(matcher.matrix) if rows is None else len(rows),
+            'elapsed_ms': round(elapsed_ms, 2),
+            'results': results,
+        })
+
+    def _match_sql(self, params):
+        """在数据库中完成评分与排序，适合中等规模案例库或需要 euclidean/cosine 度量的场景"""
+        started = time.perf_counter()
+        results = SQLCaseMatcher(self.queryset.select_related('created_by'), scales=feature_scales()).top_k(
+            params['features'],
+            weights=params.get('weights'),
+            k=params['top_k'],
+            min_similarity=params['min_similarity'],
+            exclude_ids=params.get('exclude_ids'),
+            include_details=params['include_details'],
+            metric=params['metric'],
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        for result in results:
+            result['case'] = ProcessCaseSerializer(result['case']).data
+
+        return Response({
+            'mode': 'sql',
+            'metric': params['metric'],
+            'elapsed_ms': round(elapsed_ms, 2),
+            'results': results,
+        })
+
+    @action(detail=False, methods=['post'])
+    def match_stream(self, request):
+        """流式案例匹配（Server-Sent Events）：每完成一个分块推送当前 top-k，最后推送完整结果"""
+        serializer = CaseMatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        matcher = CaseMatcher(feature_store.get_matrix(), scales=feature_scales())
+        rows, mode, partitioned = select_candidates(
+            matcher.matrix,
+            params['features'],
+            weights=params.get('weights'),
+            mode=params['mode'],
+            nprobe=params.get('nprobe'),
+            partition=params['partition'],
+            min_candidates=params['top_k'],
+        )
+        scored_candidates = len(matcher.matrix) if rows is None else len(rows)
+
+        def events():
+            started = time.perf_counter()
+            yield self._sse_event('meta', {
+                'mode': mode,
+                'partitioned': partitioned,
+                'total_candidates': len(matcher.matrix),
+                'scored_candidates': scored_candidates,
+            })
+
+            results = []
+            for processed, results in matcher.iter_top_k(
+                params['features'],
+                weights=params.get('weights'),
+                k=params['top_k'],
+                min_similarity=params['min_similarity'],
+                exclude_ids=params.get('exclude_ids'),
+                include_details=params['include_details'],
+                rows=rows,
+                chunk_size=settings.CASE_STREAM_CHUNK_SIZE,
+            ):
+                yield self._sse_event('progress', {
+                    'processed': processed,
+                    'scored_candidates': scored_candidates,
+                    'results': results,
+                })
 
-class ProcessTemplateViewSet(viewsets.ModelViewSet):
+            cases = self.queryset.select_related('created_by').in_bulk([r['case_id'] for r in results])
+            for result in results:
+                case = cases.get(result['case_id'])
+                result['case'] = ProcessCaseSerializer(case).data if case else None
+            yield self._sse_event('result', {
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+                'results': results,
+            })
+
+        response = StreamingHttpResponse(events(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # 禁止 Nginx 缓冲，保证事件及时送达
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    def _sse_event(event, data):
+        return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)}\n\n'
+
+    @action(detail=False, methods=['post'])
+    def match_batch(self, request):
+        """批量案例匹配：一次请求为多个目标（如一批光整需求）分别返回 top-k 工艺实例"""
+        serializer = CaseBatchMatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        targets = params['targets']
+
+        started = time.perf_counter()
+        matcher = CaseMatcher(feature_store.get_matrix(), scales=feature_scales())
+        batch_results = matcher.batch_top_k(
+            [target['features'] for target in targets],
+            weights=params.get('weights'),
+            k=params['top_k'],
+            min_similarity=params['min_similarity'],
+            exclude_ids=params.get('exclude_ids'),
+            include_details=params['include_details'],
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        case_ids = {result['case_id'] for results in batch_results for result in results}
+        cases = self.queryset.select_related('created_by').in_bulk(case_ids)
+        case_data = {pk: ProcessCaseSerializer(case).data for pk, case in cases.items()}
+
+        items = []
+        for index, (target, results) in enumerate(zip(targets, batch_results)):
+            for result in results:
+                result['case'] = case_data.get(result['case_id'])
+            items.append({'index': index, **target, 'results': results})
+
+        return Response({
+            'total_candidates': len(matcher.matrix),
+            'target_count': len(targets),
+            'elapsed_ms': round(elapsed_ms, 2),
+            'items': items,
+        })
+
+
+class ProcessTemplateViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """工序模板视图集"""
     queryset = ProcessTemplate.objects.all()
     serializer_class = ProcessTemplateSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['template_type', 'is_active', 'created_by']
     search_fields = ['name', 'description', 'applicable_materials']
     ordering_fields = ['created_at', 'updated_at', 'name']
@@ -58,46 +257,52 @@ class ProcessTemplateViewSet(viewsets.ModelViewSet):
         """按类型获取模板"""
         template_type = request.query_params.get('type')
         if template_type:
-            templates = self.queryset.filter(template_type=template_type, is_active=True)
+            templates = self.get_queryset().filter(template_type=template_type, is_active=True)
             serializer = self.get_serializer(templates, many=True)
             return Response(serializer.data)
         
         return Response({'error': '请提供template_type参数'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ExpertKnowledgeViewSet(viewsets.ModelViewSet):
+class ExpertKnowledgeViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """专家知识库视图集"""
     queryset = ExpertKnowledge.objects.all()
     serializer_class = ExpertKnowledgeSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['knowledge_type', 'is_published', 'expert_name']
     search_fields = ['title', 'content', 'keywords', 'expert_name']
     ordering_fields = ['created_at', 'updated_at', 'view_count']
     ordering = ['-view_count', '-created_at']
     
     def retrieve(self, request, *args, **kwargs):
-        """获取知识详情，增加查看次数"""
+        """获取知识详情，增加查看次数（缓冲后批量写回）"""
         instance = self.get_object()
-        instance.view_count += 1
-        instance.save()
+        instance.view_count += knowledge_views.incr(instance.pk)
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def popular(self, request):
-        """获取热门知识"""
-        popular_knowledge = self.queryset.filter(is_published=True).order_by('-view_count')[:10]
+        """获取热门知识（按含未写回增量的查看次数排序）"""
+        queryset = self.get_queryset().filter(is_published=True)
+        ranked = knowledge_views.top(queryset, 10)
+        knowledge = queryset.in_bulk([pk for pk, _ in ranked])
+        popular_knowledge = []
+        for pk, view_count in ranked:
+            if pk in knowledge:
+                knowledge[pk].view_count = view_count
+                popular_knowledge.append(knowledge[pk])
         serializer = self.get_serializer(popular_knowledge, many=True)
         return Response(serializer.data)
 
 
-class ExperimentDataViewSet(viewsets.ModelViewSet):
+class ExperimentDataViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """试验数据视图集"""
     queryset = ExperimentData.objects.all()
     serializer_class = ExperimentDataSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'test_material', 'experimenter']
     search_fields = ['experiment_name', 'experiment_purpose', 'test_material']
     ordering_fields = ['created_at', 'updated_at', 'start_date', 'end_date']
@@ -124,3 +329,49 @@ class ExperimentDataViewSet(viewsets.ModelViewSet):
             return Response({'message': '试验已完成'})
         
         return Response({'error': '只有进行中的试验才能完成'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class WeightSetViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
+    """特征权重集视图集（权重集不可修改，只支持创建、查询和删除）"""
+    queryset = WeightSet.objects.all()
+    serializer_class = WeightSetSerializer
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'post', 'delete']
+    filter_backends = [SearchFilter, OrderingFilter]
+    search_fields = ['name', 'description']
+    ordering_fields = ['created_at', 'consistency_ratio']
+    ordering = ['-created_at']
+    
+    def create(self, request, *args, **kwargs):
+        """相同判断矩阵只保存一份，重复提交返回 409 及已有的权重集"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        content_hash = serializer.validated_data['content_hash']
+        existing = WeightSet.objects.filter(content_hash=content_hash).first()
+        if existing is None:
+            try:
+                with transaction.atomic():
+                    self.perform_create(serializer)
+            except IntegrityError:
+                existing = WeightSet.objects.filter(content_hash=content_hash).first()
+            else:
+                headers = self.get_success_headers(serializer.data)
+                return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        return Response({
+            'error': f'相同判断矩阵的权重集已存在: {existing.name}',
+            'weight_set': self.get_serializer(existing).data,
+        }, status=status.HTTP_409_CONFLICT)
+    
+    @action(detail=False, methods=['post'])
+    def calculate(self, request):
+        """只计算权重与一致性检验，不保存"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        return Response({
+            **data['result'],
+            'feature_weights': data['feature_weights'],
+            'consistency_ratio': data['consistency_ratio'],
+            'is_consistent': data['is_consistent'],
+            'content_hash': data['content_hash'],
+        })
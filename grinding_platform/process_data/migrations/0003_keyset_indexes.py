@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('process_data', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processhistory',
+            index=models.Index(fields=['process_data', 'timestamp', 'id'], name='process_dat_process_792373_idx'),
+        ),
+    ]
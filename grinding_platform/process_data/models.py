@@ -60,3 +60,6 @@ class ProcessHistory(models.Model):
         verbose_name = '工艺历史'
         verbose_name_plural = '工艺历史'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['process_data', 'timestamp', 'id']),
+        ]
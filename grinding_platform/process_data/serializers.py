@@ -1,13 +1,14 @@
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import ProcessData, ProcessCategory, ProcessHistory
 
-class ProcessCategorySerializer(serializers.ModelSerializer):
+class ProcessCategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """工艺类别序列化器"""
     class Meta:
         model = ProcessCategory
         fields = '__all__'
 
-class ProcessDataSerializer(serializers.ModelSerializer):
+class ProcessDataSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """工艺数据序列化器"""
     category_name = serializers.CharField(source='category.name', read_only=True)
     created_by_name = serializers.CharField(source='created_by.username', read_only=True)
@@ -21,8 +22,9 @@ class ProcessDataSerializer(serializers.ModelSerializer):
             'created_by_name', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+        expandable_fields = {'category': ProcessCategorySerializer}
 
-class ProcessHistorySerializer(serializers.ModelSerializer):
+class ProcessHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """工艺历史序列化器"""
     user_name = serializers.CharField(source='user.username', read_only=True)
 
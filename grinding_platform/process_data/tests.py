@@ -1,3 +1,27 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from .models import ProcessCategory, ProcessData, ProcessHistory
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """工艺数据（含展开的类别）与历史记录列表的查询数不随行数增长"""
+
+    def create_process_data(self):
+        i = self.next_id()
+        return ProcessData.objects.create(
+            name=f'工艺{i}', category=ProcessCategory.objects.create(name=f'类别{i}'), description='-',
+            created_by=self.user,
+        )
+
+    def test_process_data(self):
+        self.assertConstantQueries('/api/v1/process-data/?expand=category', self.create_process_data)
+
+    def test_history(self):
+        process_data = self.create_process_data()
+
+        def create_history():
+            ProcessHistory.objects.create(process_data=process_data, action='update', user=self.user)
+
+        self.assertConstantQueries(f'/api/v1/process-data/{process_data.pk}/history/', create_history)
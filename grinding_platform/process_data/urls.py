@@ -10,4 +10,5 @@ urlpatterns = [
     path('<int:pk>/', views.ProcessDataDetailView.as_view(), name='detail'),
     path('<int:pk>/update/', views.ProcessDataUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.ProcessDataDeleteView.as_view(), name='delete'),
+    path('<int:pk>/history/', views.ProcessHistoryListView.as_view(), name='history'),
 ] 
\ No newline at end of file
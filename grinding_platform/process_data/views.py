@@ -1,12 +1,14 @@
 from django.shortcuts import render
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from .models import ProcessData
-from .serializers import ProcessDataSerializer
+from grinding_platform.pagination import KeysetPagination
+from grinding_platform.querysets import QuerysetOptimizationMixin
+from .models import ProcessData, ProcessHistory
+from .serializers import ProcessDataSerializer, ProcessHistorySerializer
 
 # Create your views here.
 
-class ProcessDataListView(generics.ListAPIView):
+class ProcessDataListView(QuerysetOptimizationMixin, generics.ListAPIView):
     """工艺数据列表"""
     queryset = ProcessData.objects.all()
     serializer_class = ProcessDataSerializer
@@ -21,7 +23,7 @@ class ProcessDataCreateView(generics.CreateAPIView):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class ProcessDataDetailView(generics.RetrieveAPIView):
+class ProcessDataDetailView(QuerysetOptimizationMixin, generics.RetrieveAPIView):
     """工艺数据详情"""
     queryset = ProcessData.objects.all()
     serializer_class = ProcessDataSerializer
@@ -38,3 +40,14 @@ class ProcessDataDeleteView(generics.DestroyAPIView):
     queryset = ProcessData.objects.all()
     serializer_class = ProcessDataSerializer
     permission_classes = [IsAuthenticated]
+
+class ProcessHistoryListView(QuerysetOptimizationMixin, generics.ListAPIView):
+    """工艺数据历史记录（游标分页）"""
+    queryset = ProcessHistory.objects.all()
+    serializer_class = ProcessHistorySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-timestamp', '-id')
+
+    def get_queryset(self):
+        return super().get_queryset().filter(process_data_id=self.kwargs['pk'])
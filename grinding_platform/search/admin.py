@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import AutocompleteValue, SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['model_label', 'object_id', 'title', 'updated_at']
+    list_filter = ['model_label']
+    search_fields = ['title']
+    readonly_fields = ['model_label', 'object_id', 'title', 'content', 'updated_at']
+
+
+@admin.register(AutocompleteValue)
+class AutocompleteValueAdmin(admin.ModelAdmin):
+    list_display = ['model_label', 'field', 'value', 'count', 'updated_at']
+    list_filter = ['model_label', 'field']
+    search_fields = ['value']
+    readonly_fields = ['model_label', 'field', 'value', 'count', 'updated_at']
@@ -0,0 +1,247 @@
+"""
+取值提示（自动补全）
+
+每个提示字段对应一个或多个 (模型, 字段) 来源，取值及其出现次数保存在 AutocompleteValue 表中，
+由信号原子维护，查询时不扫描业务表。
+进程内按小写取值排序成有序数组，前缀查询用二分定位区间，再按次数取前 N 个。
+每隔 AUTOCOMPLETE_REFRESH_SECONDS 按 updated_at 增量读取变化的计数器，
+每隔 AUTOCOMPLETE_RELOAD_SECONDS 全量重新加载（清除重建取值后已消失的取值）。
+"""
+
+import bisect
+import heapq
+import threading
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import AutocompleteValue
+
+
+# 提示字段：{字段名: [(模型, 字段), ...]}
+AUTOCOMPLETE_FIELDS = {
+    'material': [
+        ('process_cases.processcase', 'part_material'),
+        ('polishing_requirements.polishingrequirement', 'material'),
+    ],
+    'abrasive_type': [('polishing_processes.polishingprocess', 'abrasive_type')],
+    'block_type': [('grinding_blocks.grindingblock', 'block_type')],
+    'block_factory': [('grinding_blocks.grindingblock', 'block_factory')],
+    'manufacturer': [
+        ('equipment.equipment', 'manufacturer'),
+        ('equipment.chemical', 'manufacturer'),
+    ],
+    'chemical': [('equipment.chemical', 'name')],
+}
+
+# 增量读取时向前多读的时间，覆盖各进程之间的时钟误差与未提交的事务
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+# 总数行的字段名
+TOTAL = ''
+
+
+def source_fields():
+    """各来源模型需要计数的字段：{模型: (字段, ...)}"""
+    fields = {}
+    for sources in AUTOCOMPLETE_FIELDS.values():
+        for label, field in sources:
+            fields.setdefault(label, [])
+            if field not in fields[label]:
+                fields[label].append(field)
+    return {label: tuple(names) for label, names in fields.items()}
+
+
+SOURCE_FIELDS = source_fields()
+
+
+def field_values(instance):
+    """实例上需要计数的非空取值：{字段: 取值}"""
+    values = {}
+    for field in SOURCE_FIELDS[instance._meta.label_lower]:
+        value = getattr(instance, field)
+        if value:
+            values[field] = str(value)
+    return values
+
+
+def _add(label, field, value, delta):
+    """原子地调整取值的次数，行不存在时创建"""
+    rows = AutocompleteValue.objects.filter(model_label=label, field=field, value=value)
+    # update() 不会触发 auto_now，显式更新修改时间供增量读取
+    if rows.update(count=F('count') + delta, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            AutocompleteValue.objects.create(model_label=label, field=field, value=value, count=delta)
+    except IntegrityError:
+        # 并发创建时由另一事务先插入，改为更新
+        rows.update(count=F('count') + delta, updated_at=timezone.now())
+
+
+def _add_total(label, delta):
+    """调整总数；返回 False 表示该模型的取值尚未构建，等待首次加载时全量构建"""
+    rows = AutocompleteValue.objects.filter(model_label=label, field=TOTAL, value='')
+    return bool(rows.update(count=F('count') + delta, updated_at=timezone.now()))
+
+
+def record_created(instance):
+    label = instance._meta.label_lower
+    if not _add_total(label, 1):
+        return
+    for field, value in field_values(instance).items():
+        _add(label, field, value, 1)
+
+
+def record_deleted(instance):
+    label = instance._meta.label_lower
+    if not _add_total(label, -1):
+        return
+    for field, value in field_values(instance).items():
+        _add(label, field, value, -1)
+
+
+def record_changed(instance, previous):
+    """取值变化时从旧取值移到新取值"""
+    label = instance._meta.label_lower
+    current = field_values(instance)
+    changed = [
+        field for field in SOURCE_FIELDS[label]
+        if (previous.get(field) or '') != current.get(field, '')
+    ]
+    if not changed:
+        return
+    if not AutocompleteValue.objects.filter(model_label=label, field=TOTAL).exists():
+        return
+    for field in changed:
+        if previous.get(field):
+            _add(label, field, str(previous[field]), -1)
+        if current.get(field):
+            _add(label, field, current[field], 1)
+
+
+def rebuild_values(model):
+    """按当前数据全量重建某个模型的取值计数"""
+    label = model._meta.label_lower
+    with transaction.atomic():
+        AutocompleteValue.objects.filter(model_label=label).delete()
+        rows = [AutocompleteValue(model_label=label, field=TOTAL, value='', count=model.objects.count())]
+        for field in SOURCE_FIELDS[label]:
+            groups = model.objects.order_by().exclude(**{field: ''}).filter(**{f'{field}__isnull': False})
+            rows.extend(
+                AutocompleteValue(model_label=label, field=field, value=str(group[field]), count=group['total'])
+                for group in groups.values(field).annotate(total=Count('pk'))
+            )
+        AutocompleteValue.objects.bulk_create(rows)
+
+
+class ValueDictionary:
+    """按小写取值排序的 (取值, 次数) 有序数组"""
+
+    def __init__(self, counts):
+        items = sorted((value.casefold(), value, count) for value, count in counts.items() if value and count > 0)
+        self.keys = [key for key, _, _ in items]
+        self.values = [value for _, value, _ in items]
+        self.counts = [count for _, _, count in items]
+
+    def suggest(self, prefix, limit):
+        """返回以 prefix 开头（不区分大小写）的取值中次数最多的 limit 个 [(取值, 次数)]"""
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + '\U0010ffff', lo=start)
+        top = heapq.nsmallest(limit, range(start, end), key=lambda i: (-self.counts[i], self.keys[i]))
+        return [(self.values[i], self.counts[i]) for i in top]
+
+
+class AutocompleteService:
+    """进程内的取值字典"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._sources = {source for sources in fields.values() for source in sources}
+        self._lock = threading.RLock()
+        self._counts = {}
+        self._dictionaries = {}
+        self._watermark = None
+        self._loaded_at = None
+        self._refreshed_at = None
+
+    def suggest(self, field, prefix='', limit=10):
+        with self._lock:
+            self._ensure_current()
+            dictionary = self._dictionaries.get(field)
+            if dictionary is None:
+                dictionary = self._build(field)
+            return dictionary.suggest(prefix, limit)
+
+    def invalidate(self):
+        """下次查询时全量重新加载"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= settings.AUTOCOMPLETE_RELOAD_SECONDS:
+            self._load()
+            self._loaded_at = self._refreshed_at = now
+        elif now - self._refreshed_at >= settings.AUTOCOMPLETE_REFRESH_SECONDS:
+            self._refresh()
+            self._refreshed_at = now
+
+    def _rows(self):
+        condition = Q()
+        for label, field in self._sources:
+            condition |= Q(model_label=label, field=field)
+        return AutocompleteValue.objects.filter(condition)
+
+    def _load(self):
+        # 取值尚未构建的模型先全量构建
+        labels = {label for label, _ in self._sources}
+        initialized = set(
+            AutocompleteValue.objects.filter(model_label__in=labels, field=TOTAL).values_list('model_label', flat=True)
+        )
+        for label in labels - initialized:
+            rebuild_values(apps.get_model(label))
+
+        self._counts = {source: {} for source in self._sources}
+        self._dictionaries = {}
+        self._watermark = None
+        self._apply(self._rows())
+
+    def _refresh(self):
+        rows = self._rows()
+        if self._watermark is not None:
+            rows = rows.filter(updated_at__gte=self._watermark - REFRESH_OVERLAP)
+        changed = self._apply(rows)
+        for field, sources in self.fields.items():
+            if changed.intersection(sources):
+                self._dictionaries.pop(field, None)
+
+    def _apply(self, rows):
+        """写入取值次数的当前值（绝对值，重复读取同一行不影响结果），返回有变化的来源"""
+        changed = set()
+        fields = ('model_label', 'field', 'value', 'count', 'updated_at')
+        for label, field, value, count, updated_at in rows.values_list(*fields):
+            counts = self._counts[(label, field)]
+            if counts.get(value) != count:
+                counts[value] = count
+                changed.add((label, field))
+            if self._watermark is None or updated_at > self._watermark:
+                self._watermark = updated_at
+        return changed
+
+    def _build(self, field):
+        merged = {}
+        for source in self.fields[field]:
+            for value, count in self._counts[source].items():
+                merged[value] = merged.get(value, 0) + count
+        dictionary = self._dictionaries[field] = ValueDictionary(merged)
+        return dictionary
+
+
+autocomplete = AutocompleteService(AUTOCOMPLETE_FIELDS)
@@ -0,0 +1,134 @@
+"""
+全文检索后端
+
+MySQLBackend   search_documents(title, content) 上的 ngram FULLTEXT 索引，MATCH ... AGAINST 布尔模式查询
+SQLiteBackend  FTS5 虚拟表 search_documents_fts（rowid 为文档主键），写入按字切分后的文本，bm25 排序
+其它数据库或索引不存在时 search() 返回 None，由调用方退回 LIKE 查询。
+"""
+
+import re
+
+from django.db import connection
+
+from .text import tokenize
+
+
+FTS_TABLE = 'search_documents_fts'
+
+# MySQL 布尔模式中的运算符
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+
+class SearchBackend:
+    """不支持全文检索的数据库"""
+
+    def index(self, documents):
+        pass
+
+    def remove(self, document_ids):
+        pass
+
+    def search(self, model_label, query, limit):
+        return None
+
+
+class MySQLBackend(SearchBackend):
+    """FULLTEXT 索引由 InnoDB 随 search_documents 表自动维护"""
+
+    def build_query(self, query):
+        terms = []
+        for term in BOOLEAN_OPERATORS.sub(' ', query).split():
+            # 短于 ngram_token_size 的单字只能用前缀匹配
+            if len(term) == 1:
+                terms.append(f'+{term}*')
+            else:
+                terms.append(f'+"{term}"')
+        return ' '.join(terms)
+
+    def search(self, model_label, query, limit):
+        query = self.build_query(query)
+        if not query:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT object_id, MATCH(title, content) AGAINST (%s IN BOOLEAN MODE) AS score '
+                'FROM search_documents '
+                'WHERE model_label = %s AND MATCH(title, content) AGAINST (%s IN BOOLEAN MODE) '
+                'ORDER BY score DESC LIMIT %s',
+                [query, model_label, query, limit],
+            )
+            return [(object_id, float(score)) for object_id, score in cursor.fetchall()]
+
+
+class SQLiteBackend(SearchBackend):
+    """FTS5 的 unicode61 分词器不会切分中文，写入前先按字切分并以空格连接"""
+
+    def __init__(self):
+        self._available = False
+
+    def available(self):
+        if not self._available:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                self._available = cursor.fetchone() is not None
+        return self._available
+
+    def index(self, documents):
+        if not self.available():
+            return
+        rows = [(doc.pk, ' '.join(tokenize(doc.title)), ' '.join(tokenize(doc.content))) for doc in documents]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (%s, %s, %s)', rows)
+
+    def remove(self, document_ids):
+        if not document_ids or not self.available():
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in document_ids])
+
+    def build_query(self, query):
+        """每个检索词组成一个二元组短语（即子串匹配），多个检索词之间为 AND"""
+        phrases = []
+        for term in query.split():
+            tokens = tokenize(term)
+            if not tokens:
+                continue
+            phrase = '"' + ' '.join(tokens) + '"'
+            # 单字只能按前缀匹配以它开头的二元组
+            if len(tokens) == 1 and len(tokens[0]) == 1:
+                phrase += '*'
+            phrases.append(phrase)
+        return ' '.join(phrases)
+
+    def search(self, model_label, query, limit):
+        query = self.build_query(query)
+        if not query or not self.available():
+            return None
+        with connection.cursor() as cursor:
+            # bm25 越小越相关，标题列权重加倍
+            cursor.execute(
+                f'SELECT d.object_id, bm25({FTS_TABLE}, 2.0, 1.0) AS rank '
+                f'FROM {FTS_TABLE} JOIN search_documents d ON d.id = {FTS_TABLE}.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s AND d.model_label = %s '
+                f'ORDER BY rank LIMIT %s',
+                [query, model_label, limit],
+            )
+            return [(object_id, -rank) for object_id, rank in cursor.fetchall()]
+
+
+BACKENDS = {
+    'mysql': MySQLBackend,
+    'sqlite': SQLiteBackend,
+}
+
+_backends = {}
+
+
+def get_backend():
+    vendor = connection.vendor
+    if vendor not in _backends:
+        _backends[vendor] = BACKENDS.get(vendor, SearchBackend)()
+    return _backends[vendor]
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from .index import search_objects
+from .models import SearchDocument
+
+
+class FullTextSearchFilter(SearchFilter):
+    """使用全文检索索引的 ?search= 过滤，结果按相关度排序
+
+    模型需登记在 search.index.SEARCH_SOURCES 中；未登记、数据库不支持或该模型尚无检索文档
+    （尚未执行 manage.py rebuild_search_index）时退回 SearchFilter 按 search_fields 的 LIKE 查询。
+    应放在 OrderingFilter 之后，未显式指定 ?ordering= 时以相关度覆盖默认排序。
+    只返回相关度最高的 SEARCH_MAX_RESULTS 个对象，超出时分页响应中带 search_truncated: true。
+    """
+    search_description = f'检索关键词（全文检索，按相关度最多返回 {settings.SEARCH_MAX_RESULTS} 条）'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        limit = settings.SEARCH_MAX_RESULTS
+        ranked = search_objects(queryset.model, ' '.join(terms), limit=limit + 1)
+        if ranked is None:
+            return super().filter_queryset(request, queryset, view)
+        if not ranked:
+            if not SearchDocument.objects.filter(model_label=queryset.model._meta.label_lower).exists():
+                return super().filter_queryset(request, queryset, view)
+            return queryset.none()
+        if len(ranked) > limit:
+            ranked = ranked[:limit]
+            request.search_truncated = True
+
+        ids = [object_id for object_id, _ in ranked]
+        queryset = queryset.filter(pk__in=ids)
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            relevance = Case(
+                *(When(pk=object_id, then=Value(position)) for position, object_id in enumerate(ids)),
+                output_field=IntegerField(),
+            )
+            queryset = queryset.order_by(relevance)
+        return queryset
@@ -0,0 +1,102 @@
+"""
+全文检索索引
+
+SEARCH_SOURCES 登记被检索的模型：{模型: (标题字段, (内容字段, ...))}。
+对象保存/删除后由信号同步到 SearchDocument、数据库相应的全文索引及全局检索的内存倒排索引，
+历史数据通过 manage.py rebuild_search_index 建立。
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+from .backends import get_backend
+from .memory import search_index
+from .models import SearchDocument
+from .text import field_text
+
+
+SEARCH_SOURCES = {
+    'process_cases.processcase': ('name', ('description', 'part_material')),
+    'process_cases.processtemplate': ('name', ('description', 'applicable_materials')),
+    'process_cases.expertknowledge': ('title', ('keywords', 'content', 'expert_name')),
+    'process_cases.experimentdata': ('experiment_name', ('experiment_purpose', 'test_material')),
+    'polishing_processes.polishingprocess': ('process_name', ('abrasive_type', 'description')),
+    'polishing_requirements.polishingrequirement': (
+        'title', ('part_name', 'part_number', 'material', 'description'),
+    ),
+    'grinding_blocks.grindingblock': ('block_name', ('block_no', 'block_type', 'block_brand', 'block_factory')),
+    'base_info.standard': ('title', ('standard_code', 'keywords', 'publisher')),
+    'equipment.chemical': ('name', ('code', 'manufacturer', 'components')),
+}
+
+
+def source_fields(model_label):
+    title_field, content_fields = SEARCH_SOURCES[model_label]
+    return (title_field,) + content_fields
+
+
+def document_text(instance):
+    """返回对象的 (标题, 内容) 文本"""
+    title_field, content_fields = SEARCH_SOURCES[instance._meta.label_lower]
+    title = field_text(getattr(instance, title_field))
+    content = '\n'.join(filter(None, (field_text(getattr(instance, name)) for name in content_fields)))
+    return title[:500], content
+
+
+def index_object(instance):
+    """新建或更新对象的检索文档"""
+    title, content = document_text(instance)
+    document, _ = SearchDocument.objects.update_or_create(
+        model_label=instance._meta.label_lower,
+        object_id=instance.pk,
+        defaults={'title': title, 'content': content},
+    )
+    get_backend().index([document])
+    search_index.upsert(document)
+
+
+def remove_object(model_label, object_id):
+    documents = SearchDocument.objects.filter(model_label=model_label, object_id=object_id)
+    get_backend().remove(list(documents.values_list('pk', flat=True)))
+    documents.delete()
+    search_index.remove(model_label, object_id)
+
+
+def rebuild_index(labels=None, batch_size=1000):
+    """按 SEARCH_SOURCES 重建检索文档，返回 {模型: 文档数}"""
+    backend = get_backend()
+    counts = {}
+    for label in labels or SEARCH_SOURCES:
+        model = apps.get_model(label)
+        with transaction.atomic():
+            documents = SearchDocument.objects.filter(model_label=label)
+            backend.remove(list(documents.values_list('pk', flat=True)))
+            documents.delete()
+
+            batch = []
+            for instance in model.objects.only(*source_fields(label)).order_by('pk').iterator(chunk_size=batch_size):
+                title, content = document_text(instance)
+                batch.append(SearchDocument(model_label=label, object_id=instance.pk, title=title, content=content))
+                if len(batch) >= batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    batch = []
+            SearchDocument.objects.bulk_create(batch)
+
+            # bulk_create 在部分数据库上不回填主键，重新读取后写入全文索引
+            documents = SearchDocument.objects.filter(model_label=label).order_by('pk')
+            backend.index(documents.iterator(chunk_size=batch_size))
+            counts[label] = documents.count()
+    search_index.invalidate()
+    return counts
+
+
+def search_objects(model, query, limit=None):
+    """在模型的检索文档中查询，返回按相关度降序的 [(对象ID, 得分)]
+
+    模型未登记或当前数据库不支持全文检索时返回 None，由调用方退回 LIKE 查询。
+    """
+    if model._meta.label_lower not in SEARCH_SOURCES:
+        return None
+    limit = limit or settings.SEARCH_MAX_RESULTS
+    return get_backend().search(model._meta.label_lower, query, limit)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import SEARCH_SOURCES, rebuild_index
+
+
+class Command(BaseCommand):
+    help = '按登记的检索模型重建全文检索文档与索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='只重建指定模型，如 process_cases.expertknowledge')
+        parser.add_argument('--batch-size', type=int, default=1000, help='每批写入的文档数')
+
+    def handle(self, *args, **options):
+        labels = [label.lower() for label in options['models']]
+        unknown = [label for label in labels if label not in SEARCH_SOURCES]
+        if unknown:
+            raise CommandError(f'未登记的检索模型: {", ".join(unknown)}')
+
+        counts = rebuild_index(labels or None, batch_size=options['batch_size'])
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS('检索索引重建完成'))
@@ -0,0 +1,244 @@
+"""
+全局检索的进程内倒排索引
+
+从 SearchDocument 表（检索文档快照）一次性加载，按 search.text.tokenize 的字二元组建立
+词元 -> 文档的倒排表；对象增删改后由 search.index 增量更新。
+共享版本号保存在缓存中，每次写入递增版本号，并把这次的变更（增量）按版本号写入缓存：
+其他进程检索前按版本号取回落后的增量依次应用，不必重新加载整张表。
+增量缺失（已过期或被淘汰）、落后太多或调用了 invalidate() 时才需要全量重新加载，
+全量加载在锁外进行，且每个进程至多每 SEARCH_INDEX_RELOAD_SECONDS 秒一次，期间沿用旧副本。
+"""
+
+import heapq
+import math
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from .models import SearchDocument
+from .text import tokenize
+
+
+# 全局检索的分组：{分组名: 模型}，模型需登记在 search.index.SEARCH_SOURCES 中
+SEARCH_GROUPS = {
+    'cases': 'process_cases.processcase',
+    'processes': 'polishing_processes.polishingprocess',
+    'blocks': 'grinding_blocks.grindingblock',
+    'chemicals': 'equipment.chemical',
+    'standards': 'base_info.standard',
+    'knowledge': 'process_cases.expertknowledge',
+}
+
+VERSION_CACHE_KEY = 'search:memory_index:version'
+DELTA_CACHE_KEY = 'search:memory_index:delta:{version}'
+
+# 增量在缓存中保留的时间（秒），以及检索前最多追赶的增量数，超出时全量重新加载
+DELTA_TIMEOUT = 24 * 3600
+MAX_PENDING_DELTAS = 1000
+
+# 标题中出现的词元按内容的倍数计分
+TITLE_WEIGHT = 2.0
+
+# 词频饱和参数（同 BM25 的 k1）
+TF_SATURATION = 1.2
+
+
+def current_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def bump_version():
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    try:
+        return cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+        return 1
+
+
+def publish_delta(delta):
+    """递增共享版本号并登记该版本的增量，返回新版本号"""
+    version = bump_version()
+    cache.set(DELTA_CACHE_KEY.format(version=version), delta, timeout=DELTA_TIMEOUT)
+    return version
+
+
+class InvertedIndex:
+    """词元 -> {(模型, 对象ID): 加权词频} 的倒排索引"""
+
+    def __init__(self, model_labels):
+        self.model_labels = frozenset(model_labels)
+        self.version = None
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        self._postings = None
+        self._documents = {}
+        self._loaded_at = None
+
+    @property
+    def loaded(self):
+        return self._postings is not None
+
+    def warm(self):
+        """预先加载索引（如服务启动时），数据库尚不可用时跳过，留待第一次检索"""
+        try:
+            self._ensure_current()
+        except DatabaseError:
+            pass
+
+    def search(self, query, model_labels=None, limit=10):
+        """返回 {模型: (命中总数, [(对象ID, 标题, 得分)])}，每个模型按得分降序截取 limit 条
+
+        所有检索词元都出现的文档才算命中。
+        """
+        tokens = set(tokenize(query))
+        labels = self.model_labels if model_labels is None else self.model_labels & set(model_labels)
+        results = {label: (0, []) for label in labels}
+        if not tokens:
+            return results
+
+        self._ensure_current()
+        with self._lock:
+            postings = [self._postings.get(token) for token in tokens]
+            if not all(postings):
+                return results
+            postings.sort(key=len)
+            total = len(self._documents)
+            weighted = [(posting, math.log(1 + total / len(posting))) for posting in postings]
+            hits = {}
+            for key in postings[0]:
+                if key[0] not in labels:
+                    continue
+                score = 0.0
+                for posting, idf in weighted:
+                    weight = posting.get(key)
+                    if weight is None:
+                        break
+                    score += idf * weight * (TF_SATURATION + 1) / (weight + TF_SATURATION)
+                else:
+                    hits.setdefault(key[0], []).append((-score, key[1]))
+
+            for label, items in hits.items():
+                top = heapq.nsmallest(limit, items)
+                results[label] = (
+                    len(items),
+                    [(object_id, self._documents[(label, object_id)][0], -score) for score, object_id in top],
+                )
+        return results
+
+    def upsert(self, document):
+        if document.model_label not in self.model_labels:
+            return
+        self._publish(('upsert', document.model_label, document.object_id, document.title, document.content))
+
+    def remove(self, model_label, object_id):
+        if model_label not in self.model_labels:
+            return
+        self._publish(('remove', model_label, object_id))
+
+    def invalidate(self):
+        """标记所有副本过期，用于重建检索文档等批量写入之后
+
+        不登记增量，其他进程取不到这一版本的增量时全量重新加载；本进程在下次检索时立即重新加载。
+        """
+        with self._lock:
+            bump_version()
+            self._loaded_at = None
+
+    def _publish(self, delta):
+        with self._lock:
+            version = publish_delta(delta)
+            # 本地副本恰好落后一个版本时直接应用，否则留待下次检索时追赶
+            if self.loaded and self.version == version - 1:
+                self._apply(delta)
+                self.version = version
+
+    def _ensure_current(self):
+        version = current_version()
+        with self._lock:
+            if self.loaded and self._loaded_at is not None:
+                if self.version == version or self._catch_up(version):
+                    return
+                if time.monotonic() - self._loaded_at < settings.SEARCH_INDEX_RELOAD_SECONDS:
+                    # 增量缺失且距上次全量加载不久，暂时沿用旧副本
+                    return
+
+        if self.loaded:
+            # 已有副本时只由一个线程重新加载，其他线程继续使用旧副本
+            if not self._reload_lock.acquire(blocking=False):
+                return
+        else:
+            self._reload_lock.acquire()
+        try:
+            with self._lock:
+                if self.loaded and self._loaded_at is not None and self.version == current_version():
+                    return
+            self._reload()
+        finally:
+            self._reload_lock.release()
+
+    def _catch_up(self, version):
+        """按版本号依次应用落后的增量，增量不全时返回 False"""
+        if self.version is None or not 0 < version - self.version <= MAX_PENDING_DELTAS:
+            return False
+        versions = range(self.version + 1, version + 1)
+        keys = [DELTA_CACHE_KEY.format(version=item) for item in versions]
+        deltas = cache.get_many(keys)
+        if len(deltas) != len(keys):
+            return False
+        for key in keys:
+            self._apply(deltas[key])
+        self.version = version
+        return True
+
+    def _reload(self):
+        """在锁外从检索文档表构建新的倒排表，完成后替换本地副本
+
+        先读版本号再读表：加载期间的写入会在之后作为增量再应用一次，增量的应用是幂等的。
+        """
+        version = current_version()
+        postings, documents = {}, {}
+        rows = SearchDocument.objects.filter(model_label__in=self.model_labels).values_list(
+            'model_label', 'object_id', 'title', 'content',
+        )
+        for model_label, object_id, title, content in rows.iterator(chunk_size=2000):
+            self._add(postings, documents, model_label, object_id, title, content)
+        with self._lock:
+            self._postings, self._documents = postings, documents
+            self.version = version
+            self._loaded_at = time.monotonic()
+            self._catch_up(current_version())
+
+    def _apply(self, delta):
+        action, key = delta[0], (delta[1], delta[2])
+        self._remove(key)
+        if action == 'upsert':
+            self._add(self._postings, self._documents, *delta[1:])
+
+    @staticmethod
+    def _add(postings, documents, model_label, object_id, title, content):
+        key = (model_label, object_id)
+        weights = Counter(tokenize(content))
+        for token, count in Counter(tokenize(title)).items():
+            weights[token] += count * TITLE_WEIGHT
+        for token, weight in weights.items():
+            postings.setdefault(token, {})[key] = weight
+        documents[key] = (title, tuple(weights))
+
+    def _remove(self, key):
+        document = self._documents.pop(key, None)
+        if document is None:
+            return
+        for token in document[1]:
+            posting = self._postings[token]
+            posting.pop(key, None)
+            if not posting:
+                del self._postings[token]
+
+
+search_index = InvertedIndex(SEARCH_GROUPS.values())
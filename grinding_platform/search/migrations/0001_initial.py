@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='模型')),
+                ('object_id', models.BigIntegerField(verbose_name='对象ID')),
+                ('title', models.CharField(blank=True, max_length=500, verbose_name='标题')),
+                ('content', models.TextField(blank=True, verbose_name='内容')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '检索文档',
+                'verbose_name_plural': '检索文档',
+                'db_table': 'search_documents',
+                'unique_together': {('model_label', 'object_id')},
+            },
+        ),
+    ]
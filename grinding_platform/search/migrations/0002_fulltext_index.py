@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE search_documents '
+            'ADD FULLTEXT INDEX search_documents_fulltext (title, content) WITH PARSER ngram'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5(title, content, tokenize='unicode61')"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE search_documents DROP INDEX search_documents_fulltext')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS search_documents_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+from search.index import SEARCH_SOURCES
+from search.text import field_text, tokenize
+
+
+def build_documents(apps, schema_editor):
+    """为已有数据建立检索文档，SQLite 同时写入 FTS5 表（MySQL 的 FULLTEXT 索引随表自动维护）"""
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    for label, (title_field, content_fields) in SEARCH_SOURCES.items():
+        model = apps.get_model(label)
+        SearchDocument.objects.filter(model_label=label).delete()
+        batch = []
+        for instance in model.objects.only(title_field, *content_fields).order_by('pk').iterator(chunk_size=1000):
+            content = '\n'.join(filter(None, (field_text(getattr(instance, name)) for name in content_fields)))
+            batch.append(SearchDocument(
+                model_label=label,
+                object_id=instance.pk,
+                title=field_text(getattr(instance, title_field))[:500],
+                content=content,
+            ))
+            if len(batch) >= 1000:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    documents = SearchDocument.objects.values_list('pk', 'title', 'content')
+    rows = [
+        (pk, ' '.join(tokenize(title)), ' '.join(tokenize(content)))
+        for pk, title, content in documents.iterator(chunk_size=2000)
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DELETE FROM search_documents_fts')
+        cursor.executemany('INSERT INTO search_documents_fts (rowid, title, content) VALUES (%s, %s, %s)', rows)
+
+
+def remove_documents(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    SearchDocument.objects.all().delete()
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DELETE FROM search_documents_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+        ('process_cases', '0003_processcase_indexes'),
+        ('polishing_processes', '0002_keyset_indexes'),
+        ('polishing_requirements', '0002_keyset_indexes'),
+        ('grinding_blocks', '0002_keyset_indexes'),
+        ('base_info', '0001_initial'),
+        ('equipment', '0003_chemical'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_documents, remove_documents),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_backfill_documents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutocompleteValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='模型')),
+                ('field', models.CharField(blank=True, max_length=50, verbose_name='字段')),
+                ('value', models.CharField(blank=True, max_length=200, verbose_name='取值')),
+                ('count', models.BigIntegerField(default=0, verbose_name='出现次数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '取值提示',
+                'verbose_name_plural': '取值提示',
+                'db_table': 'autocomplete_values',
+                'unique_together': {('model_label', 'field', 'value')},
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """全文检索文档
+
+    每个被检索的对象对应一行，title/content 为从对象字段拼接的原文，由信号保持同步。
+    MySQL 在 (title, content) 上建立 ngram 分词的 FULLTEXT 索引；SQLite 另建 FTS5 虚拟表
+    search_documents_fts，存放按字切分后的文本（见 search.backends）。
+    """
+
+    model_label = models.CharField(max_length=100, verbose_name='模型')
+    object_id = models.BigIntegerField(verbose_name='对象ID')
+    title = models.CharField(max_length=500, blank=True, verbose_name='标题')
+    content = models.TextField(blank=True, verbose_name='内容')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'search_documents'
+        verbose_name = '检索文档'
+        verbose_name_plural = '检索文档'
+        unique_together = ['model_label', 'object_id']
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id} {self.title[:50]}"
+
+
+class AutocompleteValue(models.Model):
+    """取值提示的取值计数
+
+    每行记录某个模型某个字段的一个取值及其出现次数，field 为空的行记录该模型的总数，
+    同时标记该模型的取值已全量构建。由 post_save/post_delete 信号以 F() 表达式原子更新（见 search.autocomplete）。
+    """
+
+    model_label = models.CharField(max_length=100, verbose_name='模型')
+    field = models.CharField(max_length=50, blank=True, verbose_name='字段')
+    value = models.CharField(max_length=200, blank=True, verbose_name='取值')
+    count = models.BigIntegerField(default=0, verbose_name='出现次数')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'autocomplete_values'
+        verbose_name = '取值提示'
+        verbose_name_plural = '取值提示'
+        unique_together = ['model_label', 'field', 'value']
+
+    def __str__(self):
+        if not self.field:
+            return f"{self.model_label} 总数: {self.count}"
+        return f"{self.model_label}.{self.field}={self.value}: {self.count}"
@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from grinding_platform.changes import previous_values, track_previous_values
+
+from .autocomplete import SOURCE_FIELDS, record_changed, record_created, record_deleted
+from .index import SEARCH_SOURCES, index_object, remove_object
+
+
+def update_document(sender, instance, **kwargs):
+    """对象保存后更新检索文档"""
+    transaction.on_commit(lambda: index_object(instance))
+
+
+def remove_document(sender, instance, **kwargs):
+    """对象删除后移除检索文档"""
+    model_label, object_id = sender._meta.label_lower, instance.pk
+    transaction.on_commit(lambda: remove_object(model_label, object_id))
+
+
+def update_values(sender, instance, created, **kwargs):
+    """对象保存后调整取值提示的次数"""
+    previous = previous_values(instance)
+    if created or previous is None:
+        record_created(instance)
+    else:
+        record_changed(instance, previous)
+
+
+def discard_values(sender, instance, **kwargs):
+    record_deleted(instance)
+
+
+def connect_signals():
+    for label in SEARCH_SOURCES:
+        model = apps.get_model(label)
+        post_save.connect(update_document, sender=model, dispatch_uid=f'search.update.{label}')
+        post_delete.connect(remove_document, sender=model, dispatch_uid=f'search.remove.{label}')
+    for label, fields in SOURCE_FIELDS.items():
+        model = apps.get_model(label)
+        track_previous_values(model, fields)
+        post_save.connect(update_values, sender=model, dispatch_uid=f'search.autocomplete.{label}')
+        post_delete.connect(discard_values, sender=model, dispatch_uid=f'search.autocomplete.{label}')
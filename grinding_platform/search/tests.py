@@ -0,0 +1,249 @@
+import importlib
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from process_cases.models import ExpertKnowledge, ProcessCase
+from stats.models import StatCounter
+
+from grinding_platform.testing import FixtureMixin
+
+from .autocomplete import autocomplete
+from .index import rebuild_index
+from .memory import DELTA_CACHE_KEY, SEARCH_GROUPS, InvertedIndex, current_version, search_index
+from .models import AutocompleteValue, SearchDocument
+from .text import tokenize
+
+
+class FullTextSearchTests(FixtureMixin, APITestCase):
+    """?search= 使用全文检索索引并按相关度排序，索引随对象增删改同步"""
+
+    url = '/api/v1/process-cases/knowledge/'
+
+    def create_knowledge(self, title, content):
+        return ExpertKnowledge.objects.create(
+            title=title, knowledge_type='material_guide', content=content, expert_name='李工',
+            expert_title='高级工程师', applicable_scenarios='-', created_by=self.user,
+        )
+
+    def search(self, term):
+        response = self.client.get(self.url, {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_ranked_by_relevance(self):
+        in_content = self.create_knowledge('去毛刺参数', '适用于304不锈钢零件')
+        in_title = self.create_knowledge('304不锈钢光整工艺', '陶瓷磨块配合光饰剂')
+        self.create_knowledge('铝合金表面处理', '不锈')
+        rebuild_index(['process_cases.expertknowledge'])
+
+        self.assertEqual(self.search('不锈钢'), [in_title.id, in_content.id])
+        self.assertEqual(self.search('304 陶瓷'), [in_title.id])
+
+    def test_index_follows_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            knowledge = self.create_knowledge('铜件光整', '-')
+        self.assertEqual(self.search('铜件'), [knowledge.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            knowledge.title = '钛合金光整'
+            knowledge.save()
+        self.assertEqual(self.search('铜件'), [])
+        self.assertEqual(self.search('钛合金'), [knowledge.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            knowledge.delete()
+        self.assertEqual(self.search('钛合金'), [])
+
+    def test_code_fragments(self):
+        requirement = self.create_requirement()
+        requirement.part_number = 'GB-2023-SUS304'
+        requirement.save()
+        self.create_requirement()
+        rebuild_index(['polishing_requirements.polishingrequirement'])
+
+        url = '/api/v1/polishing-requirements/requirements/'
+        for term in ('304', '023', 'sus3', 'GB-2023'):
+            response = self.client.get(url, {'search': term})
+            self.assertEqual([row['id'] for row in response.data['results']], [requirement.id], term)
+
+    def test_truncation_reported(self):
+        for title in ('铜件光整', '铜件去毛刺', '铜件抛光'):
+            self.create_knowledge(title, '-')
+        rebuild_index(['process_cases.expertknowledge'])
+
+        with self.settings(SEARCH_MAX_RESULTS=2):
+            response = self.client.get(self.url, {'search': '铜件'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertTrue(response.data['search_truncated'])
+        self.assertNotIn('search_truncated', self.client.get(self.url, {'search': '铜件'}).data)
+
+    def test_unindexed_model_falls_back_to_like(self):
+        # 未执行 on_commit 回调，对象没有检索文档
+        knowledge = self.create_knowledge('铜件光整', '-')
+        self.create_knowledge('钛合金光整', '-')
+        self.assertEqual(self.search('铜件'), [knowledge.id])
+
+        rebuild_index(['process_cases.expertknowledge'])
+        self.assertEqual(self.search('铝合金'), [])
+
+    def test_migration_backfills_documents(self):
+        knowledge = self.create_knowledge('铜件光整', '-')
+        case = self.create_case()
+        migration = importlib.import_module('search.migrations.0003_backfill_documents')
+        migration.build_documents(apps, SimpleNamespace(connection=connection))
+
+        self.assertEqual(
+            set(SearchDocument.objects.values_list('model_label', 'object_id')),
+            {('process_cases.expertknowledge', knowledge.id), ('process_cases.processcase', case.id)},
+        )
+        SearchDocument.objects.filter(model_label='process_cases.processcase').delete()
+        self.assertEqual(self.search('铜件'), [knowledge.id])
+        self.assertEqual(self.search('钛合金'), [])
+
+
+class GlobalSearchTests(FixtureMixin, APITestCase):
+    """/api/v1/search/ 基于内存倒排索引，按分类分组返回命中"""
+
+    url = '/api/v1/search/'
+
+    def setUp(self):
+        super().setUp()
+        search_index.invalidate()
+
+    def test_grouped_hits(self):
+        knowledge = ExpertKnowledge.objects.create(
+            title='304不锈钢光整要点', knowledge_type='material_guide', content='注意磨块选择', expert_name='李工',
+            expert_title='高级工程师', applicable_scenarios='-', created_by=self.user,
+        )
+        case = self.create_case()
+        case.part_material = '304不锈钢'
+        case.save()
+        self.create_case()
+        rebuild_index()
+
+        response = self.client.get(self.url, {'q': '304不锈钢'})
+        self.assertEqual(response.status_code, 200)
+        groups = {group['type']: group for group in response.data['groups']}
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual([hit['id'] for hit in groups['knowledge']['results']], [knowledge.id])
+        self.assertEqual([hit['id'] for hit in groups['cases']['results']], [case.id])
+        self.assertEqual(groups['blocks']['count'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            knowledge.delete()
+        response = self.client.get(self.url, {'q': '304不锈钢', 'types': 'knowledge,cases'})
+        self.assertEqual([group['count'] for group in response.data['groups']], [0, 1])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': '磨块', 'types': 'unknown'}).status_code, 400)
+
+
+class InvertedIndexSyncTests(FixtureMixin, APITestCase):
+    """其他进程的索引副本通过缓存中的增量同步写入，不重新加载整张检索文档表"""
+
+    def setUp(self):
+        super().setUp()
+        search_index.invalidate()
+        # 同一缓存上的另一个副本，模拟另一个工作进程
+        self.other = InvertedIndex(SEARCH_GROUPS.values())
+
+    def create_knowledge(self, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ExpertKnowledge.objects.create(
+                title=title, knowledge_type='material_guide', content='-', expert_name='李工',
+                expert_title='高级工程师', applicable_scenarios='-', created_by=self.user,
+            )
+
+    def hits(self, query):
+        with CaptureQueriesContext(connection) as context:
+            count, results = self.other.search(query)['process_cases.expertknowledge']
+        self.reloaded = any(SearchDocument._meta.db_table in q['sql'] for q in context.captured_queries)
+        return [object_id for object_id, _, _ in results]
+
+    def test_deltas_applied_without_reload(self):
+        first = self.create_knowledge('铜件光整')
+        self.assertEqual(self.hits('光整'), [first.id])
+        self.assertTrue(self.reloaded)
+
+        second = self.create_knowledge('钛合金光整')
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.hits('光整'), [second.id])
+        self.assertFalse(self.reloaded)
+        self.assertEqual(self.other.version, current_version())
+
+    def test_missing_delta_reloads_at_most_once_per_interval(self):
+        first = self.create_knowledge('铜件光整')
+        self.hits('光整')
+        second = self.create_knowledge('钛合金光整')
+        cache.delete(DELTA_CACHE_KEY.format(version=current_version()))
+
+        with self.settings(SEARCH_INDEX_RELOAD_SECONDS=3600):
+            self.assertEqual(self.hits('光整'), [first.id])
+            self.assertFalse(self.reloaded)
+        with self.settings(SEARCH_INDEX_RELOAD_SECONDS=0):
+            self.assertEqual(sorted(self.hits('光整')), sorted([first.id, second.id]))
+            self.assertTrue(self.reloaded)
+
+
+class AutocompleteTests(FixtureMixin, APITestCase):
+    """取值提示按前缀返回最常用的取值，不查询业务表"""
+
+    url = '/api/v1/search/autocomplete/'
+
+    def setUp(self):
+        super().setUp()
+        autocomplete.invalidate()
+
+    def suggest(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [(item['value'], item['count']) for item in response.data['results']]
+
+    def set_materials(self, materials):
+        for material in materials:
+            case = self.create_case()
+            case.part_material = material
+            case.save()
+
+    def test_prefix_ranked_by_frequency(self):
+        self.set_materials(['304不锈钢', '316不锈钢', '304不锈钢', 'H62黄铜', 'h59黄铜'])
+        self.assertEqual(self.suggest(field='material', q='3'), [('304不锈钢', 2), ('316不锈钢', 1)])
+        self.assertEqual(self.suggest(field='material', q='H', limit=1), [('h59黄铜', 1)])
+
+        with self.settings(AUTOCOMPLETE_REFRESH_SECONDS=0):
+            self.set_materials(['316不锈钢', '316不锈钢'])
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(self.suggest(field='material', q='3'), [('316不锈钢', 3), ('304不锈钢', 2)])
+        table = ProcessCase._meta.db_table
+        self.assertFalse(any(table in query['sql'] for query in context.captured_queries))
+
+    def test_counts_kept_apart_from_stat_counters(self):
+        self.set_materials(['304不锈钢'])
+        self.suggest(field='material')
+        case = ProcessCase.objects.get()
+        values = AutocompleteValue.objects.filter(model_label='process_cases.processcase', field='part_material')
+
+        case.part_material = '316不锈钢'
+        case.save()
+        self.assertEqual(dict(values.values_list('value', 'count')), {'304不锈钢': 0, '316不锈钢': 1})
+        case.delete()
+        self.assertEqual(dict(values.values_list('value', 'count')), {'304不锈钢': 0, '316不锈钢': 0})
+        self.assertFalse(StatCounter.objects.filter(dimension='part_material').exists())
+
+    def test_unknown_field(self):
+        self.assertEqual(self.client.get(self.url, {'field': 'unknown'}).status_code, 400)
+
+
+class TokenizeTests(SimpleTestCase):
+
+    def test_bigrams(self):
+        self.assertEqual(tokenize('GB-2023 不锈钢'), ['gb', '20', '02', '23', '不锈', '锈钢'])
+        self.assertEqual(tokenize('钢 A'), ['钢', 'a'])
@@ -0,0 +1,36 @@
+"""
+检索文本处理
+
+中文没有空格分词，这里不依赖分词词典，按字切分：连续的汉字、连续的字母数字（转为小写）
+都切成相邻两字的二元组，只有一个字时保留原字。与 MySQL ngram 解析器（ngram_token_size=2）
+的切分方式一致，SQLite FTS5 与内存倒排索引都使用它。
+编号类文本因此可以按任意片段检索，如 304 命中 SUS304、023 命中 GB-2023。
+"""
+
+import re
+
+
+TOKEN_RE = re.compile(r'[\u3400-\u9fff\uf900-\ufaff]+|[0-9A-Za-z]+')
+
+
+def tokenize(text):
+    """将文本切分为检索词元"""
+    tokens = []
+    for run in TOKEN_RE.findall(text or ''):
+        run = run.lower()
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def field_text(value):
+    """将字段值转换为文本，列表/字典（JSONField）展开其中的值"""
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(filter(None, (field_text(item) for item in value)))
+    return str(value)
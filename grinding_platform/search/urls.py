@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.GlobalSearchView.as_view(), name='global'),
+    path('autocomplete/', views.AutocompleteView.as_view(), name='autocomplete'),
+]
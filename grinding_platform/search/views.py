@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .autocomplete import AUTOCOMPLETE_FIELDS, autocomplete
+from .memory import SEARCH_GROUPS, search_index
+
+
+def parse_limit(request, default, maximum):
+    """读取 ?limit= 并限制在 [1, maximum] 内，无效时返回 None"""
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except ValueError:
+        return None
+    return min(max(limit, 1), maximum)
+
+
+class GlobalSearchView(APIView):
+    """全局检索：一次返回工艺实例、光整工艺、磨块、化学剂、标准与专家知识中按相关度排序的分组命中
+
+    ?q=       检索关键词，多个关键词以空格分隔，全部匹配才算命中
+    ?types=   只检索指定分类（逗号分隔，见 SEARCH_GROUPS）
+    ?limit=   每个分类返回的条数
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': '请提供检索关键词'}, status=status.HTTP_400_BAD_REQUEST)
+
+        types = [item for item in request.query_params.get('types', '').split(',') if item]
+        unknown = [item for item in types if item not in SEARCH_GROUPS]
+        if unknown:
+            return Response({'error': f'未知的检索分类: {", ".join(unknown)}'}, status=status.HTTP_400_BAD_REQUEST)
+        types = types or list(SEARCH_GROUPS)
+
+        limit = parse_limit(request, settings.GLOBAL_SEARCH_LIMIT, settings.GLOBAL_SEARCH_MAX_LIMIT)
+        if limit is None:
+            return Response({'error': '无效的条数'}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = search_index.search(query, [SEARCH_GROUPS[item] for item in types], limit=limit)
+        groups = []
+        for item in types:
+            label = SEARCH_GROUPS[item]
+            count, results = hits[label]
+            groups.append({
+                'type': item,
+                'label': apps.get_model(label)._meta.verbose_name_plural,
+                'count': count,
+                'results': [
+                    {'id': object_id, 'title': title, 'score': round(score, 4)}
+                    for object_id, title, score in results
+                ],
+            })
+        return Response({
+            'query': query,
+            'total': sum(group['count'] for group in groups),
+            'groups': groups,
+        })
+
+
+class AutocompleteView(APIView):
+    """取值提示：返回以 ?q= 开头、出现次数最多的取值
+
+    ?field=   提示字段（见 AUTOCOMPLETE_FIELDS）
+    ?q=       已输入的前缀，不区分大小写，为空时返回最常用的取值
+    ?limit=   返回的条数
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        field = request.query_params.get('field')
+        if field not in AUTOCOMPLETE_FIELDS:
+            return Response(
+                {'error': f'请提供提示字段: {", ".join(AUTOCOMPLETE_FIELDS)}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = parse_limit(request, settings.AUTOCOMPLETE_LIMIT, settings.AUTOCOMPLETE_MAX_LIMIT)
+        if limit is None:
+            return Response({'error': '无效的条数'}, status=status.HTTP_400_BAD_REQUEST)
+
+        prefix = request.query_params.get('q', '').strip()
+        return Response({
+            'field': field,
+            'query': prefix,
+            'results': [
+                {'value': value, 'count': count}
+                for value, count in autocomplete.suggest(field, prefix, limit)
+            ],
+        })
@@ -0,0 +1,28 @@
+from django.contrib import admin
+from .models import RollupWatermark, StatCounter, StatRollup, StatusTransition
+
+
+@admin.register(StatCounter)
+class StatCounterAdmin(admin.ModelAdmin):
+    list_display = ['model_label', 'dimension', 'value', 'count', 'updated_at']
+    list_filter = ['model_label', 'dimension']
+    readonly_fields = ['model_label', 'dimension', 'value', 'count', 'updated_at']
+
+
+@admin.register(StatusTransition)
+class StatusTransitionAdmin(admin.ModelAdmin):
+    list_display = ['model_label', 'object_id', 'from_status', 'to_status', 'changed_at']
+    list_filter = ['model_label', 'to_status']
+    search_fields = ['object_id']
+
+
+@admin.register(StatRollup)
+class StatRollupAdmin(admin.ModelAdmin):
+    list_display = ['series', 'metric', 'period', 'period_start', 'count', 'total']
+    list_filter = ['series', 'period', 'metric']
+    readonly_fields = ['series', 'metric', 'period', 'period_start', 'count', 'total']
+
+
+@admin.register(RollupWatermark)
+class RollupWatermarkAdmin(admin.ModelAdmin):
+    list_display = ['source', 'last_id', 'updated_at']
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class StatsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'stats'
+    verbose_name = '统计数据'
+
+    def ready(self):
+        from grinding_platform.caching import check_shared_cache
+
+        from . import signals  # noqa: F401
+        checks.register(check_shared_cache, checks.Tags.caches, deploy=True)
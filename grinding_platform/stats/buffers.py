@@ -0,0 +1,162 @@
+"""
+缓冲计数器
+
+高频的计数（如知识查看次数）先在缓存中累加，再定期批量写回数据库：
+    UPDATE ... SET view_count = view_count + CASE id WHEN ... END WHERE id IN (...)
+避免每次访问都读改写整行（并发时丢失计数，且会刷新 updated_at）。
+
+缓存中的键（前缀为 stats:buffer:<模型>.<字段>）：
+    count:<id>     尚未写回的增量
+    pending:<id>   已登记待写回的标记，带过期时间，登记丢失时过期后下次累加会重新登记
+    seq / slot:<n> 登记序号及对应的对象ID，写回时读取 flushed 之后的全部登记
+缓冲依赖共享缓存（设置 REDIS_URL）：进程内缓存中的增量对 flush_counters 等其它进程不可见，
+进程重启时也会丢失，因此未配置共享缓存时每次累加直接写回数据库。
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Value, When
+
+from grinding_platform.caching import cache_is_shared
+
+
+# 使用缓冲计数的字段：(模型, 字段)
+BUFFERED_FIELDS = (
+    ('process_cases.expertknowledge', 'view_count'),
+)
+
+# 写回进行中的标记超时（秒），写回进程异常退出时自动释放
+FLUSH_LOCK_TIMEOUT = 30
+
+
+class BufferedCounter:
+    """某个模型整数字段的缓冲计数器"""
+
+    def __init__(self, model_label, field):
+        self.model_label = model_label
+        self.field = field
+        self.prefix = f'stats:buffer:{model_label}.{field}'
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def _key(self, *parts):
+        return ':'.join((self.prefix,) + tuple(str(part) for part in parts))
+
+    def incr(self, pk, amount=1):
+        """累加增量，返回该对象尚未写回的增量；待写回的对象较多或距上次写回超过间隔时顺带写回
+
+        未配置共享缓存时直接写回数据库，返回本次的增量。
+        """
+        if not cache_is_shared():
+            self._write({pk: amount})
+            return amount
+        pending = self._add(pk, amount)
+        self.maybe_flush()
+        return pending
+
+    def _add(self, pk, amount):
+        key = self._key('count', pk)
+        cache.add(key, 0, timeout=None)
+        pending = cache.incr(key, amount)
+        timeout = settings.BUFFERED_COUNTER_FLUSH_SECONDS * 10
+        if cache.add(self._key('pending', pk), 1, timeout=timeout):
+            cache.add(self._key('seq'), 0, timeout=None)
+            slot = cache.incr(self._key('seq'))
+            cache.set(self._key('slot', slot), pk, timeout=None)
+        return pending
+
+    def pending(self, pks=None):
+        """返回 {对象ID: 未写回的增量}，不指定 pks 时为全部已登记的对象"""
+        if pks is None:
+            pks = self._registered()[1]
+        keys = {self._key('count', pk): pk for pk in pks}
+        return {keys[key]: value for key, value in cache.get_many(keys).items() if value}
+
+    def _registered(self):
+        """返回 (登记序号, 已登记对象ID集合)"""
+        seq = cache.get(self._key('seq'), 0)
+        flushed = cache.get(self._key('flushed'), 0)
+        slots = [self._key('slot', n) for n in range(flushed + 1, seq + 1)]
+        return seq, set(cache.get_many(slots).values())
+
+    def maybe_flush(self):
+        seq = cache.get(self._key('seq'), 0)
+        backlog = seq - cache.get(self._key('flushed'), 0)
+        due = cache.add(self._key('next_flush'), 1, timeout=settings.BUFFERED_COUNTER_FLUSH_SECONDS)
+        if backlog >= settings.BUFFERED_COUNTER_FLUSH_THRESHOLD or (due and backlog):
+            self.flush()
+
+    def flush(self):
+        """将已登记对象的增量批量写回数据库，返回写回的对象数"""
+        lock = self._key('flushing')
+        if not cache.add(lock, 1, timeout=FLUSH_LOCK_TIMEOUT):
+            return 0
+        try:
+            flushed = cache.get(self._key('flushed'), 0)
+            seq, pks = self._registered()
+            if seq <= flushed:
+                return 0
+            cache.set(self._key('flushed'), seq, timeout=None)
+            # 先清除登记再读取增量：之后到达的累加会重新登记，留待下次写回
+            cache.delete_many(
+                [self._key('slot', n) for n in range(flushed + 1, seq + 1)]
+                + [self._key('pending', pk) for pk in pks]
+            )
+            deltas = self.pending(pks)
+            for pk, amount in deltas.items():
+                cache.decr(self._key('count', pk), amount)
+            try:
+                self._write(deltas)
+            except Exception:
+                # 写回失败时把增量放回缓存，等待下次写回
+                for pk, amount in deltas.items():
+                    self._add(pk, amount)
+                raise
+            return len(deltas)
+        finally:
+            cache.delete(lock)
+
+    def _write(self, deltas):
+        if not deltas:
+            return
+        increment = Case(
+            *(When(pk=pk, then=Value(amount)) for pk, amount in deltas.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        self.model.objects.filter(pk__in=list(deltas)).update(**{self.field: F(self.field) + increment})
+
+    def top(self, queryset, limit):
+        """按 数据库中的值 + 未写回的增量 排序，返回前 limit 个 [(对象ID, 计数)]
+
+        前 limit 名只可能来自数据库中的前 limit 名或有未写回增量的对象。
+        """
+        pending = self.pending()
+        candidates = dict(queryset.order_by(f'-{self.field}').values_list('pk', self.field)[:limit])
+        if pending:
+            candidates.update(queryset.filter(pk__in=list(pending)).values_list('pk', self.field))
+        totals = [(pk, value + pending.get(pk, 0)) for pk, value in candidates.items()]
+        totals.sort(key=lambda item: (-item[1], item[0]))
+        return totals[:limit]
+
+
+_counters = {}
+
+
+def get_buffered_counter(model_label, field):
+    if (model_label, field) not in BUFFERED_FIELDS:
+        raise KeyError(f'{model_label}.{field} 未登记为缓冲计数字段')
+    if (model_label, field) not in _counters:
+        _counters[(model_label, field)] = BufferedCounter(model_label, field)
+    return _counters[(model_label, field)]
+
+
+def flush_all():
+    """写回全部缓冲计数，返回 {模型.字段: 写回的对象数}"""
+    return {
+        f'{label}.{field}': get_buffered_counter(label, field).flush()
+        for label, field in BUFFERED_FIELDS
+    }
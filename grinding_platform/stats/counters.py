@@ -0,0 +1,136 @@
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import StatCounter
+
+
+# 维护计数器的模型及其统计维度
+TRACKED_DIMENSIONS = {
+    'base_info.company': ('company_type', 'scale', 'is_active'),
+    'base_info.personnel': ('gender', 'education', 'status'),
+    'base_info.standard': ('standard_type', 'status', 'is_mandatory'),
+    'process_cases.processcase': ('status',),
+    'polishing_processes.polishingprocess': ('status', 'process_type'),
+    'polishing_requirements.polishingrequirement': ('status', 'urgency_level'),
+}
+
+# 总数计数器的维度名
+TOTAL = ''
+
+
+def encode_value(value):
+    """维度取值统一存为字符串，空值存为空串"""
+    return '' if value is None else str(value)
+
+
+def dimension_values(instance):
+    dimensions = TRACKED_DIMENSIONS[instance._meta.label_lower]
+    return {dimension: encode_value(getattr(instance, dimension)) for dimension in dimensions}
+
+
+def _add(label, dimension, value, delta):
+    """原子地调整计数，计数行不存在时创建"""
+    counters = StatCounter.objects.filter(model_label=label, dimension=dimension, value=value)
+    # update() 不会触发 auto_now，显式更新修改时间
+    if counters.update(count=F('count') + delta, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            StatCounter.objects.create(model_label=label, dimension=dimension, value=value, count=delta)
+    except IntegrityError:
+        # 并发创建时由另一事务先插入，改为更新
+        counters.update(count=F('count') + delta, updated_at=timezone.now())
+
+
+def _add_total(label, delta):
+    """调整总数；返回 False 表示该模型的计数器尚未初始化，等待首次读取时全量构建"""
+    counters = StatCounter.objects.filter(model_label=label, dimension=TOTAL, value='')
+    return bool(counters.update(count=F('count') + delta, updated_at=timezone.now()))
+
+
+def record_created(instance):
+    label = instance._meta.label_lower
+    if not _add_total(label, 1):
+        return
+    for dimension, value in dimension_values(instance).items():
+        _add(label, dimension, value, 1)
+
+
+def record_deleted(instance):
+    label = instance._meta.label_lower
+    if not _add_total(label, -1):
+        return
+    for dimension, value in dimension_values(instance).items():
+        _add(label, dimension, value, -1)
+
+
+def record_changed(instance, previous):
+    """维度取值变化（如状态流转）时，从旧取值移到新取值"""
+    label = instance._meta.label_lower
+    current = dimension_values(instance)
+    changed = [dimension for dimension, value in current.items() if previous.get(dimension, value) != value]
+    if not changed:
+        return
+    if not StatCounter.objects.filter(model_label=label, dimension=TOTAL).exists():
+        return
+    for dimension in changed:
+        _add(label, dimension, previous[dimension], -1)
+        _add(label, dimension, current[dimension], 1)
+
+
+def rebuild_counters(model):
+    """按当前数据全量重建某个模型的计数器"""
+    label = model._meta.label_lower
+    with transaction.atomic():
+        StatCounter.objects.filter(model_label=label).delete()
+        counters = [StatCounter(model_label=label, dimension=TOTAL, value='', count=model.objects.count())]
+        for dimension in TRACKED_DIMENSIONS[label]:
+            groups = model.objects.order_by().values(dimension).annotate(total=Count('pk'))
+            counters.extend(
+                StatCounter(model_label=label, dimension=dimension, value=encode_value(group[dimension]),
+                            count=group['total'])
+                for group in groups
+            )
+        StatCounter.objects.bulk_create(counters)
+
+
+def get_counters(model):
+    """读取某个模型的全部计数器，返回 {'total': n, 维度: {取值: n}}；未初始化时先全量构建"""
+    label = model._meta.label_lower
+    rows = list(StatCounter.objects.filter(model_label=label).values_list('dimension', 'value', 'count'))
+    if not any(dimension == TOTAL for dimension, _, _ in rows):
+        rebuild_counters(model)
+        rows = list(StatCounter.objects.filter(model_label=label).values_list('dimension', 'value', 'count'))
+
+    counters = {dimension: {} for dimension in TRACKED_DIMENSIONS[label]}
+    counters['total'] = 0
+    for dimension, value, count in rows:
+        if dimension == TOTAL:
+            counters['total'] = count
+        else:
+            counters.setdefault(dimension, {})[value] = count
+    return counters
+
+
+def counter_statistics(model, conditions=None, breakdowns=None, labels=True):
+    """基于计数器的统计，返回 {'total': n, <条件名>: n, <分组名>: {选项: 计数}}
+
+    conditions: {名称: (维度, 取值)}
+    breakdowns: {名称: (维度, choices)}，labels 为真时分组以选项显示名为键
+    """
+    counters = get_counters(model)
+    result = {'total': counters['total']}
+    for name, (dimension, value) in (conditions or {}).items():
+        result[name] = counters[dimension].get(encode_value(value), 0)
+    for name, (dimension, choices) in (breakdowns or {}).items():
+        result[name] = {
+            (label if labels else value): counters[dimension].get(encode_value(value), 0)
+            for value, label in choices
+        }
+    return result
+
+
+def tracked_models():
+    return [apps.get_model(label) for label in TRACKED_DIMENSIONS]
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from stats.buffers import flush_all
+
+
+class Command(BaseCommand):
+    help = '将缓存中的缓冲计数（如知识查看次数）批量写回数据库'
+
+    def handle(self, *args, **options):
+        for name, count in flush_all().items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS('缓冲计数写回完成'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from stats.counters import rebuild_counters, tracked_models
+
+
+class Command(BaseCommand):
+    help = '按当前数据全量重建统计计数器（批量导入或 queryset.update 之后使用）'
+
+    def handle(self, *args, **options):
+        for model in tracked_models():
+            rebuild_counters(model)
+            self.stdout.write(self.style.SUCCESS(f'{model._meta.verbose_name} 统计计数器已重建'))
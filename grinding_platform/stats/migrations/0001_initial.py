@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='模型')),
+                ('dimension', models.CharField(blank=True, max_length=50, verbose_name='统计维度')),
+                ('value', models.CharField(blank=True, max_length=100, verbose_name='维度取值')),
+                ('count', models.BigIntegerField(default=0, verbose_name='计数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '统计计数器',
+                'verbose_name_plural': '统计计数器',
+                'ordering': ['model_label', 'dimension', 'value'],
+                'unique_together': {('model_label', 'dimension', 'value')},
+            },
+        ),
+    ]
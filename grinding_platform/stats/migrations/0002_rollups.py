@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stats', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50, unique=True, verbose_name='数据源')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='已处理的最大ID')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '汇总进度',
+                'verbose_name_plural': '汇总进度',
+            },
+        ),
+        migrations.CreateModel(
+            name='StatRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('series', models.CharField(max_length=50, verbose_name='数据系列')),
+                ('metric', models.CharField(max_length=50, verbose_name='指标')),
+                ('period', models.CharField(choices=[('day', '日'), ('week', '周'), ('month', '月')], max_length=10, verbose_name='周期')),
+                ('period_start', models.DateField(verbose_name='周期开始日期')),
+                ('count', models.BigIntegerField(default=0, verbose_name='计数')),
+                ('total', models.FloatField(default=0, verbose_name='合计')),
+            ],
+            options={
+                'verbose_name': '统计汇总',
+                'verbose_name_plural': '统计汇总',
+                'ordering': ['series', 'metric', 'period', 'period_start'],
+                'indexes': [models.Index(fields=['series', 'period', 'period_start'], name='stats_statr_series_d83195_idx')],
+                'unique_together': {('series', 'metric', 'period', 'period_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100, verbose_name='模型')),
+                ('object_id', models.BigIntegerField(verbose_name='对象ID')),
+                ('from_status', models.CharField(blank=True, max_length=50, verbose_name='原状态')),
+                ('to_status', models.CharField(max_length=50, verbose_name='新状态')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='变更时间')),
+            ],
+            options={
+                'verbose_name': '状态流转记录',
+                'verbose_name_plural': '状态流转记录',
+                'ordering': ['-changed_at'],
+                'indexes': [models.Index(fields=['model_label', 'object_id'], name='stats_statu_model_l_e915c0_idx'), models.Index(fields=['model_label', 'changed_at'], name='stats_statu_model_l_b66526_idx')],
+            },
+        ),
+    ]
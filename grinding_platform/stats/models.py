@@ -0,0 +1,99 @@
+from django.db import models
+
+
+class StatCounter(models.Model):
+    """统计计数器
+
+    每行记录某个模型在某个维度取值下的数据条数，dimension 为空的行记录总数。
+    由 post_save/post_delete 信号以 F() 表达式原子更新。
+    """
+    
+    model_label = models.CharField(max_length=100, verbose_name='模型')
+    dimension = models.CharField(max_length=50, blank=True, verbose_name='统计维度')
+    value = models.CharField(max_length=100, blank=True, verbose_name='维度取值')
+    count = models.BigIntegerField(default=0, verbose_name='计数')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    
+    class Meta:
+        verbose_name = '统计计数器'
+        verbose_name_plural = '统计计数器'
+        unique_together = ['model_label', 'dimension', 'value']
+        ordering = ['model_label', 'dimension', 'value']
+    
+    def __str__(self):
+        if not self.dimension:
+            return f"{self.model_label} 总数: {self.count}"
+        return f"{self.model_label}.{self.dimension}={self.value}: {self.count}"
+
+
+class StatusTransition(models.Model):
+    """状态流转记录，由 post_save 信号在状态变化（含创建）时写入"""
+    
+    model_label = models.CharField(max_length=100, verbose_name='模型')
+    object_id = models.BigIntegerField(verbose_name='对象ID')
+    from_status = models.CharField(max_length=50, blank=True, verbose_name='原状态')
+    to_status = models.CharField(max_length=50, verbose_name='新状态')
+    changed_at = models.DateTimeField(auto_now_add=True, verbose_name='变更时间')
+    
+    class Meta:
+        verbose_name = '状态流转记录'
+        verbose_name_plural = '状态流转记录'
+        ordering = ['-changed_at']
+        indexes = [
+            models.Index(fields=['model_label', 'object_id']),
+            models.Index(fields=['model_label', 'changed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id}: {self.from_status or '-'} → {self.to_status}"
+
+
+class StatRollup(models.Model):
+    """按日/周/月汇总的统计数据
+
+    count 为计数（数值指标为非空样本数），total 为数值指标的合计，均值 = total / count。
+    """
+    
+    PERIOD_CHOICES = [
+        ('day', '日'),
+        ('week', '周'),
+        ('month', '月'),
+    ]
+    
+    series = models.CharField(max_length=50, verbose_name='数据系列')
+    metric = models.CharField(max_length=50, verbose_name='指标')
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES, verbose_name='周期')
+    period_start = models.DateField(verbose_name='周期开始日期')
+    count = models.BigIntegerField(default=0, verbose_name='计数')
+    total = models.FloatField(default=0, verbose_name='合计')
+    
+    class Meta:
+        verbose_name = '统计汇总'
+        verbose_name_plural = '统计汇总'
+        unique_together = ['series', 'metric', 'period', 'period_start']
+        ordering = ['series', 'metric', 'period', 'period_start']
+        indexes = [
+            models.Index(fields=['series', 'period', 'period_start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.series}.{self.metric} {self.get_period_display()} {self.period_start}"
+    
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+
+class RollupWatermark(models.Model):
+    """汇总任务的处理进度：各数据源已汇总到的最大主键"""
+    
+    source = models.CharField(max_length=50, unique=True, verbose_name='数据源')
+    last_id = models.BigIntegerField(default=0, verbose_name='已处理的最大ID')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    
+    class Meta:
+        verbose_name = '汇总进度'
+        verbose_name_plural = '汇总进度'
+    
+    def __str__(self):
+        return f"{self.source}: {self.last_id}"
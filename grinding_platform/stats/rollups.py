@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Max, Min, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import RollupWatermark, StatRollup, StatusTransition
+
+
+# 记录状态流转的模型，需同时在 counters.TRACKED_DIMENSIONS 中跟踪 status
+TRANSITION_MODELS = (
+    'polishing_processes.polishingprocess',
+    'polishing_requirements.polishingrequirement',
+)
+
+PERIODS = [value for value, _ in StatRollup.PERIOD_CHOICES]
+
+
+class RollupSource:
+    """一个汇总数据源
+
+    series: 写入的数据系列名
+    group_field: 按该字段取值拆分指标（如状态流转的目标状态），为空时只统计记录数
+    value_fields: 需要汇总合计值的数值字段，每个字段一个指标
+    """
+
+    def __init__(self, name, series, model, date_field, filters=None, group_field=None,
+                 count_metric=None, value_fields=()):
+        self.name = name
+        self.series = series
+        self.model = model
+        self.date_field = date_field
+        self.filters = filters or {}
+        self.group_field = group_field
+        self.count_metric = count_metric
+        self.value_fields = value_fields
+
+    def queryset(self):
+        return apps.get_model(self.model).objects.filter(**self.filters).order_by()
+
+    def aggregate(self, rows, period):
+        """按周期聚合一批记录，产出 (指标, 周期开始日期, 计数, 合计)"""
+        bucket = Trunc(self.date_field, period, output_field=DateField())
+        group = ['bucket'] + ([self.group_field] if self.group_field else [])
+        aggregates = {'records': Count('pk')}
+        for field in self.value_fields:
+            aggregates[f'{field}__count'] = Count(field)
+            aggregates[f'{field}__sum'] = Sum(field)
+
+        for item in rows.annotate(bucket=bucket).values(*group).annotate(**aggregates):
+            if self.group_field:
+                yield item[self.group_field], item['bucket'], item['records'], 0.0
+            elif self.count_metric:
+                yield self.count_metric, item['bucket'], item['records'], 0.0
+            for field in self.value_fields:
+                yield field, item['bucket'], item[f'{field}__count'], float(item[f'{field}__sum'] or 0)
+
+
+ROLLUP_SOURCES = [
+    RollupSource(
+        'requirement_created', 'requirement', 'polishing_requirements.PolishingRequirement', 'created_at',
+        count_metric='created',
+    ),
+    RollupSource(
+        'requirement_transitions', 'requirement', 'stats.StatusTransition', 'changed_at',
+        filters={
+            'model_label': 'polishing_requirements.polishingrequirement',
+            'to_status__in': ['approved', 'completed'],
+        },
+        group_field='to_status',
+    ),
+    RollupSource(
+        'process_transitions', 'process', 'stats.StatusTransition', 'changed_at',
+        filters={'model_label': 'polishing_processes.polishingprocess'},
+        group_field='to_status',
+    ),
+    RollupSource(
+        'usage', 'usage', 'polishing_processes.ProcessUsageRecord', 'used_at',
+        count_metric='records',
+        value_fields=(
+            'quantity',
+            'actual_processing_time',
+            'actual_material_cost',
+            'actual_labor_cost',
+            'quality_rating',
+        ),
+    ),
+]
+
+# 只汇总早于该时长的记录，避免遗漏主键较小但提交较晚的事务
+DEFAULT_LAG = timedelta(seconds=60)
+
+
+def _add_rollup(series, metric, period, period_start, count, total):
+    rollups = StatRollup.objects.filter(series=series, metric=metric, period=period, period_start=period_start)
+    if rollups.update(count=F('count') + count, total=F('total') + total):
+        return
+    try:
+        with transaction.atomic():
+            StatRollup.objects.create(
+                series=series, metric=metric, period=period, period_start=period_start,
+                count=count, total=total,
+            )
+    except IntegrityError:
+        rollups.update(count=F('count') + count, total=F('total') + total)
+
+
+def run_source(source, lag=DEFAULT_LAG, batch_size=50000):
+    """增量汇总一个数据源：只处理主键大于水位线的记录，返回处理的记录数"""
+    processed = 0
+    cutoff = timezone.now() - lag
+    while True:
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(source=source.name)
+            pending = source.queryset().filter(pk__gt=watermark.last_id)
+            # 截止到第一条未超过延迟时间的记录之前，保证水位线以下的记录不会再有新的提交
+            first_recent = pending.filter(**{f'{source.date_field}__gt': cutoff}).aggregate(first=Min('pk'))['first']
+            if first_recent is not None:
+                pending = pending.filter(pk__lt=first_recent)
+            batch = pending.order_by('pk').values_list('pk', flat=True)[batch_size - 1:batch_size]
+            upper = next(iter(batch), None) or pending.aggregate(last=Max('pk'))['last']
+            if upper is None:
+                return processed
+
+            rows = pending.filter(pk__lte=upper)
+            for period in PERIODS:
+                for metric, period_start, count, total in source.aggregate(rows, period):
+                    _add_rollup(source.series, metric, period, period_start, count, total)
+            processed += rows.count()
+            watermark.last_id = upper
+            watermark.save(update_fields=['last_id', 'updated_at'])
+
+
+def run_rollups(lag=DEFAULT_LAG, batch_size=50000):
+    """增量汇总全部数据源，返回 {数据源: 处理的记录数}"""
+    return {source.name: run_source(source, lag=lag, batch_size=batch_size) for source in ROLLUP_SOURCES}
+
+
+def rebuild_rollups(lag=DEFAULT_LAG, batch_size=50000):
+    """清空汇总表与水位线后重新汇总"""
+    with transaction.atomic():
+        StatRollup.objects.all().delete()
+        RollupWatermark.objects.all().delete()
+    return run_rollups(lag=lag, batch_size=batch_size)
+
+
+def record_transition(instance, from_status, to_status):
+    StatusTransition.objects.create(
+        model_label=instance._meta.label_lower,
+        object_id=instance.pk,
+        from_status=from_status,
+        to_status=to_status,
+    )
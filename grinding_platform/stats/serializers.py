@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
+from .models import StatRollup
+
+
+class StatRollupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    period_display = serializers.CharField(source='get_period_display', read_only=True)
+    average = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = StatRollup
+        fields = ['id', 'series', 'metric', 'period', 'period_display', 'period_start',
+                 'count', 'total', 'average']
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_save, post_delete
+
+from grinding_platform.changes import previous_values, track_previous_values
+
+from .counters import (
+    TRACKED_DIMENSIONS,
+    encode_value,
+    record_changed,
+    record_created,
+    record_deleted,
+    tracked_models,
+)
+from .rollups import TRANSITION_MODELS, record_transition
+
+
+def update_counters(sender, instance, created, **kwargs):
+    previous = previous_values(instance)
+    if previous is not None:
+        dimensions = TRACKED_DIMENSIONS[sender._meta.label_lower]
+        previous = {dimension: encode_value(previous[dimension]) for dimension in dimensions}
+    if created or previous is None:
+        record_created(instance)
+    else:
+        record_changed(instance, previous)
+
+    if sender._meta.label_lower in TRANSITION_MODELS:
+        from_status = '' if created or previous is None else previous['status']
+        to_status = encode_value(instance.status)
+        if from_status != to_status:
+            record_transition(instance, from_status, to_status)
+
+
+def discard_counters(sender, instance, **kwargs):
+    record_deleted(instance)
+
+
+for model in tracked_models():
+    uid = f'stats:{model._meta.label_lower}'
+    track_previous_values(model, TRACKED_DIMENSIONS[model._meta.label_lower])
+    post_save.connect(update_counters, sender=model, dispatch_uid=uid)
+    post_delete.connect(discard_counters, sender=model, dispatch_uid=uid)
@@ -0,0 +1,203 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.checks import run_checks
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from grinding_platform.testing import FixtureMixin, QueryCountMixin, User
+from polishing_processes.models import ProcessUsageRecord
+from polishing_requirements.models import PolishingRequirement
+from process_cases.models import ExpertKnowledge, ProcessCase
+
+from .buffers import flush_all
+from .counters import get_counters, rebuild_counters
+from .models import StatRollup, StatusTransition
+from .rollups import rebuild_rollups, run_rollups
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """统计汇总列表的查询数不随行数增长"""
+
+    def create_rollup(self):
+        return StatRollup.objects.create(
+            series='process_usage', metric='quality_rating', period='day',
+            period_start=datetime.date(2026, 1, 1) + datetime.timedelta(days=self.next_id()), count=1, total=8,
+        )
+
+    def test_rollups(self):
+        self.assertConstantQueries('/api/v1/stats/rollups/', self.create_rollup)
+
+
+class CounterSignalTests(FixtureMixin, TestCase):
+    """计数器随增删改增量维护，与全量重建一致"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='password')
+        self.sequence = 0
+
+    def test_counters_follow_changes(self):
+        get_counters(PolishingRequirement)
+        requirements = [self.create_requirement() for _ in range(4)]
+        requirements[0].status = 'approved'
+        requirements[0].save()
+        requirements[1].status = 'approved'
+        requirements[1].urgency_level = 'urgent'
+        requirements[1].save()
+        requirements[2].delete()
+
+        counters = get_counters(PolishingRequirement)
+        self.assertEqual(counters['total'], 3)
+        self.assertEqual(counters['status'].get('approved'), 2)
+        self.assertEqual(counters['status'].get('draft'), 1)
+
+        rebuild_counters(PolishingRequirement)
+        rebuilt = get_counters(PolishingRequirement)
+        for dimension, values in counters.items():
+            if isinstance(values, dict):
+                values = {value: count for value, count in values.items() if count}
+            self.assertEqual(values, rebuilt[dimension], dimension)
+
+    def test_one_lookup_per_save(self):
+        """计数器与特征统计共用一次旧值查询；未写入登记字段时不查询"""
+        case = self.create_case()
+        table = ProcessCase._meta.db_table
+        with CaptureQueriesContext(connection) as context:
+            case.status = 'archived'
+            case.save()
+        lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+        ]
+        self.assertEqual(len(lookups), 1)
+
+        with CaptureQueriesContext(connection) as context:
+            case.save(update_fields=['name'])
+        self.assertEqual(len(context.captured_queries), 1)
+
+
+class BufferedViewCountTests(FixtureMixin, APITestCase):
+    """知识查看次数先在共享缓存中累加，批量写回时不改写其它字段"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        # 测试环境为进程内缓存，按共享缓存验证缓冲
+        patcher = mock.patch('stats.buffers.cache_is_shared', return_value=True)
+        self.shared = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_knowledge(self, title):
+        return ExpertKnowledge.objects.create(
+            title=title, knowledge_type='best_practice', content='-', expert_name='李工', expert_title='高级工程师',
+            applicable_scenarios='-', is_published=True, created_by=self.user,
+        )
+
+    def test_views_are_buffered(self):
+        first, second = self.create_knowledge('甲'), self.create_knowledge('乙')
+        updated_at = second.updated_at
+        url = f'/api/v1/process-cases/knowledge/{second.id}/'
+        with self.settings(BUFFERED_COUNTER_FLUSH_SECONDS=3600, BUFFERED_COUNTER_FLUSH_THRESHOLD=1000):
+            counts = [self.client.get(url).data['view_count'] for _ in range(3)]
+            self.client.get(f'/api/v1/process-cases/knowledge/{first.id}/')
+            popular = self.client.get('/api/v1/process-cases/knowledge/popular/').data
+
+        self.assertEqual(counts, [1, 2, 3])
+        self.assertEqual([(item['id'], item['view_count']) for item in popular], [(second.id, 3), (first.id, 1)])
+
+        # 第一次查看时到达写回间隔立即写回，其余仍在缓存中
+        second.refresh_from_db()
+        self.assertEqual(second.view_count, 1)
+        flush_all()
+        second.refresh_from_db()
+        self.assertEqual(second.view_count, 3)
+        self.assertEqual(second.updated_at, updated_at)
+
+    def test_written_directly_without_shared_cache(self):
+        self.shared.return_value = False
+        knowledge = self.create_knowledge('甲')
+        url = f'/api/v1/process-cases/knowledge/{knowledge.id}/'
+        with self.settings(BUFFERED_COUNTER_FLUSH_SECONDS=3600, BUFFERED_COUNTER_FLUSH_THRESHOLD=1000):
+            counts = [self.client.get(url).data['view_count'] for _ in range(3)]
+
+        self.assertEqual(counts, [1, 2, 3])
+        knowledge.refresh_from_db()
+        self.assertEqual(knowledge.view_count, 3)
+        self.assertEqual(flush_all(), {'process_cases.expertknowledge.view_count': 0})
+
+    def test_deploy_check_warns_without_shared_cache(self):
+        ids = [message.id for message in run_checks(include_deployment_checks=True)]
+        self.assertIn('grinding_platform.W001', ids)
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://'}}
+        with self.settings(CACHES=redis):
+            ids = [message.id for message in run_checks(include_deployment_checks=True)]
+        self.assertNotIn('grinding_platform.W001', ids)
+
+
+class RollupTests(FixtureMixin, APITestCase):
+    """状态流转记录与按日/周/月的增量汇总"""
+
+    def setUp(self):
+        super().setUp()
+        self.process = self.create_process()
+        # 两条使用记录（质量评分 6 与 8）分别放到两天，第二天与第一天在同一周、同一月
+        self.days = [timezone.make_aware(datetime.datetime(2026, 9, day, 10)) for day in (1, 2)]
+        for record, used_at in zip(self.process.usage_records.order_by('pk'), self.days):
+            ProcessUsageRecord.objects.filter(pk=record.pk).update(used_at=used_at)
+
+    def rollups(self, metric, period):
+        rows = StatRollup.objects.filter(series='usage', metric=metric, period=period).order_by('period_start')
+        return [(row.period_start, row.count, row.total) for row in rows]
+
+    def test_transitions(self):
+        requirement = self.create_requirement()
+        requirement.status = 'approved'
+        requirement.save()
+        requirement.title = '新标题'
+        requirement.save()
+        transitions = StatusTransition.objects.filter(
+            model_label='polishing_requirements.polishingrequirement', object_id=requirement.pk,
+        ).order_by('pk')
+        self.assertEqual(
+            list(transitions.values_list('from_status', 'to_status')), [('', 'draft'), ('draft', 'approved')],
+        )
+
+    def test_incremental_rollups(self):
+        self.assertEqual(run_rollups(lag=datetime.timedelta(0))['usage'], 2)
+        monday = datetime.date(2026, 8, 31)
+        self.assertEqual(self.rollups('records', 'day'), [
+            (datetime.date(2026, 9, 1), 1, 0), (datetime.date(2026, 9, 2), 1, 0),
+        ])
+        self.assertEqual(self.rollups('records', 'week'), [(monday, 2, 0)])
+        self.assertEqual(self.rollups('quality_rating', 'month'), [(datetime.date(2026, 9, 1), 2, 14)])
+
+        # 再次运行只处理水位线之后的记录
+        self.assertEqual(run_rollups(lag=datetime.timedelta(0))['usage'], 0)
+        record = ProcessUsageRecord.objects.create(
+            process=self.process, used_by=self.user, part_name='零件', part_number='P', quantity=5, quality_rating=10,
+        )
+        ProcessUsageRecord.objects.filter(pk=record.pk).update(used_at=self.days[1])
+        self.assertEqual(run_rollups(lag=datetime.timedelta(0))['usage'], 1)
+        self.assertEqual(self.rollups('quality_rating', 'week'), [(monday, 3, 24)])
+
+        incremental = list(StatRollup.objects.values_list('series', 'metric', 'period', 'period_start', 'count', 'total'))
+        rebuild_rollups(lag=datetime.timedelta(0))
+        rebuilt = StatRollup.objects.values_list('series', 'metric', 'period', 'period_start', 'count', 'total')
+        self.assertEqual(sorted(incremental), sorted(rebuilt))
+
+    def test_recent_records_wait_for_lag(self):
+        ProcessUsageRecord.objects.filter(process=self.process).update(used_at=timezone.now())
+        self.assertEqual(run_rollups()['usage'], 0)
+        self.assertFalse(StatRollup.objects.filter(series='usage').exists())
+
+    def test_trend(self):
+        run_rollups(lag=datetime.timedelta(0))
+        response = self.client.get('/api/v1/stats/rollups/trend/', {'series': 'usage', 'metric': 'quality_rating'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['metrics']), ['quality_rating'])
+        self.assertEqual([item['average'] for item in response.data['metrics']['quality_rating']], [6, 8])
+        self.assertEqual(self.client.get('/api/v1/stats/rollups/trend/').status_code, 400)
@@ -0,0 +1,58 @@
+from rest_framework import viewsets, status, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django_filters.rest_framework import DjangoFilterBackend
+from grinding_platform.querysets import QuerysetOptimizationMixin
+from .models import StatRollup
+from .serializers import StatRollupSerializer
+
+
+class StatRollupViewSet(QuerysetOptimizationMixin, viewsets.ReadOnlyModelViewSet):
+    """统计汇总视图集（由 rollup_stats 任务维护，只读）"""
+    queryset = StatRollup.objects.all()
+    serializer_class = StatRollupSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['series', 'metric', 'period']
+    ordering_fields = ['period_start', 'metric']
+    ordering = ['series', 'metric', 'period', 'period_start']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        
+        # 按周期开始日期过滤
+        start_date = self.request.query_params.get('start_date')
+        end_date = self.request.query_params.get('end_date')
+        
+        if start_date:
+            queryset = queryset.filter(period_start__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(period_start__lte=end_date)
+            
+        return queryset
+
+    @action(detail=False, methods=['get'])
+    def trend(self, request):
+        """获取某个数据系列的趋势，按指标分组，不分页"""
+        series = request.query_params.get('series')
+        period = request.query_params.get('period', 'day')
+        if not series:
+            return Response({'error': '请指定数据系列'}, status=status.HTTP_400_BAD_REQUEST)
+        if period not in dict(StatRollup.PERIOD_CHOICES):
+            return Response({'error': '无效的周期'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().filter(series=series, period=period).order_by('metric', 'period_start')
+        metrics = request.query_params.getlist('metric')
+        if metrics:
+            queryset = queryset.filter(metric__in=metrics)
+
+        trend = {}
+        for rollup in queryset:
+            trend.setdefault(rollup.metric, []).append({
+                'period_start': rollup.period_start,
+                'count': rollup.count,
+                'total': rollup.total,
+                'average': rollup.average,
+            })
+        return Response({'series': series, 'period': period, 'metrics': trend})
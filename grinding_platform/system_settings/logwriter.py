@@ -0,0 +1,154 @@
+"""
+系统日志异步写入
+
+SystemLog.log 只把日志放入进程内的有界队列，由后台线程按批 bulk_create：
+凑满 SYSTEM_LOG_BATCH_SIZE 条或距第一条超过 SYSTEM_LOG_FLUSH_INTERVAL 秒即写入一批。
+队列已满时按 SYSTEM_LOG_OVERFLOW 处理：
+    drop   直接丢弃新日志（默认，请求不等待）
+    block  最多等待 SYSTEM_LOG_BLOCK_TIMEOUT 秒，仍无空位再丢弃
+丢弃与写入失败的条数记在 dropped / failed 中。进程退出时写完队列中剩余的日志。
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ('drop', 'block')
+
+
+class SystemLogWriter:
+    """有界队列 + 后台线程的批量写入器，write 接收一批记录"""
+
+    def __init__(self, write, batch_size=100, flush_interval=1.0, queue_size=10000,
+                 overflow='drop', block_timeout=0.1):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'未知的队列溢出策略: {overflow}')
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def submit(self, record):
+        """放入队列，返回是否成功（队列已满被丢弃时为 False）"""
+        self._ensure_started()
+        try:
+            if self.overflow == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout=None):
+        """等待队列中已有的日志全部写入，返回是否在超时前完成"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def close(self, timeout=5.0):
+        """停止后台线程，退出前写完队列中剩余的日志"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='system-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            while not (self._stopping.is_set() and self._queue.empty()):
+                batch = self._take_batch()
+                if batch:
+                    self._write_batch(batch)
+        finally:
+            connection.close()
+
+    def _take_batch(self):
+        """取一批记录：等待第一条最多 flush_interval 秒，之后在同一时限内凑满一批"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0 or self._stopping.is_set():
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        try:
+            self.write(batch)
+        except Exception:
+            with self._lock:
+                self.failed += len(batch)
+            logger.exception('系统日志写入失败，丢弃 %d 条', len(batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+def write_system_logs(records):
+    from .models import SystemLog
+
+    close_old_connections()
+    SystemLog.objects.bulk_create([SystemLog(**record) for record in records])
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer():
+    """按配置创建进程内唯一的系统日志写入器，进程退出时写完剩余日志"""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = SystemLogWriter(
+                    write_system_logs,
+                    batch_size=settings.SYSTEM_LOG_BATCH_SIZE,
+                    flush_interval=settings.SYSTEM_LOG_FLUSH_INTERVAL,
+                    queue_size=settings.SYSTEM_LOG_QUEUE_SIZE,
+                    overflow=settings.SYSTEM_LOG_OVERFLOW,
+                    block_timeout=settings.SYSTEM_LOG_BLOCK_TIMEOUT,
+                )
+                atexit.register(_writer.close)
+    return _writer
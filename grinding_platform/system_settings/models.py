@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.conf import settings
+from django.utils import timezone
 import json
 
 class SystemSettings(models.Model):
@@ -132,7 +134,8 @@ class SystemLog(models.Model):
         verbose_name='操作用户'
     )
     ip_address = models.GenericIPAddressField(null=True, blank=True, verbose_name='IP地址')
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    # 异步批量写入时取记录日志的时刻而不是写入数据库的时刻
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name='创建时间')
     metadata = models.JSONField(default=dict, blank=True, verbose_name='元数据')
 
     class Meta:
@@ -140,6 +143,7 @@ class SystemLog(models.Model):
         verbose_name_plural = '系统日志'
         ordering = ['-created_at']
         indexes = [
+            models.Index(fields=['created_at', 'id']),
             models.Index(fields=['level', 'created_at']),
             models.Index(fields=['module', 'created_at']),
             models.Index(fields=['user', 'created_at'])
@@ -150,12 +154,22 @@ class SystemLog(models.Model):
 
     @classmethod
     def log(cls, level, message, module, user=None, ip_address=None, **metadata):
-        """记录日志的便捷方法"""
-        return cls.objects.create(
-            level=level,
-            message=message,
-            module=module,
-            user=user,
-            ip_address=ip_address,
-            metadata=metadata
-        )
+        """记录日志的便捷方法
+
+        SYSTEM_LOG_ASYNC 开启时放入队列由后台线程批量写入（见 logwriter），返回是否入队成功；
+        否则直接写入并返回日志对象。
+        """
+        record = {
+            'level': level,
+            'message': message,
+            'module': module,
+            'user_id': getattr(user, 'pk', None),
+            'ip_address': ip_address,
+            'metadata': metadata,
+            'created_at': timezone.now(),
+        }
+        if not settings.SYSTEM_LOG_ASYNC:
+            return cls.objects.create(**record)
+
+        from .logwriter import get_log_writer
+        return get_log_writer().submit(record)
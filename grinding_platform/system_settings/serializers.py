@@ -1,15 +1,16 @@
 from rest_framework import serializers
+from grinding_platform.serializers import SparseFieldsMixin
 from .models import SystemSettings, SystemBackup, SystemLog
 from users.serializers import UserSerializer
 
-class SystemSettingsSerializer(serializers.ModelSerializer):
+class SystemSettingsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """系统设置序列化器"""
     class Meta:
         model = SystemSettings
         fields = ['key', 'value', 'description', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
 
-class SystemBackupSerializer(serializers.ModelSerializer):
+class SystemBackupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """系统备份序列化器"""
     created_by = UserSerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
@@ -43,7 +44,7 @@ class SystemBackupSerializer(serializers.ModelSerializer):
             obj.size /= 1024.0
         return f"{obj.size:.1f} PB"
 
-class SystemLogSerializer(serializers.ModelSerializer):
+class SystemLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """系统日志序列化器"""
     user = UserSerializer(read_only=True)
     level_display = serializers.CharField(source='get_level_display', read_only=True)
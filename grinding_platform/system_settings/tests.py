@@ -1,3 +1,86 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from grinding_platform.testing import FixtureMixin, QueryCountMixin
+
+from .logwriter import SystemLogWriter
+from .models import SystemBackup, SystemLog, SystemSettings
+
+
+class ListQueryCountTests(QueryCountMixin, FixtureMixin, APITestCase):
+    """系统设置、备份与日志列表的查询数不随行数增长"""
+
+    def setUp(self):
+        super().setUp()
+        self.user.user_type = 'system_admin'
+        self.user.save()
+
+    def create_setting(self):
+        i = self.next_id()
+        return SystemSettings.objects.create(key=f'setting_{i}', value={'enabled': True})
+
+    def create_backup(self):
+        i = self.next_id()
+        return SystemBackup.objects.create(
+            filename=f'backup_{i}.json', file_path=f'backups/backup_{i}.json', backup_type='full', size=1024,
+            created_by=self.user,
+        )
+
+    def create_log(self):
+        return SystemLog.objects.create(level='info', message='测试', module='tests', user=self.user)
+
+    def test_settings(self):
+        self.assertConstantQueries('/api/v1/system/settings/', self.create_setting)
+
+    def test_backups(self):
+        self.assertConstantQueries('/api/v1/system/backups/', self.create_backup)
+
+    def test_logs(self):
+        self.assertConstantQueries('/api/v1/system/logs/', self.create_log)
+
+
+class SystemLogWriterTests(SimpleTestCase):
+    """后台线程按批写入，队列满时丢弃，关闭时写完剩余日志"""
+
+    def test_batches_and_flush_on_close(self):
+        batches = []
+        writer = SystemLogWriter(batches.append, batch_size=3, flush_interval=0.05, queue_size=100)
+        for i in range(7):
+            self.assertTrue(writer.submit(i))
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual([item for batch in batches for item in batch], list(range(7)))
+        self.assertTrue(all(len(batch) <= 3 for batch in batches))
+
+        writer.submit(7)
+        writer.close()
+        self.assertEqual(batches[-1][-1], 7)
+        self.assertFalse(writer._thread.is_alive())
+
+    def test_drop_when_full(self):
+        release = threading.Event()
+        written = []
+
+        def write(batch):
+            release.wait(5)
+            written.extend(batch)
+
+        writer = SystemLogWriter(write, batch_size=1, flush_interval=0.05, queue_size=2)
+        accepted = [writer.submit(i) for i in range(10)]
+        release.set()
+        writer.close()
+        # 写入线程最多持有一条，队列最多再容纳两条
+        self.assertLessEqual(accepted.count(True), 3)
+        self.assertEqual(writer.dropped, accepted.count(False))
+        self.assertEqual(len(written), accepted.count(True))
+
+
+class SystemLogTests(FixtureMixin, APITestCase):
+    """关闭异步写入时直接写入数据库"""
+
+    def test_sync_write(self):
+        with self.settings(SYSTEM_LOG_ASYNC=False):
+            log = SystemLog.log('info', '测试', 'tests', user=self.user, action='check')
+        log.refresh_from_db()
+        self.assertEqual((log.user_id, log.metadata), (self.user.id, {'action': 'check'}))
@@ -10,6 +10,8 @@ import json
 import shutil
 from datetime import datetime
 import subprocess
+from grinding_platform.pagination import KeysetPagination
+from grinding_platform.querysets import QuerysetOptimizationMixin
 from .models import SystemSettings, SystemBackup, SystemLog
 from .serializers import (
     SystemSettingsSerializer,
@@ -23,9 +25,9 @@ from .serializers import (
 class IsSystemAdmin(permissions.BasePermission):
     """系统管理员权限"""
     def has_permission(self, request, view):
-        return request.user and request.user.is_authenticated and request.user.role == 'system_admin'
+        return request.user and request.user.is_authenticated and request.user.user_type == 'system_admin'
 
-class SystemSettingsViewSet(viewsets.ModelViewSet):
+class SystemSettingsViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """系统设置视图集"""
     queryset = SystemSettings.objects.all()
     serializer_class = SystemSettingsSerializer
@@ -34,7 +36,7 @@ class SystemSettingsViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """获取设置列表"""
-        return SystemSettings.objects.all()
+        return super().get_queryset()
 
     @action(detail=False, methods=['get'])
     def all_settings(self, request):
@@ -107,7 +109,7 @@ class SystemSettingsViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class SystemBackupViewSet(viewsets.ModelViewSet):
+class SystemBackupViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     """系统备份视图集"""
     queryset = SystemBackup.objects.all()
     serializer_class = SystemBackupSerializer
@@ -116,7 +118,7 @@ class SystemBackupViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """获取备份列表"""
-        return SystemBackup.objects.all().order_by('-created_at')
+        return super().get_queryset().order_by('-created_at')
 
     @action(detail=False, methods=['post'])
     def create_backup(self, request):
@@ -302,19 +304,18 @@ class SystemBackupViewSet(viewsets.ModelViewSet):
         for setting in settings_data['system_settings']:
             SystemSettings.objects.create(**setting)
 
-class SystemLogViewSet(viewsets.ReadOnlyModelViewSet):
+class SystemLogViewSet(QuerysetOptimizationMixin, viewsets.ReadOnlyModelViewSet):
     """系统日志视图集"""
     queryset = SystemLog.objects.all()
     serializer_class = SystemLogSerializer
     permission_classes = [IsSystemAdmin]
+    pagination_class = KeysetPagination
     filterset_fields = ['level', 'module', 'user', 'created_at']
     search_fields = ['message', 'module']
-    ordering_fields = ['created_at', 'level']
-    ordering = ['-created_at']
 
     def get_queryset(self):
         """获取日志列表"""
-        queryset = SystemLog.objects.all()
+        queryset = super().get_queryset()
         
         # 按时间范围过滤
         start_date = self.request.query_params.get('start_date')